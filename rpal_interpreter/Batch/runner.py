@@ -0,0 +1,302 @@
+"""
+Running many RPAL programs in one job.
+
+Each program runs exactly as the command line runs it, with the same
+options, output and exit status, but in a pool of worker processes that
+pay for interpreter startup and module imports once rather than once per
+program. Results come back in the order the sources were given, whatever
+order the workers finish them in.
+"""
+
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+
+from myrpal import parse_args, run
+
+# Chunks each worker gets on average; more balance the load better, fewer
+# cost less in messages between processes
+CHUNKS_PER_WORKER = 4
+
+# Most sources sent to a worker at once
+MAX_CHUNK_SIZE = 32
+
+class FileResult:
+    """
+    The result of running one source file
+
+    Attributes:
+        source (str): Path of the source file
+        status (int): Exit status, 0 on success
+        stdout (str): What the run printed on stdout
+        stderr (str): What the run printed on stderr
+        wall (float): Wall time of the run in seconds
+        error (str): Why the run failed, or None if it succeeded
+    """
+    def __init__(self, source, status, stdout, stderr, wall, error=None):
+        self.source = source
+        self.status = status
+        self.stdout = stdout
+        self.stderr = stderr
+        self.wall = wall
+        self.error = error
+
+    def succeeded(self):
+        return self.status == 0
+
+def is_glob(pattern):
+    return any(character in pattern for character in "*?[")
+
+def read_manifest(path):
+    """
+    Read the sources listed in a manifest
+
+    Args:
+        path (str): A text file naming one source per line; blank lines and
+            lines starting with # are skipped, and relative paths are taken
+            from the manifest's directory
+
+    Returns:
+        list: Paths of the sources, in the order listed
+    """
+    directory = os.path.dirname(path)
+    sources = []
+    with open(path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                sources.append(os.path.join(directory, line))
+    return sources
+
+def collect_sources(specs):
+    """
+    Expand source specifications into source files
+
+    Args:
+        specs (list): Each a directory (its files, sorted by name), a glob
+            pattern (its matches, sorted), @ followed by a manifest's path
+            (the files it lists, in order) or a source file
+
+    Returns:
+        list: Paths of the sources, in the order of the specifications; a
+        file named more than once, under any spelling of its path, is kept
+        only where it first appears, as its runs would share output files
+    """
+    sources = []
+    for spec in specs:
+        if spec.startswith("@"):
+            sources.extend(read_manifest(spec[1:]))
+        elif os.path.isdir(spec):
+            names = sorted(os.listdir(spec))
+            sources.extend(os.path.join(spec, name) for name in names
+                           if os.path.isfile(os.path.join(spec, name)))
+        elif is_glob(spec):
+            sources.extend(path for path in sorted(glob.glob(spec, recursive=True))
+                           if os.path.isfile(path))
+        else:
+            sources.append(spec)
+
+    seen = set()
+    unique = []
+    for source in sources:
+        path = os.path.realpath(source)
+        if path not in seen:
+            seen.add(path)
+            unique.append(source)
+    return unique
+
+def run_file(source, options):
+    """
+    Run a source file as the command line would, capturing its output
+
+    Args:
+        source (str): Path of the source file
+        options (list): Interpreter options, as given on the command line
+
+    Returns:
+        FileResult: The result of the run
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            status = run(parse_args([source] + options))
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            status = 1
+    wall = time.perf_counter() - start
+
+    error = None
+    if status != 0:
+        # The command line reports errors on its last line of output, or
+        # on stderr for invalid options
+        lines = stdout.getvalue().strip().splitlines() or stderr.getvalue().strip().splitlines()
+        error = lines[-1] if lines else f"exit status {status}"
+    return FileResult(source, status, stdout.getvalue(), stderr.getvalue(), wall, error)
+
+def run_files(sources, options):
+    """Run a chunk of source files in order; see run_file."""
+    return [run_file(source, options) for source in sources]
+
+def get_chunks(sources, jobs):
+    """Split the sources into consecutive chunks for jobs workers."""
+    size = -(-len(sources) // (jobs * CHUNKS_PER_WORKER))
+    size = max(1, min(size, MAX_CHUNK_SIZE))
+    return [sources[i:i + size] for i in range(0, len(sources), size)]
+
+def run_isolated(sources, options):
+    """
+    Run source files one at a time in a worker process, starting another
+    whenever one dies, so that a file killing its worker fails alone
+
+    Args:
+        sources (list): Paths of the source files
+        options (list): Interpreter options, as given on the command line
+
+    Returns:
+        list: The FileResult of each source, in the order of sources
+    """
+    results = []
+    executor = None
+    try:
+        for source in sources:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=1)
+            try:
+                results.append(executor.submit(run_file, source, options).result())
+            except BrokenProcessPool as e:
+                results.append(FileResult(source, 1, "", "", 0.0, f"Error: worker failed: {e!r}"))
+                executor.shutdown()
+                executor = None
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+def run_batch(sources, options, jobs=None):
+    """
+    Run source files across a pool of worker processes
+
+    A worker dying, e.g. from running out of memory, breaks the pool and
+    every chunk it had not finished; those files run again one at a time,
+    so that only the file that killed a worker fails.
+
+    Args:
+        sources (list): Paths of the source files
+        options (list): Interpreter options, as given on the command line
+        jobs (int): Number of worker processes (default: the number of CPUs);
+            with 1, the files run in this process
+
+    Returns:
+        list: The FileResult of each source, in the order of sources
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        return run_files(sources, options)
+
+    chunks = get_chunks(sources, jobs)
+    chunk_results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_files, chunk, options) for chunk in chunks]
+        for index, (chunk, future) in enumerate(zip(chunks, futures)):
+            try:
+                chunk_results[index] = future.result()
+            except BrokenProcessPool:
+                pass
+            except Exception as e:
+                error = f"Error: worker failed: {e!r}"
+                chunk_results[index] = [FileResult(source, 1, "", "", 0.0, error) for source in chunk]
+
+    unfinished = [source for chunk, result in zip(chunks, chunk_results) if result is None
+                  for source in chunk]
+    rerun = iter(run_isolated(unfinished, options))
+    results = []
+    for chunk, result in zip(chunks, chunk_results):
+        results.extend(result if result is not None else (next(rerun) for _ in chunk))
+    return results
+
+def get_output_paths(sources, output_dir):
+    """
+    Args:
+        sources (list): Paths of the source files
+        output_dir (str): Directory the outputs are written to
+
+    Returns:
+        list: The path of each source's output, keeping the sources'
+        directory structure below their common directory
+    """
+    if not sources:
+        return []
+    paths = [os.path.abspath(source) for source in sources]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+    return [os.path.join(output_dir, os.path.relpath(path, root) + ".out") for path in paths]
+
+def write_outputs(results, output_dir):
+    """
+    Write each run's stdout to its output file, its stderr, if any, next to
+    it with an .err extension, and the summary to summary.json
+
+    Args:
+        results (list): FileResult of each source, in order
+        output_dir (str): Directory the outputs are written to
+    """
+    paths = get_output_paths([result.source for result in results], output_dir)
+    for result, path in zip(results, paths):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(result.stdout)
+        error_path = path[:-len(".out")] + ".err"
+        if result.stderr:
+            with open(error_path, 'w') as file:
+                file.write(result.stderr)
+        elif os.path.exists(error_path):
+            os.remove(error_path)
+
+    summary = {
+        "files": len(results),
+        "failed": sum(not result.succeeded() for result in results),
+        "wall_s": round(sum(result.wall for result in results), 6),
+        "results": [
+            {
+                "source": result.source,
+                "output": path,
+                "status": result.status,
+                "wall_s": round(result.wall, 6),
+                "error": result.error,
+            }
+            for result, path in zip(results, paths)
+        ],
+    }
+    with open(os.path.join(output_dir, "summary.json"), 'w') as file:
+        json.dump(summary, file, indent=2)
+        file.write("\n")
+
+def report(results, wall, file=None):
+    """
+    Print the time and status of each run, then the totals
+
+    Args:
+        results (list): FileResult of each source, in order
+        wall (float): Wall time of the whole batch in seconds
+        file: Where to print (default: stdout)
+    """
+    file = file or sys.stdout
+    print(f"{'status':<8} {'wall (s)':>10}  source", file=file)
+    for result in results:
+        status = "ok" if result.succeeded() else "FAILED"
+        print(f"{status:<8} {result.wall:>10.4f}  {result.source}", file=file)
+        if not result.succeeded():
+            print(f"{'':<8} {'':>10}  {result.error}", file=file)
+    failed = sum(not result.succeeded() for result in results)
+    total = sum(result.wall for result in results)
+    print(f"{len(results)} files, {failed} failed, {total:.3f} s running, {wall:.3f} s elapsed",
+          file=file)
@@ -0,0 +1,56 @@
+"""
+Interpreter daemon latency benchmark.
+
+Runs the same program a number of times with the command line, and with the
+client against a daemon the benchmark starts, reporting the mean time per
+run. Both pay for starting Python; the client skips importing the
+interpreter and, after the first run, compiling the program. The outputs
+are checked to be the same.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.daemon_latency [runs [elements]]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from Benchmarks.programs import wide_tuple_program
+
+def time_runs(command, runs, env):
+    """Run a command the given number of times; get the mean time and last output."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        output = subprocess.run(command, capture_output=True, text=True, env=env).stdout
+    return (time.perf_counter() - start) / runs, output
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    elements = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "program.rpal")
+        with open(source, "w") as file:
+            file.write(wide_tuple_program(elements))
+        env = dict(os.environ, RPAL_SOCKET=os.path.join(directory, "daemon.sock"))
+
+        daemon = subprocess.Popen([sys.executable, "rpal_daemon.py", "-j", "1"], env=env,
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            daemon.stdout.readline()  # Listening on ...
+            cli, cli_output = time_runs([sys.executable, "myrpal.py", source], runs, env)
+            client, client_output = time_runs([sys.executable, "rpal_client.py", source], runs, env)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"{runs} runs of a {elements}-element tuple program")
+    print(f"{'mode':<12} {'mean (ms)':>10}")
+    print(f"{'command':<12} {cli * 1000:>10.1f}")
+    print(f"{'client':<12} {client * 1000:>10.1f}"
+          + ("" if client_output == cli_output else "  different output"))
+
+if __name__ == "__main__":
+    main()
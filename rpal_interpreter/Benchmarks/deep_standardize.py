@@ -0,0 +1,121 @@
+"""
+Deep nesting stress test for the standardizer and the tree printer.
+
+Builds let chains, where chains and aug chains nested to the given depth,
+standardizes them and checks the shape of the result, then prints a deep
+standardized tree. None of this may hit Python's recursion limit.
+
+The let and where chains are built directly from nodes, since the recursive
+descent parser itself cannot parse programs nested that deeply; aug chains
+are parsed from source, as the parser handles them in a loop.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.deep_standardize [depth] [print_depth]
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+from Lexer.token_analyzer import tokenize
+from Parser.node_type import NodeType
+from Parser.syntax_parser import SyntaxParser
+from Standardizer.tree import StandardTree
+from Standardizer.tree_node import NodeFactory
+
+def node(kind, value, *children):
+    """Create an AST node with the given children."""
+    new_node = NodeFactory.create_ast_node(kind, value)
+    for child in children:
+        child.set_parent(new_node)
+    new_node.children = list(children)
+    return new_node
+
+def definition(i):
+    """Build the definition x<i> = <i>."""
+    return node(NodeType.equal, "=",
+                node(NodeType.identifier, f"x{i}"),
+                node(NodeType.integer, str(i)))
+
+def body():
+    """Build the innermost expression, Print x0."""
+    return node(NodeType.gamma, "gamma",
+                node(NodeType.identifier, "Print"),
+                node(NodeType.identifier, "x0"))
+
+def let_chain(depth):
+    """Build let x0 = 0 in let x1 = 1 in ... Print x0."""
+    tree = body()
+    for i in reversed(range(depth)):
+        tree = node(NodeType.let, "let", definition(i), tree)
+    return StandardTree(tree)
+
+def where_chain(depth):
+    """Build ((Print x0 where x<n> = <n>) ...) where x0 = 0."""
+    tree = body()
+    for i in reversed(range(depth)):
+        tree = node(NodeType.where, "where", tree, definition(i))
+    return StandardTree(tree)
+
+def aug_chain(depth):
+    """Parse nil aug 0 aug 1 ... aug <depth - 1>."""
+    source = "nil" + "".join(f" aug {i}" for i in range(depth))
+    return StandardTree(SyntaxParser(tokenize(source)).parse())
+
+def let_levels(tree):
+    """
+    Count the gamma(lambda(x, body), value) levels of a standardized let chain.
+    
+    Returns -1 if the tree does not have that shape all the way down to the
+    innermost Print x0.
+    """
+    levels = 0
+    current = tree.get_root()
+    while current.children[0].get_data() == "lambda":
+        levels += 1
+        current = current.children[0].children[1]
+    if current.children[0].get_data() != "<IDENTIFIER:Print>":
+        return -1
+    return levels
+
+def first_child_depth(tree):
+    """Count the nodes on the path that always follows the first child."""
+    depth = 0
+    current = tree.get_root()
+    while current.children:
+        depth += 1
+        current = current.children[0]
+    return depth
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Printing a chain of depth d writes about d * d / 2 dots, so the printer
+    # is exercised at a smaller depth by default.
+    print_depth = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    
+    # Both let and where chains standardize to nested gamma/lambda pairs
+    checks = (
+        ("let", let_chain, lambda tree: let_levels(tree) == depth),
+        ("where", where_chain, lambda tree: let_levels(tree) == depth),
+        ("aug", aug_chain, lambda tree: first_child_depth(tree) == depth),
+    )
+    
+    for name, build, check in checks:
+        tree = build(depth)
+        start = time.perf_counter()
+        tree.standardize()
+        elapsed = time.perf_counter() - start
+        status = "ok" if check(tree) else "WRONG SHAPE"
+        print(f"{name:>6} chain, depth {depth}: standardized in {elapsed:.3f} s ({status})")
+    
+    tree = let_chain(print_depth)
+    tree.standardize()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        tree.print_tree()
+    elapsed = time.perf_counter() - start
+    print(f" print let chain, depth {print_depth}: {elapsed:.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Execution engine comparison benchmark.
+
+Runs the workloads of machine_workloads, plus larger recursive ones, under
+every engine myrpal.py can select, reports the time each spends building its
+machine and running it, and checks that all engines print the same answer.
+Arguments naming a file run that RPAL program instead.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.engine_comparison [workload | file ...]
+    python -m Benchmarks.engine_comparison Inputs/*.txt
+"""
+
+import os
+import sys
+import time
+
+from Lexer.token_analyzer import tokenize
+from Parser.syntax_parser import SyntaxParser
+from Standardizer.tree import StandardTree
+from Benchmarks.machine_workloads import WORKLOADS
+from myrpal import ENGINES
+
+RECURSIVE_WORKLOADS = {
+    # Doubly recursive Fibonacci: about 22,000 calls
+    "fib_20": """
+        let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2)
+        in Print (fib 20)
+    """,
+    # Non-tail recursion 100,000 calls deep
+    "sum_100k": """
+        let rec Sum n = n eq 0 -> 0 | n + Sum (n - 1)
+        in Print (Sum 100000)
+    """,
+    # Curried tail-recursive loop of 100,000 iterations
+    "loop_100k": """
+        let rec Loop n acc = n eq 0 -> acc | Loop (n - 1) (acc + 1)
+        in Print (Loop 100000 0)
+    """,
+}
+
+def load_program(name):
+    """Get the source of a workload, or of the RPAL file of that name."""
+    if os.path.isfile(name):
+        with open(name) as file:
+            return file.read()
+    return WORKLOADS.get(name) or RECURSIVE_WORKLOADS[name]
+
+def standardized_tree(source):
+    """Parse and standardize the given RPAL source."""
+    tree = StandardTree(SyntaxParser(tokenize(source)).parse())
+    tree.standardize()
+    return tree
+
+def main():
+    names = sys.argv[1:] or list(WORKLOADS) + list(RECURSIVE_WORKLOADS)
+    print(f"{'workload':<20} {'engine':<10} {'build (s)':>10} {'run (s)':>10}")
+    for name in names:
+        answers = {}
+        for engine, build_machine in ENGINES.items():
+            tree = standardized_tree(load_program(name))
+            start = time.perf_counter()
+            machine = build_machine(tree)
+            built = time.perf_counter()
+            answers[engine] = machine.get_answer()
+            finished = time.perf_counter()
+            print(f"{name:<20} {engine:<10} {built - start:>10.3f} {finished - built:>10.3f}")
+        if len(set(answers.values())) != 1:
+            print(f"{name}: engines disagree: {answers}")
+
+if __name__ == "__main__":
+    main()
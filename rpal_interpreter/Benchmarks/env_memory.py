@@ -0,0 +1,55 @@
+"""
+Environment retention benchmark.
+
+Runs a loop of a given number of recursive calls and reports the peak
+resident memory of the process. The calls are nested at most about 2,000
+deep (1,000 outer iterations, each running an inner loop of 1,000 calls), so
+if finished environments are reclaimed, peak memory stays flat as the
+iteration count grows.
+
+Each size runs in a fresh interpreter so that peak memory is measured per
+run. Linux reports ru_maxrss in kilobytes.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.env_memory [iterations ...]
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+from Benchmarks.machine_workloads import compile_program
+
+INNER = 1000
+
+def loop_program(iterations):
+    """Build a program making the given number of calls in loops of INNER calls."""
+    outer = max(1, iterations // INNER)
+    return f"""
+        let rec Inner n = n eq 0 -> 0 | Inner (n - 1) in
+        let rec Outer m = m eq 0 -> 0 | Inner {INNER} + Outer (m - 1)
+        in Print (Outer {outer})
+    """
+
+def run(iterations):
+    """Run the loop in this process and print time and peak memory."""
+    machine = compile_program(loop_program(iterations))
+    start = time.perf_counter()
+    machine.get_answer()
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{iterations:>10} {elapsed:>10.2f} {peak_kb / 1024:>12.1f}")
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run(int(sys.argv[2]))
+        return
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    print(f"{'calls':>10} {'run (s)':>10} {'peak RSS (MB)':>12}")
+    sys.stdout.flush()
+    for size in sizes:
+        subprocess.run([sys.executable, "-m", "Benchmarks.env_memory", "--run", str(size)], check=True)
+
+if __name__ == "__main__":
+    main()
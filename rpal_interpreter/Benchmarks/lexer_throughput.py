@@ -0,0 +1,52 @@
+"""
+Lexer throughput benchmark.
+
+Tokenizes synthetic RPAL programs of increasing size and reports the
+throughput in MB/s. With a linear-time scanner the throughput stays
+roughly constant as the input grows.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.lexer_throughput [max_kb]
+"""
+
+import sys
+import time
+
+from Lexer.token_analyzer import tokenize
+
+SNIPPET = """// sum the first N integers
+let rec Sum_helper Num Acc =
+    Num eq 0 -> Acc
+    | Sum_helper (Num - 1) (Acc + Num)
+in Print (Sum_helper 100 0, 'done', Conc 'a' 'b')
+"""
+
+def make_source(size_kb):
+    """Build a source string of roughly size_kb kilobytes."""
+    repeat = max(1, (size_kb * 1024) // len(SNIPPET))
+    return SNIPPET * repeat
+
+def measure(source, rounds=3):
+    """Return the best tokenizing time over a few rounds."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tokenize(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    max_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    size_kb = 16
+    print(f"{'size (KB)':>10} {'tokens':>10} {'time (s)':>10} {'MB/s':>8}")
+    while size_kb <= max_kb:
+        source = make_source(size_kb)
+        elapsed = measure(source)
+        n_tokens = len(tokenize(source))
+        mb = len(source) / (1024 * 1024)
+        print(f"{size_kb:>10} {n_tokens:>10} {elapsed:>10.4f} {mb / elapsed:>8.2f}")
+        size_kb *= 4
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+CSE Machine workload benchmark.
+
+Runs a set of RPAL programs through the whole pipeline and reports the time
+spent building the control structures and executing them.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.machine_workloads [workload ...]
+"""
+
+import sys
+import time
+
+from Lexer.token_analyzer import tokenize
+from Parser.syntax_parser import SyntaxParser
+from Standardizer.tree import StandardTree
+from CSEMachine.factory import CSEMachineFactory
+
+WORKLOADS = {
+    # Naive doubly recursive Fibonacci
+    "fib": """
+        let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2)
+        in Print (fib 15)
+    """,
+    # Fibonacci referring to variables bound several environments up
+    "fib_free": """
+        let a = 1 in let b = 2 in let c = 3 in let d = 4 in
+        let rec fib n = n ls 2 -> n | fib (n - 1) + fib (n - 2) + a + b + c + d - 10
+        in Print (fib 15)
+    """,
+    # The accumulating Fibonacci series of Inputs/t12.txt over a wider range
+    "fib_series": """
+        let rec Fibonacci_Series(lower, upper, current, previous) =
+            (current + previous) ls lower -> Fibonacci_Series (lower, upper, current + previous, current) |
+            (current + previous) ls upper -> ((Fibonacci_Series (lower, upper, current + previous, current)), print(' '), print(current + previous)) | nil
+        in Print (Fibonacci_Series (5, 1000000000000000000000000, 1, 0))
+    """,
+    # Ackermann function: deeply nested, call-heavy recursion on a tuple
+    "ackermann": """
+        let rec A (m, n) = m eq 0 -> n + 1 | n eq 0 -> A (m - 1, 1) | A (m - 1, A (m, n - 1))
+        in Print (A (2, 200))
+    """,
+    # Non-tail recursive sum, keeping a partial result per level on the stack
+    "sum_deep": """
+        let rec Sum n = n eq 0 -> 0 | n + Sum (n - 1)
+        in Print (Sum 3000)
+    """,
+    # Tail-recursive sum in the style of Inputs/t11.txt
+    "sum_tail": """
+        let rec Sum_helper Num Acc = Num eq 0 -> Acc | Sum_helper (Num - 1) (Acc + Num)
+        in Print (Sum_helper 3000 0)
+    """,
+    # Factorial of a large number: big-integer multiplication
+    "factorial": """
+        let rec Fact n = n eq 0 -> 1 | n * Fact (n - 1)
+        in Print (Fact 1200)
+    """,
+    # Digit sum of a large factorial: repeated division of a big integer
+    "digit_sum": """
+        let rec Fact n = n eq 0 -> 1 | n * Fact (n - 1) in
+        let rec Digits n = n eq 0 -> 0 | n - n / 10 * 10 + Digits (n / 10)
+        in Print (Digits (Fact 800))
+    """,
+    # A 50,000-element tuple: every element waits on the stack until Tau runs
+    "wide_tuple": "Print (" + ", ".join(f"{i} + 1" for i in range(50000)) + ")",
+}
+
+def compile_program(source):
+    """Build a CSE Machine for the given RPAL source."""
+    tree = StandardTree(SyntaxParser(tokenize(source)).parse())
+    tree.standardize()
+    return CSEMachineFactory().get_cse_machine(tree)
+
+def main():
+    names = sys.argv[1:] or list(WORKLOADS)
+    print(f"{'workload':<12} {'build (s)':>10} {'run (s)':>10}")
+    for name in names:
+        start = time.perf_counter()
+        machine = compile_program(WORKLOADS[name])
+        built = time.perf_counter()
+        machine.get_answer()
+        finished = time.perf_counter()
+        print(f"{name:<12} {built - start:>10.3f} {finished - built:>10.3f}")
+
+if __name__ == "__main__":
+    main()
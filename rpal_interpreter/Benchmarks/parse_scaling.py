@@ -0,0 +1,35 @@
+"""
+Parser scaling benchmark.
+
+Parses synthetic programs from about a thousand up to a million tokens and
+reports the time per token, which should stay flat if parsing is linear.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.parse_scaling [max_tokens]
+"""
+
+import sys
+import time
+
+from Lexer.token_analyzer import tokenize
+from Parser.syntax_parser import SyntaxParser
+from Benchmarks.programs import wide_tuple_program
+
+# Approximate number of tokens per element of wide_tuple_program
+TOKENS_PER_ELEMENT = 12
+
+def main():
+    max_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_tokens = 1000
+    print(f"{'tokens':>10} {'parse (s)':>10} {'us/token':>10}")
+    while n_tokens <= max_tokens:
+        tokens = tokenize(wide_tuple_program(n_tokens // TOKENS_PER_ELEMENT))
+        count = len(tokens)
+        start = time.perf_counter()
+        SyntaxParser(tokens).parse()
+        elapsed = time.perf_counter() - start
+        print(f"{count:>10} {elapsed:>10.4f} {elapsed / count * 1e6:>10.2f}")
+        n_tokens *= 10
+
+if __name__ == "__main__":
+    main()
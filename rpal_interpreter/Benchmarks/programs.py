@@ -0,0 +1,13 @@
+"""
+Synthetic RPAL programs used by the benchmarks.
+"""
+
+def wide_tuple_program(n_elements):
+    """
+    Build a program printing an n-element tuple of small arithmetic expressions.
+    
+    Each element is about 12 tokens, and the parser handles tuple elements in a
+    loop, so the program can be made arbitrarily large without deep recursion.
+    """
+    elements = ", ".join(f"f {i} + {i} * (g {i} - 1)" for i in range(n_elements))
+    return f"let f x = x + 1 and g y = y * 2 in Print ({elements})"
@@ -0,0 +1,80 @@
+"""
+String walk benchmark.
+
+Walks a string of a given size character by character with Stem and Stern,
+and builds its reverse with Conc, reporting the time of each workload. The
+string is built in the program by doubling with Conc, so the source stays
+small. Each answer is checked against the same computation in Python.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.string_walk [characters [workload ...]]
+"""
+
+import sys
+import time
+
+from Benchmarks.machine_workloads import compile_program
+
+# Doubled until it is at least the requested size
+SEED = "abcdefgh"
+
+# Each workload maps to its RPAL body, using the string S, and a Python
+# function computing the expected answer from the string
+WORKLOADS = {
+    # Length by walking Stern to the end
+    "length": (
+        "let rec Length (S, N) = S eq '' -> N | Length (Stern S, N + 1) in Length (S, 0)",
+        lambda s: str(len(s)),
+    ),
+    # Count one character, looking at every character with Stem
+    "scan": (
+        "let rec Count (S, N) = S eq '' -> N | Count (Stern S, Stem S eq 'a' -> N + 1 | N) "
+        "in Count (S, 0)",
+        lambda s: str(s.count("a")),
+    ),
+    # Reverse with an accumulator, a rope grown by one character per call
+    "reverse": (
+        "let rec Rev (S, R) = S eq '' -> R | Rev (Stern S, Conc (Stem S) R) in Rev (S, '')",
+        lambda s: s[::-1],
+    ),
+    # Reverse by non-tail recursion, concatenating on the way back
+    "reverse_rec": (
+        "let rec Rev S = S eq '' -> '' | Conc (Rev (Stern S)) (Stem S) in Rev S",
+        lambda s: s[::-1],
+    ),
+}
+
+def build_string(characters):
+    """Get the number of doublings of SEED and the string they make."""
+    doublings = 0
+    s = SEED
+    while len(s) < characters:
+        s += s
+        doublings += 1
+    return doublings, s
+
+def string_program(doublings, body):
+    """Build a program binding S to SEED doubled the given number of times."""
+    return f"""
+        let rec Double (S, K) = K eq 0 -> S | Double (Conc S S, K - 1) in
+        let S = Double ('{SEED}', {doublings}) in
+        Print ({body})
+    """
+
+def main():
+    characters = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    names = sys.argv[2:] or list(WORKLOADS)
+    doublings, s = build_string(characters)
+    print(f"{len(s)} characters")
+    print(f"{'workload':<12} {'run (s)':>10}")
+    for name in names:
+        body, expected = WORKLOADS[name]
+        machine = compile_program(string_program(doublings, body))
+        start = time.perf_counter()
+        answer = machine.get_answer()
+        elapsed = time.perf_counter() - start
+        status = "" if answer == expected(s) else "  wrong answer"
+        print(f"{name:<12} {elapsed:>10.3f}{status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Tail call stress test.
+
+Runs a tail-recursive counter for a given number of iterations and reports
+the time, the largest control list and stack the machine reached, and the
+peak resident memory of the process. Every call of the counter is in tail
+position, so the control list and stack must stay the same size however
+many iterations run; the run fails if they grow with the iteration count.
+
+Each size runs in a fresh interpreter so that peak memory is measured per
+run. Linux reports ru_maxrss in kilobytes.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.tail_calls [iterations ...]
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+from Benchmarks.machine_workloads import compile_program
+
+# The control list and stack of the counter hold a few dozen symbols at most
+MAX_DEPTH = 64
+
+def counter_program(iterations):
+    """Build a program counting down from the given number by tail calls."""
+    return f"""
+        let rec Count n = n eq 0 -> 'done' | Count (n - 1)
+        in Print (Count {iterations})
+    """
+
+class DepthTracker:
+    """
+    Records the largest control list and stack a CSE Machine reaches
+
+    The machine pops the control list once per step, so wrapping its pop
+    sees every step.
+    """
+    def __init__(self, machine):
+        self.control_depth = 0
+        self.stack_depth = 0
+        tracker = self
+        stack = machine.stack
+
+        class TrackedControl(list):
+            def pop(self, *args):
+                if len(self) > tracker.control_depth:
+                    tracker.control_depth = len(self)
+                if len(stack) > tracker.stack_depth:
+                    tracker.stack_depth = len(stack)
+                return list.pop(self, *args)
+
+        machine.control = TrackedControl(machine.control)
+
+def run(iterations):
+    """Run the counter in this process and print its measurements."""
+    machine = compile_program(counter_program(iterations))
+    tracker = DepthTracker(machine)
+    start = time.perf_counter()
+    answer = machine.get_answer()
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{iterations:>10} {elapsed:>10.2f} {tracker.control_depth:>8} "
+          f"{tracker.stack_depth:>8} {peak_kb / 1024:>12.1f}")
+    if answer != "done":
+        sys.exit(f"Wrong answer: {answer}")
+    if tracker.control_depth > MAX_DEPTH or tracker.stack_depth > MAX_DEPTH:
+        sys.exit("Tail calls grew the control list or stack")
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run(int(sys.argv[2]))
+        return
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000, 10000000]
+    print(f"{'calls':>10} {'run (s)':>10} {'control':>8} {'stack':>8} {'peak RSS (MB)':>12}")
+    sys.stdout.flush()
+    for size in sizes:
+        subprocess.run([sys.executable, "-m", "Benchmarks.tail_calls", "--run", str(size)], check=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Token representation benchmark.
+
+Compares a list of Token objects with the array-backed TokenStream: memory
+retained per token, and the time SyntaxParser takes to parse from each.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.token_memory [n_elements]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from Lexer.token_analyzer import tokenize
+from Lexer.token_stream import TokenStream
+from Parser.syntax_parser import SyntaxParser
+from Benchmarks.programs import wide_tuple_program
+
+def retained_bytes(build):
+    """Return the object built by build() and the memory it retains."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def parse_time(tokens):
+    """Return the time taken to parse the given tokens."""
+    start = time.perf_counter()
+    SyntaxParser(tokens).parse()
+    return time.perf_counter() - start
+
+def main():
+    n_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = wide_tuple_program(n_elements)
+    
+    token_list, list_bytes = retained_bytes(lambda: tokenize(source))
+    stream, stream_bytes = retained_bytes(lambda: TokenStream(tokenize(source)))
+    n_tokens = len(token_list)
+    
+    print(f"{n_tokens} tokens")
+    print(f"{'representation':<16} {'bytes/token':>12} {'parse (s)':>10} {'tokens/s':>12}")
+    for name, tokens, size in (("list of Token", token_list, list_bytes),
+                               ("TokenStream", stream, stream_bytes)):
+        elapsed = parse_time(tokens)
+        print(f"{name:<16} {size / n_tokens:>12.1f} {elapsed:>10.3f} {n_tokens / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Tuple building benchmark.
+
+Builds a tuple of a given number of elements with aug, one element per
+call, then reads it back with Order and indexing. Each tuple extends the
+previous one, so if aug copied its tuple the build would take quadratic
+time. The "branches" workload extends each tuple in two different ways,
+checking that tuples sharing elements never see each other's. Only the
+first extension of a tuple can append in place, so it copies at every step
+and runs on a hundredth of the elements.
+
+Usage (from the rpal_interpreter directory):
+    python -m Benchmarks.tuple_aug [elements [workload ...]]
+"""
+
+import sys
+import time
+
+from Benchmarks.machine_workloads import compile_program
+
+BUILD = "let rec Build (T, N) = N gr Size -> T | Build (T aug N, N + 1) in"
+
+# Each workload maps to its RPAL body, using Build and Size, and a function
+# computing the expected answer from Size
+WORKLOADS = {
+    # Build the tuple and take its length
+    "build": (
+        "Order (Build (nil, 1))",
+        lambda n: str(n),
+    ),
+    # Build the tuple and sum its elements by indexing
+    "index": (
+        "let T = Build (nil, 1) in "
+        "let rec Sum (I, A) = I eq 0 -> A | Sum (I - 1, A + T I) in Sum (Order T, 0)",
+        lambda n: str(n * (n + 1) // 2),
+    ),
+    # Extend every tuple twice, continuing from the second extension
+    "branches": (
+        "let rec Branch (T, N) = N gr Size / 100 -> T | "
+        "(let A = T aug 0 in let B = T aug N in "
+        "A N eq 0 & B N eq N -> Branch (B, N + 1) | nil) in "
+        "let T = Branch (nil, 1) in (Order T, T (Order T))",
+        lambda n: f"({n // 100}, {n // 100})",
+    ),
+}
+
+def tuple_program(size, body):
+    """Build a program running the body with Size bound to the given size."""
+    return f"""
+        let Size = {size} in
+        {BUILD}
+        Print ({body})
+    """
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    names = sys.argv[2:] or list(WORKLOADS)
+    print(f"{size} elements")
+    print(f"{'workload':<12} {'run (s)':>10}")
+    for name in names:
+        body, expected = WORKLOADS[name]
+        machine = compile_program(tuple_program(size, body))
+        start = time.perf_counter()
+        answer = machine.get_answer()
+        elapsed = time.perf_counter() - start
+        status = "" if answer == expected(size) else f"  wrong answer: {answer[:60]}"
+        print(f"{name:<12} {elapsed:>10.3f}{status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Compiles standardized trees to bytecode for the BytecodeMachine.
+"""
+
+from Parser.node_type import NodeType
+from CSEMachine.factory import SYMBOL_BUILDERS
+from CSEMachine.symbols import Err
+from CSEMachine.primitives import UNARY_OPERATORS, BINARY_OPERATORS
+from .opcodes import *
+
+UNARY_KINDS = frozenset([NodeType.op_neg, NodeType.op_not])
+
+BINARY_KINDS = frozenset([
+    NodeType.op_plus, NodeType.op_minus, NodeType.op_mul, NodeType.op_div,
+    NodeType.op_pow, NodeType.op_and, NodeType.op_or, NodeType.op_compare,
+    NodeType.aug,
+])
+
+class Code:
+    """
+    The compiled body of a lambda, or of the whole program
+
+    Attributes:
+        index (int): The lambda's number, 0 for the program
+        identifiers (list): Names of the lambda's parameters
+        instructions (list): Flat array of (opcode, argument) pairs
+    """
+    def __init__(self, index, identifiers):
+        self.index = index
+        self.identifiers = identifiers
+        self.instructions = []
+
+    def get_index(self):
+        return self.index
+
+class Program:
+    """
+    A compiled program: the code of every lambda and the operand tables their
+    instructions index into
+
+    Attributes:
+        main (Code): Code of the program body
+        codes (list): Code of every lambda, indexed by CLOSURE
+        constants (list): Literal values, indexed by CONST
+        names (list): Unbound identifier names, indexed by GLOBAL
+        addresses (list): (depth, slot) pairs of free identifiers, indexed by LOAD
+        operators (list): Operator functions, indexed by UNARY and BINARY
+    """
+    def __init__(self):
+        self.main = None
+        self.codes = []
+        self.constants = []
+        self.names = []
+        self.addresses = []
+        self.operators = []
+
+class BytecodeCompiler:
+    """
+    Compiles a standardized tree to a Program
+
+    Instructions are emitted in the order the CSE Machine evaluates the
+    control structures built by CSEMachineFactory: the children of a node
+    right to left, then the node itself. Conditionals compile to jumps and
+    lambdas to separate Code objects, so nothing is copied when they run.
+    """
+    def __init__(self):
+        """Initialize a new BytecodeCompiler instance"""
+        self.program = Program()
+        self.scopes = []  # Parameter names of each enclosing lambda, innermost last
+        self.table_indices = {}  # Index of each name, address and operator in its table
+
+    def compile(self, ast):
+        """
+        Compile a standardized tree
+
+        Args:
+            ast: The standardized abstract syntax tree
+
+        Returns:
+            Program: The compiled program
+        """
+        main = Code(0, [])
+        self.compile_body(main, ast.get_root())
+        self.program.main = main
+        return self.program
+
+    def compile_body(self, code, node):
+        """
+        Compile an expression as the body of a Code, ending it with RETURN
+
+        Args:
+            code (Code): The code to append to
+            node: The expression's node in the standardized tree
+        """
+        self.compile_node(code.instructions, node)
+        code.instructions += [RETURN, 0]
+
+    def compile_node(self, instructions, node):
+        """
+        Append the instructions that evaluate a node and push its value
+
+        Args:
+            instructions (list): The code array to append to
+            node: A node from the standardized tree
+        """
+        kind = node.get_kind()
+        children = node.get_children()
+
+        if kind == NodeType.lambda_expr:
+            instructions += [CLOSURE, self.compile_lambda(node)]
+            return
+
+        if kind == NodeType.conditional:
+            # condition, then the branch selected by it
+            self.compile_node(instructions, children[0])
+            instructions += [JUMP_UNLESS_TRUE, 0]
+            else_jump = len(instructions) - 1
+            self.compile_node(instructions, children[1])
+            instructions += [JUMP, 0]
+            end_jump = len(instructions) - 1
+            instructions[else_jump] = len(instructions)
+            self.compile_node(instructions, children[2])
+            instructions[end_jump] = len(instructions)
+            return
+
+        for child in reversed(children):
+            self.compile_node(instructions, child)
+
+        if kind == NodeType.identifier:
+            instructions += self.get_identifier(node.get_value())
+        elif kind == NodeType.gamma:
+            instructions += [CALL, 0]
+        elif kind == NodeType.tau:
+            instructions += [TUPLE, len(children)]
+        elif kind in UNARY_KINDS:
+            instructions += [UNARY, self.get_operator(UNARY_OPERATORS, node.get_value())]
+        elif kind in BINARY_KINDS:
+            instructions += [BINARY, self.get_operator(BINARY_OPERATORS, node.get_value())]
+        else:
+            instructions += [CONST, self.get_constant(node)]
+
+    def compile_lambda(self, node):
+        """
+        Compile a lambda node to a new Code
+
+        Args:
+            node: A lambda node from the standardized tree
+
+        Returns:
+            int: Index of the Code in the program's code table
+        """
+        parameters = node.get_children()[0]
+        if parameters.get_kind() == NodeType.comma:
+            identifiers = [identifier.get_value() for identifier in parameters.get_children()]
+        else:
+            identifiers = [parameters.get_value()]
+
+        code = Code(len(self.program.codes) + 1, identifiers)
+        self.program.codes.append(code)
+
+        # The body sees the parameters as the innermost scope
+        self.scopes.append(identifiers)
+        self.compile_body(code, node.get_children()[1])
+        self.scopes.pop()
+
+        return code.get_index() - 1
+
+    def get_identifier(self, name):
+        """
+        Get the instruction that pushes the value of an identifier
+
+        Environments are lists holding the parent environment first and then
+        the bound values, so the value bound to parameter i is at slot i + 1.
+
+        Args:
+            name (str): The identifier's name
+
+        Returns:
+            list: The instruction's opcode and argument
+        """
+        for depth in range(len(self.scopes)):
+            names = self.scopes[-1 - depth]
+            if name in names:
+                slot = names.index(name) + 1
+                if depth == 0:
+                    return [LOCAL, slot]
+                return [LOAD, self.get_table_index(self.program.addresses, (depth, slot))]
+        return [GLOBAL, self.get_table_index(self.program.names, name)]
+
+    def get_operator(self, operators, op):
+        """
+        Args:
+            operators (dict): UNARY_OPERATORS or BINARY_OPERATORS
+            op (str): The operator's name
+
+        Returns:
+            int: Index of the operator function in the program's operator table
+        """
+        operator = operators.get(op)
+        if operator is None:
+            # Evaluates to an error value, as in the CSE Machine
+            operator = lambda *rands: Err()
+        return self.get_table_index(self.program.operators, operator)
+
+    def get_constant(self, node):
+        """
+        Add the value of a literal node to the program's constants
+
+        Every literal gets its own constant, as every literal in the CSE
+        Machine's control structures is its own symbol.
+
+        Args:
+            node: A literal node from the standardized tree
+
+        Returns:
+            int: Index of the value in the program's constant table
+        """
+        build = SYMBOL_BUILDERS.get(node.get_kind())
+        if build is None:
+            print("Error: Unknown node type:", node.get_data())
+            value = Err()
+        else:
+            value = build(node)
+        self.program.constants.append(value)
+        return len(self.program.constants) - 1
+
+    def get_table_index(self, table, entry):
+        """
+        Get the index of an entry in an operand table, adding it if needed
+
+        Args:
+            table (list): One of the program's operand tables
+            entry: A hashable table entry
+
+        Returns:
+            int: Index of the entry in the table
+        """
+        key = (id(table), entry)
+        index = self.table_indices.get(key)
+        if index is None:
+            index = len(table)
+            table.append(entry)
+            self.table_indices[key] = index
+        return index
@@ -0,0 +1,149 @@
+"""
+Executes programs compiled by the BytecodeCompiler.
+"""
+
+from CSEMachine.symbols import Closure, Eta, Symbol, Tup, Ystar
+from CSEMachine.primitives import format_value, get_builtin
+from .opcodes import *
+
+class BytecodeMachine:
+    """
+    Stack machine running a compiled Program
+
+    Values are the same symbols the CSE Machine uses. Each call pushes a
+    frame holding the caller's code array, instruction pointer and
+    environment, so entering a lambda costs no copying of its body.
+    Environments are lists holding the parent environment followed by the
+    values bound to the lambda's parameters.
+    """
+    def __init__(self, program):
+        """
+        Initialize a new BytecodeMachine instance
+
+        Args:
+            program (Program): The compiled program
+        """
+        self.program = program
+        self.stack = []
+
+    def execute(self):
+        """Run the program until its main code returns"""
+        program = self.program
+        constants = program.constants
+        names = program.names
+        addresses = program.addresses
+        operators = program.operators
+        codes = program.codes
+
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        frames = []
+
+        code = program.main.instructions
+        ip = 0
+        environment = [None]
+
+        while True:
+            op = code[ip]
+            arg = code[ip + 1]
+            ip += 2
+
+            if op == LOCAL:
+                push(environment[arg])
+
+            elif op == LOAD:
+                depth, slot = addresses[arg]
+                env = environment
+                for _ in range(depth):
+                    env = env[0]
+                push(env[slot])
+
+            elif op == CONST:
+                push(constants[arg])
+
+            elif op == CALL:
+                rator = pop()
+                return_ip = ip
+                if type(rator) is Eta:
+                    # Apply the wrapped closure to the eta itself, then run
+                    # this CALL again to apply the result to the argument
+                    push(rator)
+                    rator = rator.lambda_
+                    return_ip = ip - 2
+
+                if type(rator) is Closure:
+                    callee = rator.lambda_
+                    n = len(callee.identifiers)
+                    if n == 1:
+                        # Single parameter
+                        env = [rator.environment, pop()]
+                    else:
+                        # Multiple parameters as tuple
+                        tup = pop()
+                        env = [rator.environment]
+                        env += tup.unpack(n)
+                    frames.append((code, return_ip, environment))
+                    code = callee.instructions
+                    ip = 0
+                    environment = env
+
+                elif type(rator) is Tup:
+                    # Tuple indexing
+                    push(rator.get(pop().get_data()))
+
+                elif type(rator) is Ystar:
+                    # Wrap the closure passed to Y* for recursion
+                    closure = pop()
+                    callee = closure.get_lambda()
+                    eta = Eta()
+                    eta.set_index(callee.get_index())
+                    eta.set_environment(closure.get_environment())
+                    eta.set_identifier(callee.identifiers[0])
+                    eta.set_lambda(closure)
+                    push(eta)
+
+                else:
+                    # Built-in functions, named by unbound identifiers, and
+                    # their partial applications
+                    builtin = get_builtin(rator)
+                    if builtin is not None:
+                        builtin(stack)
+
+            elif op == RETURN:
+                if not frames:
+                    break
+                code, ip, environment = frames.pop()
+
+            elif op == BINARY:
+                rand1 = pop()
+                push(operators[arg](rand1, pop()))
+
+            elif op == JUMP_UNLESS_TRUE:
+                if pop().get_data() is not True:
+                    ip = arg
+
+            elif op == JUMP:
+                ip = arg
+
+            elif op == CLOSURE:
+                push(Closure(codes[arg], environment))
+
+            elif op == GLOBAL:
+                push(Symbol(names[arg]))
+
+            elif op == UNARY:
+                push(operators[arg](pop()))
+
+            elif op == TUPLE:
+                push(Tup([pop() for _ in range(arg)]))
+
+    def get_answer(self):
+        """
+        Execute the program and get the final result
+
+        Returns:
+            str: String representation of the final result
+        """
+        self.execute()
+        return format_value(self.stack[-1])
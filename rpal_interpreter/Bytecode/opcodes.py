@@ -0,0 +1,25 @@
+"""
+Instruction set of the bytecode engine.
+
+An instruction is two consecutive entries of a code array: the opcode and
+its argument. The argument is an index into one of the program's operand
+tables, a count or a jump target, and 0 for instructions that take none.
+"""
+
+CONST = 0             # Push constants[arg]
+LOCAL = 1             # Push slot arg of the current environment
+LOAD = 2              # Push the value at addresses[arg], a (depth, slot) pair
+GLOBAL = 3            # Push the unbound identifier names[arg] (built-in functions)
+CLOSURE = 4           # Push a closure of codes[arg] over the current environment
+CALL = 5              # Apply the value on top of the stack to the value below it
+UNARY = 6             # Apply operators[arg] to the top value
+BINARY = 7            # Apply operators[arg] to the top value and the one below it
+TUPLE = 8             # Replace the top arg values with a tuple of them, top first
+JUMP = 9              # Continue at instruction arg
+JUMP_UNLESS_TRUE = 10 # Pop a value and continue at instruction arg unless it is true
+RETURN = 11           # Return the top value to the caller
+
+OPCODE_NAMES = [
+    "CONST", "LOCAL", "LOAD", "GLOBAL", "CLOSURE", "CALL", "UNARY", "BINARY",
+    "TUPLE", "JUMP", "JUMP_UNLESS_TRUE", "RETURN",
+]
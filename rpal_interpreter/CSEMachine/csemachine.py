@@ -1,5 +1,8 @@
 
+import sys
+
 from .symbols import *
+from .primitives import apply_unary_operation, apply_binary_operation, format_value, get_builtin
 
 class CSEMachine:
     """
@@ -11,222 +14,232 @@ class CSEMachine:
         
         Args:
             control (list): The control list of symbols to process
-            stack (list): The stack for storing intermediate results
-            environment (list): The environment list for variable bindings
+            stack (list): The stack for storing intermediate results, top last
+            environment (list): The initial environment list; its first entry is
+                the primitive environment the program starts in
         """
         self.control = control
         self.stack = stack
         self.environment = environment
+        self.memo = None
+        self.profiler = None
+        self.max_steps = None
+        self.steps = 0  # Control symbols processed by execute
+
+    def set_memo(self, memo):
+        """
+        Args:
+            memo (MemoCache): Cache for the results of applications of
+                rec-bound functions, or None not to memoize
+        """
+        self.memo = memo
+
+    def get_memo(self):
+        return self.memo
+
+    def set_profiler(self, profiler):
+        """
+        Args:
+            profiler (FunctionProfiler): Profiler told of every function
+                application and frame exit, or None not to trace them
+        """
+        self.profiler = profiler
+
+    def get_profiler(self):
+        return self.profiler
+
+    def set_max_steps(self, max_steps):
+        """
+        Args:
+            max_steps (int): Steps after which execute stops with an error,
+                or None for no limit
+        """
+        self.max_steps = max_steps
+
+    def get_max_steps(self):
+        return self.max_steps
+
+    def get_steps(self):
+        return self.steps
 
     def execute(self):
+        """
+        Run the machine until the control list is empty
+        
+        The top of the stack is the end of the stack list, so pushes and pops
+        are constant time however deep the stack grows.
+        """
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        memo = self.memo
+        profiler = self.profiler
+        max_steps = sys.maxsize if self.max_steps is None else self.max_steps
         
         current_environment = self.environment[0]
         j = 1
+        steps = 0
+        if profiler is not None:
+            profiler.enter(None, steps)
         while self.control:
             
-            
+            steps += 1
+            if steps > max_steps:
+                self.steps = max_steps
+                raise RuntimeError(f"Step limit of {max_steps} exceeded")
             current_symbol = self.control.pop()
             
             if isinstance(current_symbol, Id):
                 # Handle identifier lookup in the environment
-                self.stack.insert(0, current_environment.lookup(current_symbol))
+                push(current_environment.lookup(current_symbol))
                 
             elif isinstance(current_symbol, Lambda):
-                # Handle lambda expression
-                current_symbol.set_environment(current_environment.get_index())
-                self.stack.insert(0, current_symbol)
+                # Handle lambda expression: capture the current environment
+                push(Closure(current_symbol, current_environment))
+                
+            elif isinstance(current_symbol, Rec):
+                # Handle a recursive function definition: bind the function's
+                # name to its own closure, so that recursive calls apply it
+                # directly instead of unrolling an Eta. It prints as the Eta
+                # it replaces.
+                e = E(j)
+                j += 1
+                e.set_parent(current_environment)
+                closure = Closure(current_symbol.get_lambda(), e)
+                closure.set_data("eta")
+                e.slots = [closure]
+                push(closure)
                 
             elif isinstance(current_symbol, Gamma):
                 # Handle function application
-                next_symbol = self.stack.pop(0)
+                next_symbol = pop()
                 
-                if isinstance(next_symbol, Lambda):
+                if isinstance(next_symbol, Closure):
                     # Handle Lambda application
-                    lambda_expr = next_symbol
+                    lambda_expr = next_symbol.get_lambda()
+                    memo_key = None
+                    if memo is not None and lambda_expr.recursive:
+                        # Memoized function: reuse the result of an earlier
+                        # application to an equal argument
+                        memo_key = memo.get_key(lambda_expr, next_symbol.get_environment(), stack[-1])
+                        if memo_key is not None:
+                            result = memo.lookup(memo_key)
+                            if result is not None:
+                                pop()
+                                push(result)
+                                continue
+                    
                     e = E(j)
                     j += 1
+                    e.lambda_ = lambda_expr
+                    e.memo_key = memo_key
                     
                     if len(lambda_expr.identifiers) == 1:
                         # Single parameter
-                        temp = self.stack.pop(0)
-                        e.values[lambda_expr.identifiers[0]] = temp
+                        e.slots = [pop()]
                     else:
                         # Multiple parameters as tuple
-                        tup = self.stack.pop(0)
-                        for i, id in enumerate(lambda_expr.identifiers):
-                            e.values[id] = tup.symbols[i]
+                        tup = pop()
+                        e.slots = tup.unpack(len(lambda_expr.identifiers))
                     
                     # Set up environment chain
-                    for env in self.environment:
-                        if env.get_index() == lambda_expr.get_environment():
-                            e.set_parent(env)
-                    
+                    e.set_parent(next_symbol.get_environment())
+
+                    control = self.control
+                    if control and type(control[-1]) is E and control[-1].memo_key is None:
+                        # Tail call: all that is left of the current frame is
+                        # its exit, so the new frame replaces it and returns
+                        # straight to the caller. Loops written as tail
+                        # recursion then run in constant control and stack.
+                        # Frames whose result is to be memoized are kept.
+                        finished = control.pop()
+                        pop()
+                        if profiler is not None and finished.lambda_ is not None:
+                            # The program body stays the root of the profile
+                            profiler.exit(steps)
+                        e.set_previous(finished.get_previous())
+                        finished.set_previous(None)
+                    else:
+                        # Remember where to return to when the frame exits
+                        e.set_previous(current_environment)
+                    if profiler is not None:
+                        profiler.enter(lambda_expr, steps)
                     current_environment = e
                     self.control.append(e)
                     self.control.append(lambda_expr.get_delta())
-                    self.stack.insert(0, e)
-                    self.environment.append(e)
+                    push(e)
                     
                 elif isinstance(next_symbol, Tup):
                     # Handle tuple indexing
                     tup = next_symbol
-                    i = int(self.stack.pop(0).get_data())
-                    self.stack.insert(0, tup.symbols[i - 1])
+                    i = pop().get_data()
+                    push(tup.get(i))
                     
                 elif isinstance(next_symbol, Ystar):
                     # Handle recursion with Y* operator
-                    lambda_expr = self.stack.pop(0)
+                    closure = pop()
+                    lambda_expr = closure.get_lambda()
                     eta = Eta()
                     eta.set_index(lambda_expr.get_index())
-                    eta.set_environment(lambda_expr.get_environment())
+                    eta.set_environment(closure.get_environment())
                     eta.set_identifier(lambda_expr.identifiers[0])
-                    eta.set_lambda(lambda_expr)
-                    self.stack.insert(0, eta)
+                    eta.set_lambda(closure)
+                    push(eta)
                     
                 elif isinstance(next_symbol, Eta):
                     # Handle Eta expression for recursion
                     eta = next_symbol
-                    lambda_expr = eta.get_lambda()
                     self.control.append(Gamma())
                     self.control.append(Gamma())
-                    self.stack.insert(0, eta)
-                    self.stack.insert(0, lambda_expr)
+                    push(eta)
+                    push(eta.get_lambda())
                     
                 else:
-                    # Handle built-in functions
-                    if next_symbol.get_data() == "Print":
-                        # Print function - prints the value
-                        value = self.stack.pop(0)
-                        value.get_data()              ###########################
-                        self.stack.insert(0, value)
-                        
-                    elif next_symbol.get_data() == "Stem":
-                        # Stem function - gets first character of string
-                        s = self.stack.pop(0)
-                        s.set_data(s.get_data()[0])
-                        self.stack.insert(0, s)
-                        
-                    elif next_symbol.get_data() == "Stern":
-                        # Stern function - gets all but first character of string
-                        s = self.stack.pop(0)
-                        s.set_data(s.get_data()[1:])
-                        self.stack.insert(0, s)
-                        
-                    elif next_symbol.get_data() == "Conc":
-                        # Conc function - concatenates two strings
-                        s1 = self.stack.pop(0)
-                        s2 = self.stack.pop(0)
-                        s1.set_data(s1.get_data() + s2.get_data())
-                        self.stack.insert(0, s1)
-                        
-                    elif next_symbol.get_data() == "Order":
-                        # Order function - gets length of tuple
-                        tup = self.stack.pop(0)
-                        n = Int(str(len(tup.symbols)))
-                        self.stack.insert(0, n)
-                        
-                    elif next_symbol.get_data() == "Isinteger":
-                        # Isinteger function - checks if value is integer
-                        if isinstance(self.stack[0], Int):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
-                        
-                    elif next_symbol.get_data() == "Null":
-                        # Null function - checks if tuple is empty
-                        tup = self.stack.pop(0)
-                        if len(tup.symbols) == 0:
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                            
-                    elif next_symbol.get_data() == "Itos":
-                        # Itos function - converts integer to string
-                        i = self.stack.pop(0)
-                        self.stack.insert(0, Str(i.get_data()))
-                        
-                    elif next_symbol.get_data() == "Isstring":
-                        # Isstring function - checks if value is string
-                        if isinstance(self.stack[0], Str):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
-                        
-                    elif next_symbol.get_data() == "Istuple":
-                        # Istuple function - checks if value is tuple
-                        if isinstance(self.stack[0], Tup):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
-                        
-                    elif next_symbol.get_data() == "Isdummy":
-                        # Isdummy function - checks if value is dummy
-                        if isinstance(self.stack[0], Dummy):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
-                        
-                    elif next_symbol.get_data() == "Istruthvalue":
-                        # Istruthvalue function - checks if value is boolean
-                        if isinstance(self.stack[0], Bool):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
-                        
-                    elif next_symbol.get_data() == "Isfunction":
-                        # Isfunction function - checks if value is function
-                        if isinstance(self.stack[0], Lambda):
-                            self.stack.insert(0, Bool("true"))
-                        else:
-                            self.stack.insert(0, Bool("false"))
-                        self.stack.pop(1)
+                    # Handle built-in functions, named by unbound identifiers,
+                    # and their partial applications
+                    builtin = get_builtin(next_symbol)
+                    if builtin is not None:
+                        builtin(stack)
                         
             elif isinstance(current_symbol, E):
-                # Handle environment cleanup
-                self.stack.pop(1)
-                self.environment[current_symbol.get_index()].set_is_removed(True)
-                y = len(self.environment)
-                while y > 0:
-                    if not self.environment[y - 1].get_is_removed():
-                        current_environment = self.environment[y - 1]
-                        break
-                    else:
-                        y -= 1
+                # Handle environment cleanup: drop the environment marker
+                # sitting just below the frame's result
+                del stack[-2]
+                if current_symbol.memo_key is not None:
+                    memo.store(current_symbol.memo_key, stack[-1])
+                    current_symbol.memo_key = None
+                if profiler is not None and current_symbol.lambda_ is not None:
+                    profiler.exit(steps)
+                # Return to the caller's environment. Dropping the link lets the
+                # frame be reclaimed unless a closure still refers to it.
+                current_environment = current_symbol.get_previous()
+                current_symbol.set_previous(None)
                         
             elif isinstance(current_symbol, Rator):
                 if isinstance(current_symbol, Uop):
                     # Handle unary operations
                     rator = current_symbol
-                    rand = self.stack.pop(0)
-                    self.stack.insert(0, self.apply_unary_operation(rator, rand))
+                    rand = pop()
+                    push(apply_unary_operation(rator.data, rand))
                     
                 if isinstance(current_symbol, Bop):
                     # Handle binary operations
                     rator = current_symbol
-                    rand1 = self.stack.pop(0)
-                    rand2 = self.stack.pop(0)
-                    self.stack.insert(0, self.apply_binary_operation(rator, rand1, rand2))
+                    rand1 = pop()
+                    rand2 = pop()
+                    push(apply_binary_operation(rator.data, rand1, rand2))
                     
             elif isinstance(current_symbol, Beta):
                 # Handle conditional branching
-                if self.stack[0].get_data() == "true":
+                if pop().get_data() is True:
                     self.control.pop()
                 else:
                     self.control.pop(-2)
-                self.stack.pop(0)
                 
             elif isinstance(current_symbol, Tau):
                 # Handle tuple creation
                 tau = current_symbol
-                tup = Tup()
-                for _ in range(tau.get_n()):
-                    tup.symbols.append(self.stack.pop(0))
-                self.stack.insert(0, tup)
+                push(Tup([pop() for _ in range(tau.get_n())]))
                 
             elif isinstance(current_symbol, Delta):
                 # Handle code block execution
@@ -238,128 +251,11 @@ class CSEMachine:
                 
             else:
                 # Handle other symbols (literals)
-                self.stack.insert(0, current_symbol)
-
-    def convert_string_to_bool(self, data):
-        """
-        Convert string representation of boolean to Python boolean
-        
-        Args:
-            data (str): String representation of boolean ("true" or "false")
-            
-        """
-        if data == "true":
-            return True
-        elif data == "false":
-            return False
+                push(current_symbol)
 
-    def apply_unary_operation(self, rator, rand):
-        """
-        Args:
-            rator (Uop): Unary operator
-            rand (Rand): Operand
-            
-        Returns:
-            Symbol: Result of the operation
-        """
-        if rator.get_data() == "neg":
-            val = int(rand.get_data())
-            return Int(str(-1 * val))
-        elif rator.get_data() == "not":
-            val = self.convert_string_to_bool(rand.get_data())
-            return Bool(str(not val).lower())
-        else:
-            return Err()
-
-    def apply_binary_operation(self, rator, rand1, rand2):
-        """      
-        Args:
-            rator (Bop): Binary operator
-            rand1 (Rand): First operand
-            rand2 (Rand): Second operand
-            
-        Returns:
-            Symbol: Result of the operation
-        """
-        if rator.get_data() == "+":
-            val1 = int(rand1.get_data())
-            val2 = int(rand2.get_data())
-            return Int(str(val1 + val2))
-        elif rator.data == "-":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Int(str(val1 - val2))
-        elif rator.data == "*":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Int(str(val1 * val2))
-        elif rator.data == "/":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Int(str(int(val1 / val2)))
-        elif rator.data == "**":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Int(str(val1 ** val2))
-        elif rator.data == "&":
-            val1 = self.convert_string_to_bool(rand1.data)
-            val2 = self.convert_string_to_bool(rand2.data)
-            return Bool(str(val1 and val2).lower())
-        elif rator.data == "or":
-            val1 = self.convert_string_to_bool(rand1.data)
-            val2 = self.convert_string_to_bool(rand2.data)
-            return Bool(str(val1 or val2).lower())
-        elif rator.data == "eq":
-            val1 = rand1.data
-            val2 = rand2.data
-            return Bool(str(val1 == val2).lower())
-        elif rator.data == "ne":
-            val1 = rand1.data
-            val2 = rand2.data
-            return Bool(str(val1 != val2).lower())
-        elif rator.data == "ls":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Bool(str(val1 < val2).lower())
-        elif rator.data == "le":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Bool(str(val1 <= val2).lower())
-        elif rator.data == "gr":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Bool(str(val1 > val2).lower())
-        elif rator.data == "ge":
-            val1 = int(rand1.data)
-            val2 = int(rand2.data)
-            return Bool(str(val1 >= val2).lower())
-        elif rator.data == "aug":
-            if isinstance(rand2, Tup):
-                rand1.symbols.extend(rand2.symbols)
-            else:
-                rand1.symbols.append(rand2)
-            return rand1
-        else:
-            return Err()
-
-    def get_tuple_value(self, tup):
-        """
-        Get string representation of a tuple
-        
-        Args:
-            tup (Tup): Tuple to convert to string
-            
-        Returns:
-            str: String representation of the tuple
-        """
-        temp = "("
-        for symbol in tup.symbols:
-            if isinstance(symbol, Tup):
-                temp += self.get_tuple_value(symbol) + ", "
-            else:
-                temp += symbol.get_data() + ", "
-        temp = temp[:-2] + ")" if len(tup.symbols) > 0 else temp + ")"
-        return temp
+        self.steps = steps
+        if profiler is not None:
+            profiler.finish(steps)
 
     def get_answer(self):
         """
@@ -369,6 +265,4 @@ class CSEMachine:
             str: String representation of the final result
         """
         self.execute()
-        if isinstance(self.stack[0], Tup):
-            return self.get_tuple_value(self.stack[0])
-        return self.stack[0].get_data()
+        return format_value(self.stack[-1])
@@ -1,4 +1,5 @@
 
+from Parser.node_type import NodeType
 from .symbols import *
 from .csemachine import CSEMachine
 
@@ -11,6 +12,8 @@ class CSEMachineFactory:
         self.e0 = E(0)
         self.i = 1  # Lambda index counter
         self.j = 0  # Delta index counter
+        self.scopes = []  # Identifier names bound by each enclosing lambda, innermost last
+        self.names = {}  # Name of each lambda node bound to an identifier
 
     def get_symbol(self, node):
         """
@@ -22,38 +25,33 @@ class CSEMachineFactory:
         Returns:
             Symbol: The corresponding CSE Machine symbol
         """
-        data = node.get_data()
-        
-        # Handle operators
-        if data in ("not", "neg"):
-            return Uop(data)  # Unary operator symbol
-        elif data in ("+", "-", "*", "/", "**", "&", "or", "eq", "ne", "ls", "le", "gr", "ge", "aug"):
-            return Bop(data)  # Binary operator symbol
-        elif data == "gamma":
-            return Gamma()  # Gamma symbol
-        elif data == "tau":
-            return Tau(len(node.get_children()))  # Tau symbol with the number of children
-        elif data == "<Y*>":
-            return Ystar()  # Y* symbol
-        else:
-            # Handle special node types (identifiers, literals, etc.)
-            if data.startswith("<IDENTIFIER:"):
-                return Id(data[12:-1])  # Identifier symbol
-            elif data.startswith("<INTEGER:"):
-                return Int(data[9:-1])  # Integer symbol
-            elif data.startswith("<STRING:"):
-                return Str(data[9:-2])  # String symbol (remove quotes)
-            elif data.startswith("<NIL"):
-                return Tup()  # Empty tuple symbol
-            elif data.startswith("<TRUE_VALUE:t"):
-                return Bool("true")  # Boolean true symbol
-            elif data.startswith("<TRUE_VALUE:f"):
-                return Bool("false")  # Boolean false symbol
-            elif data.startswith("<dummy>"):
-                return Dummy()  # Dummy symbol
-            else:
-                print("Error: Unknown node type:", data)
-                return Err()  # Error symbol
+        kind = node.get_kind()
+        if kind == NodeType.identifier:
+            identifier = self.get_id(node.get_value())
+            identifier.set_position(node.get_position())
+            return identifier
+        build = SYMBOL_BUILDERS.get(kind)
+        if build is None:
+            print("Error: Unknown node type:", node.get_data())
+            return Err()  # Error symbol
+        return build(node)
+
+    def get_id(self, name):
+        """
+        Create an Id symbol resolved to the lambda that binds it
+        
+        Args:
+            name (str): The identifier's name
+            
+        Returns:
+            Id: An Id addressed by (depth, slot) in the enclosing scopes, or an
+            unresolved Id if no enclosing lambda binds the name
+        """
+        for depth in range(len(self.scopes)):
+            names = self.scopes[-1 - depth]
+            if name in names:
+                return Id(name, depth, names.index(name))
+        return Id(name)
 
     def get_b(self, node):
         """
@@ -80,18 +78,92 @@ class CSEMachineFactory:
             Lambda: A Lambda symbol with its properties set
         """
         lambda_expr = Lambda(self.i)
+        lambda_expr.set_position(node.get_position())
         self.i += 1
-        lambda_expr.set_delta(self.get_delta(node.get_children()[1]))
+        
+        # A function's curried lambdas are all named after it
+        name = self.names.pop(node, None)
+        lambda_expr.set_name(name)
+        if name is not None and node.get_children()[1].get_kind() == NodeType.lambda_expr:
+            self.names[node.get_children()[1]] = name
         
         # Handle parameter list
-        if node.get_children()[0].get_data() == ",":
-            for identifier in node.get_children()[0].get_children():
-                lambda_expr.identifiers.append(Id(identifier.get_data()[12:-1]))
+        parameters = node.get_children()[0]
+        if parameters.get_kind() == NodeType.comma:
+            parameters = parameters.get_children()
         else:
-            lambda_expr.identifiers.append(Id(node.get_children()[0].get_data()[12:-1]))
+            parameters = [parameters]
+        for parameter in parameters:
+            identifier = Id(parameter.get_value())
+            identifier.set_position(parameter.get_position())
+            lambda_expr.identifiers.append(identifier)
+        
+        # The body sees the parameters as the innermost scope
+        self.scopes.append([identifier.get_data() for identifier in lambda_expr.identifiers])
+        lambda_expr.set_delta(self.get_delta(node.get_children()[1]))
+        self.scopes.pop()
             
         return lambda_expr
 
+    def is_recursive_definition(self, node):
+        """
+        Check whether a tree node is Y* applied to lambda f. lambda ..., the
+        standardized form of a rec definition of a function
+        
+        Args:
+            node: A node from the standardized tree
+            
+        Returns:
+            bool: True if the node is a recursive function definition
+        """
+        if node.get_kind() != NodeType.gamma:
+            return False
+        rator, rand = node.get_children()
+        return (rator.get_kind() == NodeType.ystar
+                and rand.get_kind() == NodeType.lambda_expr
+                and rand.get_children()[0].get_kind() == NodeType.identifier
+                and rand.get_children()[1].get_kind() == NodeType.lambda_expr)
+
+    def name_bound_lambda(self, node):
+        """
+        Name the lambda a let or where binds to an identifier
+        
+        Both standardize to gamma(lambda x. body, value); if the value is a
+        lambda, it is named x.
+        
+        Args:
+            node: A gamma node from the standardized tree
+        """
+        rator, rand = node.get_children()
+        if (rator.get_kind() == NodeType.lambda_expr
+                and rator.get_children()[0].get_kind() == NodeType.identifier
+                and rand.get_kind() == NodeType.lambda_expr):
+            self.names[rand] = rator.get_children()[0].get_value()
+
+    def get_rec(self, node):
+        """
+        Create a Rec symbol from the lambda f. lambda ... passed to Y*
+        
+        Args:
+            node: The lambda node binding the recursive function's name
+            
+        Returns:
+            Rec: A Rec symbol holding the inner Lambda, whose body sees the
+            function's name one environment up
+        """
+        self.i += 1  # The outer lambda keeps its index, as in the general case
+        
+        name = node.get_children()[0].get_value()
+        self.names[node.get_children()[1]] = name
+        self.scopes.append([name])
+        lambda_expr = self.get_lambda(node.get_children()[1])
+        lambda_expr.set_recursive(True)
+        self.scopes.pop()
+        
+        rec = Rec(lambda_expr)
+        rec.set_position(node.get_position())
+        return rec
+
     def get_pre_order_traverse(self, node):
         """
         Traverse a tree node in pre-order and convert to CSE Machine symbols
@@ -104,14 +176,19 @@ class CSEMachineFactory:
         """
         symbols = []
         
-        if node.get_data() == "lambda":
+        kind = node.get_kind()
+        if kind == NodeType.lambda_expr:
             symbols.append(self.get_lambda(node))  # Lambda expression symbol
-        elif node.get_data() == "->":
+        elif self.is_recursive_definition(node):
+            symbols.append(self.get_rec(node.get_children()[1]))  # Recursive function symbol
+        elif kind == NodeType.conditional:
             symbols.append(self.get_delta(node.get_children()[1]))  # Then branch
             symbols.append(self.get_delta(node.get_children()[2]))  # Else branch
             symbols.append(Beta())  # Beta symbol for branching
             symbols.append(self.get_b(node.get_children()[0]))  # Condition
         else:
+            if kind == NodeType.gamma:
+                self.name_bound_lambda(node)
             symbols.append(self.get_symbol(node))
             for child in node.get_children():
                 symbols.extend(self.get_pre_order_traverse(child))
@@ -176,3 +253,39 @@ class CSEMachineFactory:
         stack = self.get_stack()
         environment = self.get_environment()
         return CSEMachine(control, stack, environment)
+
+
+def _unary_operator(node):
+    return Uop(node.get_value())
+
+def _binary_operator(node):
+    return Bop(node.get_value())
+
+def _gamma(node):
+    gamma = Gamma()
+    gamma.set_position(node.get_position())
+    return gamma
+
+# Builds the CSE Machine symbol for each kind of standardized tree node
+SYMBOL_BUILDERS = {
+    NodeType.op_not: _unary_operator,
+    NodeType.op_neg: _unary_operator,
+    NodeType.op_plus: _binary_operator,
+    NodeType.op_minus: _binary_operator,
+    NodeType.op_mul: _binary_operator,
+    NodeType.op_div: _binary_operator,
+    NodeType.op_pow: _binary_operator,
+    NodeType.op_and: _binary_operator,
+    NodeType.op_or: _binary_operator,
+    NodeType.op_compare: _binary_operator,
+    NodeType.aug: _binary_operator,
+    NodeType.gamma: _gamma,
+    NodeType.tau: lambda node: Tau(len(node.get_children())),
+    NodeType.ystar: lambda node: Ystar(),
+    NodeType.integer: lambda node: Int(int(node.get_value())),
+    NodeType.string: lambda node: Str(node.get_value()[1:-1]),  # Remove quotes
+    NodeType.nil: lambda node: Tup(),
+    NodeType.true_value: lambda node: Bool(True),
+    NodeType.false_value: lambda node: Bool(False),
+    NodeType.dummy: lambda node: Dummy(),
+}
@@ -0,0 +1,105 @@
+"""
+Memoization of recursive function applications for the CSE Machine.
+"""
+
+import sys
+from collections import OrderedDict
+
+from .symbols import Bool, Dummy, Int, Str, Tup
+
+# Number of results kept when no size is given
+DEFAULT_MEMO_SIZE = 100000
+
+def value_key(value):
+    """
+    Get a hashable key identifying an argument value
+
+    Args:
+        value (Symbol): The argument of an application
+
+    Returns:
+        tuple: A key equal for equal integers, truth values, strings, dummy
+        and tuples of those, or None if the value is of another kind (e.g.
+        a function)
+    """
+    kind = type(value)
+    if kind is Int or kind is Bool or kind is Str:
+        return (kind, value.data)
+    elif kind is Dummy:
+        return (kind,)
+    elif kind is Tup:
+        keys = []
+        for element in value.get_symbols():
+            key = value_key(element)
+            if key is None:
+                return None
+            keys.append(key)
+        return (kind, tuple(keys))
+    return None
+
+class MemoCache:
+    """
+    Least recently used cache of the results of applications of rec-bound
+    functions
+
+    Keys are the function's Lambda, the environment its closure was made in
+    and the key of the argument, so that one definition evaluated in
+    different environments is cached separately. Evaluating an application
+    has no side effects to skip, as Print is the identity and only the
+    program's value is printed, so any function may be cached.
+    """
+    def __init__(self, size=DEFAULT_MEMO_SIZE):
+        """
+        Initialize a new MemoCache instance
+
+        Args:
+            size (int): Largest number of results kept
+        """
+        self.size = size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, lambda_expr, environment, rand):
+        """
+        Args:
+            lambda_expr (Lambda): The applied function's Lambda
+            environment (E): The environment of the function's closure
+            rand (Symbol): The argument
+
+        Returns:
+            tuple: The cache key of the application, or None if it is not
+            cached as the argument has no key
+        """
+        key = value_key(rand)
+        if key is None:
+            return None
+        return (lambda_expr, environment, key)
+
+    def lookup(self, key):
+        """
+        Args:
+            key (tuple): A key from get_key
+
+        Returns:
+            Symbol: The cached result, or None; counts a hit or a miss
+        """
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def store(self, key, result):
+        """Cache a result, evicting the least recently used one if full"""
+        self.results[key] = result
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    def report(self, file=None):
+        """Print the hit and miss counters, on stderr unless given a file"""
+        file = file or sys.stderr
+        print(f"Memoization: {self.hits} hits, {self.misses} misses, "
+              f"{len(self.results)} cached results (size {self.size})", file=file)
@@ -0,0 +1,250 @@
+"""
+Built-in functions and operators of RPAL, shared by the execution engines.
+
+Values are the Rand symbols of symbols.py. Built-in functions take the value
+stack (top last) and pop their argument from it, so every engine applies them
+the same way.
+"""
+
+from .symbols import *
+
+def apply_unary_operation(op, rand):
+    """
+    Args:
+        op (str): Unary operator name, as held by a Uop symbol
+        rand (Rand): Operand
+
+    Returns:
+        Symbol: Result of the operation
+    """
+    operator = UNARY_OPERATORS.get(op)
+    if operator is None:
+        return Err()
+    return operator(rand)
+
+def apply_binary_operation(op, rand1, rand2):
+    """
+    Args:
+        op (str): Binary operator name, as held by a Bop symbol
+        rand1 (Rand): First operand
+        rand2 (Rand): Second operand
+
+    Returns:
+        Symbol: Result of the operation
+    """
+    operator = BINARY_OPERATORS.get(op)
+    if operator is None:
+        return Err()
+    return operator(rand1, rand2)
+
+def integer_operand(op, rand):
+    """
+    Args:
+        op (str): The operator being applied
+        rand (Rand): Operand that must be an integer
+
+    Returns:
+        int: The operand's value
+    """
+    if type(rand) is not Int:
+        raise TypeError(f"Operator '{op}' expects an integer, got '{rand.to_string()}'")
+    return rand.data
+
+def truth_value_operand(op, rand):
+    """
+    Args:
+        op (str): The operator being applied
+        rand (Rand): Operand that must be a truth value
+
+    Returns:
+        bool: The operand's value
+    """
+    if type(rand) is not Bool:
+        raise TypeError(f"Operator '{op}' expects a truth value, got '{rand.to_string()}'")
+    return rand.data
+
+def string_operand(name, rand):
+    """
+    Args:
+        name (str): The built-in function being applied
+        rand (Rand): Argument that must be a string
+
+    Returns:
+        Str: The argument
+    """
+    if type(rand) is not Str:
+        raise TypeError(f"Function '{name}' expects a string, got '{format_value(rand)}'")
+    return rand
+
+def tuple_operand(name, rand):
+    """
+    Args:
+        name (str): The built-in function being applied
+        rand (Rand): Argument that must be a tuple
+
+    Returns:
+        Tup: The argument
+    """
+    if type(rand) is not Tup:
+        raise TypeError(f"Function '{name}' expects a tuple, got '{format_value(rand)}'")
+    return rand
+
+def is_equal(rand1, rand2):
+    """
+    Compare two values for eq and ne
+
+    Values of the same kind compare their payloads; values of different
+    kinds compare the text they are printed as.
+    """
+    if type(rand1) is type(rand2):
+        if type(rand1) is Str and rand1.length != rand2.length:
+            # Strings of different lengths differ without flattening them
+            return False
+        return rand1.data == rand2.data
+    return rand1.to_string() == rand2.to_string()
+
+def format_value(symbol):
+    """
+    Get the string representation of a value as the interpreter prints it
+
+    Args:
+        symbol (Symbol): The value; tuples are printed with their elements
+
+    Returns:
+        str: String representation of the value
+    """
+    if not isinstance(symbol, Tup):
+        return symbol.to_string()
+    temp = "("
+    for element in symbol.get_symbols():
+        temp += format_value(element) + ", "
+    temp = temp[:-2] + ")" if symbol.length > 0 else temp + ")"
+    return temp
+
+def _divide(val1, val2):
+    """Integer division truncating towards zero, exact for any magnitude"""
+    quotient = abs(val1) // abs(val2)
+    return -quotient if (val1 < 0) != (val2 < 0) else quotient
+
+def _integer_operator(op, operation, result_type):
+    def apply(rand1, rand2):
+        if type(rand1) is Int and type(rand2) is Int:
+            return result_type(operation(rand1.data, rand2.data))
+        return result_type(operation(integer_operand(op, rand1), integer_operand(op, rand2)))
+    return apply
+
+def _truth_value_operator(op, operation):
+    def apply(rand1, rand2):
+        return Bool(operation(truth_value_operand(op, rand1), truth_value_operand(op, rand2)))
+    return apply
+
+def _augment(rand1, rand2):
+    if type(rand1) is not Tup:
+        raise TypeError(f"Operator 'aug' expects a tuple, got '{format_value(rand1)}'")
+    if isinstance(rand2, Tup):
+        return rand1.extend(rand2.get_symbols())
+    return rand1.extend([rand2])
+
+UNARY_OPERATORS = {
+    "neg": lambda rand: Int(-integer_operand("neg", rand)),
+    "not": lambda rand: Bool(not truth_value_operand("not", rand)),
+}
+
+BINARY_OPERATORS = {
+    "+": _integer_operator("+", lambda val1, val2: val1 + val2, Int),
+    "-": _integer_operator("-", lambda val1, val2: val1 - val2, Int),
+    "*": _integer_operator("*", lambda val1, val2: val1 * val2, Int),
+    "/": _integer_operator("/", _divide, Int),
+    "**": _integer_operator("**", lambda val1, val2: val1 ** val2, Int),
+    "ls": _integer_operator("ls", lambda val1, val2: val1 < val2, Bool),
+    "le": _integer_operator("le", lambda val1, val2: val1 <= val2, Bool),
+    "gr": _integer_operator("gr", lambda val1, val2: val1 > val2, Bool),
+    "ge": _integer_operator("ge", lambda val1, val2: val1 >= val2, Bool),
+    "&": _truth_value_operator("&", lambda val1, val2: val1 and val2),
+    "or": _truth_value_operator("or", lambda val1, val2: val1 or val2),
+    "eq": lambda rand1, rand2: Bool(is_equal(rand1, rand2)),
+    "ne": lambda rand1, rand2: Bool(not is_equal(rand1, rand2)),
+    "aug": _augment,
+}
+
+# Built-in functions, applied to the value stack by name
+
+def _print(stack):
+    # Print is the identity; the program's value is printed when it ends
+    value = stack.pop()
+    value.get_data()
+    stack.append(value)
+
+def _stem(stack):
+    # First character of a string, sharing its buffer
+    s = string_operand("Stem", stack.pop())
+    if s.length == 0:
+        raise IndexError("string index out of range")
+    if not s.is_flat():
+        s.flatten()
+    stack.append(Str.view(s, 0, 1))
+
+def _stern(stack):
+    # All but the first character of a string, sharing its buffer
+    s = string_operand("Stern", stack.pop())
+    if not s.is_flat():
+        s.flatten()
+    stack.append(Str.view(s, 1, max(s.length - 1, 0)))
+
+def _conc(stack):
+    # Concatenate two strings; Conc takes them one at a time
+    s1 = string_operand("Conc", stack.pop())
+    stack.append(Partial("Conc", s1, _conc_with))
+
+def _conc_with(s1, stack):
+    s2 = string_operand("Conc", stack.pop())
+    stack.append(Str.concat(s1, s2))
+
+def _order(stack):
+    # Length of a tuple
+    tup = tuple_operand("Order", stack.pop())
+    stack.append(Int(tup.length))
+
+def _null(stack):
+    # Whether a tuple is empty
+    tup = tuple_operand("Null", stack.pop())
+    stack.append(Bool(tup.length == 0))
+
+def _itos(stack):
+    # Integer to string
+    i = stack.pop()
+    stack.append(Str(i.to_string()))
+
+def _type_check(types):
+    def check(stack):
+        stack.append(Bool(isinstance(stack.pop(), types)))
+    return check
+
+def get_builtin(rator):
+    """
+    Args:
+        rator (Symbol): A value being applied that is not a lambda, tuple or Y*
+
+    Returns:
+        The function applying the value to the value stack, or None if it is
+        neither a built-in function nor a partial application of one
+    """
+    if type(rator) is Partial:
+        return rator.apply
+    return BUILTINS.get(rator.get_data())
+
+BUILTINS = {
+    "Print": _print,
+    "Stem": _stem,
+    "Stern": _stern,
+    "Conc": _conc,
+    "Order": _order,
+    "Isinteger": _type_check(Int),
+    "Null": _null,
+    "Itos": _itos,
+    "Isstring": _type_check(Str),
+    "Istuple": _type_check(Tup),
+    "Isdummy": _type_check(Dummy),
+    "Istruthvalue": _type_check(Bool),
+    "Isfunction": _type_check((Closure, Eta)),
+}
@@ -1,7 +1,15 @@
 
 
 class Symbol:
-    """Base class for all symbols in the CSE machine"""
+    """
+    Base class for all symbols in the CSE machine
+
+    The Lambda, Gamma and Id symbols of the control structures record the
+    (line, column) in the source of the construct they come from as
+    position; other symbols share the class default, None.
+    """
+    position = None
+
     def __init__(self, data):
         self.data = data
 
@@ -10,6 +18,16 @@ class Symbol:
 
     def get_data(self):
         return self.data
+
+    def set_position(self, position):
+        self.position = position
+
+    def get_position(self):
+        return self.position
+
+    def to_string(self):
+        """Return the text the symbol is printed as"""
+        return self.data
     
 class Rand(Symbol):
     """Base class for all rand (operand) symbols"""
@@ -36,10 +54,13 @@ class Beta(Symbol):
         super().__init__("beta")
         
 class Bool(Rand):
-    """Boolean value symbol"""
+    """Boolean value symbol, holding a Python bool"""
     def __init__(self, data):
         super().__init__(data)
 
+    def to_string(self):
+        return "true" if self.data else "false"
+
 class Bop(Rator):
     """Binary operator symbol"""
     def __init__(self, data):
@@ -58,19 +79,45 @@ class Delta(Symbol):
     def get_index(self):
         return self.index
 
+class Closure(Symbol):
+    """Function value: a Lambda and the environment it was evaluated in"""
+    def __init__(self, lambda_, environment):
+        super().__init__("lambda")
+        self.lambda_ = lambda_
+        self.environment = environment
+
+    def get_lambda(self):
+        return self.lambda_
+
+    def get_environment(self):
+        return self.environment
+
 class Dummy(Rand):
     """Dummy value symbol"""
     def __init__(self):
         super().__init__("dummy")
 
 class E(Symbol):
-    """Environment symbol"""
+    """
+    Environment symbol
+    
+    The values bound by a lambda application are kept in slots, in the order
+    of the lambda's identifiers; identifiers are resolved to a slot when the
+    control structures are built. parent is the environment of the applied
+    closure, previous the environment that was current when the frame was
+    entered and becomes current again when it exits. lambda_ is the Lambda
+    whose application made the frame, None for the primitive environment.
+    memo_key is the cache key its result is stored under when it exits, if
+    it is memoized.
+    """
     def __init__(self, i):
         super().__init__("e")
         self.index = i
         self.parent = None
-        self.is_removed = False
-        self.values = {}
+        self.previous = None
+        self.slots = []
+        self.lambda_ = None
+        self.memo_key = None
 
     def set_parent(self, e):
         self.parent = e
@@ -84,20 +131,29 @@ class E(Symbol):
     def get_index(self):
         return self.index
 
-    def set_is_removed(self, is_removed):
-        self.is_removed = is_removed
+    def set_previous(self, e):
+        self.previous = e
 
-    def get_is_removed(self):
-        return self.is_removed
+    def get_previous(self):
+        return self.previous
 
     def lookup(self, id):
-        for key in self.values:
-            if key.get_data() == id.get_data():
-                return self.values[key]
-        if self.parent is not None:
-            return self.parent.lookup(id)
-        else:
+        """
+        Look up an identifier by its (depth, slot) address
+        
+        Args:
+            id (Id): The identifier, resolved by CSEMachineFactory
+            
+        Returns:
+            Symbol: The bound value, or a Symbol naming the identifier if it is
+            not bound by any enclosing lambda (e.g. built-in functions)
+        """
+        if id.depth is None:
             return Symbol(id.get_data())
+        env = self
+        for _ in range(id.depth):
+            env = env.parent
+        return env.slots[id.slot]
 
 class Err(Symbol):
     """Error symbol"""
@@ -105,7 +161,7 @@ class Err(Symbol):
         super().__init__("")
 
 class Eta(Symbol):
-    """Eta symbol for recursion"""
+    """Eta symbol for recursion, wrapping the Closure passed to Y*"""
     def __init__(self):
         super().__init__("eta")
         self.index = None
@@ -140,47 +196,178 @@ class Gamma(Symbol):
         super().__init__("gamma")
 
 class Id(Rand):
-    """Identifier symbol"""
-    def __init__(self, data):
+    """
+    Identifier symbol
+    
+    depth is the number of environments to walk up from the current one to
+    reach the binding lambda's environment, and slot the position of the
+    value there. Both are None for identifiers no lambda binds.
+    """
+    def __init__(self, data, depth=None, slot=None):
         super().__init__(data)
+        self.depth = depth
+        self.slot = slot
     
     def get_data(self):
         return super().get_data()
 
 class Int(Rand):
-    """Integer value symbol"""
+    """Integer value symbol, holding a Python int"""
     def __init__(self, data):
         super().__init__(data)
 
+    def to_string(self):
+        return str(self.data)
+
 class Lambda(Symbol):
-    """Lambda symbol for function definitions"""
+    """
+    Lambda symbol for function definitions
+    
+    A Lambda is part of the control structures and is shared by every
+    evaluation of the lambda expression; the function values it evaluates to
+    are Closure objects. recursive is set for the Lambda of a function
+    defined with rec, and name to the identifier a lambda is bound to, if
+    any.
+    """
     def __init__(self, i):
         super().__init__("lambda")
         self.index = i
-        self.environment = None
         self.identifiers = []
         self.delta = None
-
-    def set_environment(self, n):
-        self.environment = n
-
-    def get_environment(self):
-        return self.environment
+        self.recursive = False
+        self.name = None
 
     def set_delta(self, delta):
         self.delta = delta
 
     def get_delta(self):
         return self.delta
+
+    def set_recursive(self, recursive):
+        self.recursive = recursive
+
+    def is_recursive(self):
+        return self.recursive
+
+    def set_name(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
         
     def get_index(self):
         return self.index
 
+class Rec(Symbol):
+    """
+    Rec symbol for a recursive function definition, Y* applied to
+    lambda f. lambda ...
+
+    It evaluates to a Closure of the inner Lambda in a new environment that
+    binds f to that Closure itself, so recursive calls are plain applications.
+    """
+    def __init__(self, lambda_):
+        super().__init__("rec")
+        self.lambda_ = lambda_
+
+    def get_lambda(self):
+        return self.lambda_
+
+class Partial(Symbol):
+    """
+    A built-in function of two arguments applied to its first argument
+
+    Applying it pops the second argument from the value stack and pushes the
+    result, as built-in functions do.
+    """
+    def __init__(self, name, rand, function):
+        super().__init__(name)
+        self.rand = rand
+        self.function = function
+
+    def apply(self, stack):
+        self.function(self.rand, stack)
+
 class Str(Rand):
-    """String value symbol"""
+    """
+    String value symbol
+
+    Strings are immutable. A Str is a view of length characters of a buffer
+    starting at offset, so taking the rest of a string shares its buffer
+    instead of copying it. A Str made by concatenation is a rope of its two
+    parts, flattened into a buffer the first time its text is needed.
+    """
     def __init__(self, data):
         super().__init__(data)
 
+    @property
+    def data(self):
+        """The text of the string, flattening it into its own buffer"""
+        if self.parts is not None:
+            self.flatten()
+        elif self.offset != 0 or self.length != len(self.buffer):
+            self.set_data(self.buffer[self.offset:self.offset + self.length])
+        return self.buffer
+
+    @data.setter
+    def data(self, data):
+        self.buffer = data
+        self.offset = 0
+        self.length = len(data)
+        self.parts = None
+
+    @staticmethod
+    def view(s, offset, length):
+        """
+        Args:
+            s (Str): A flat string
+            offset (int): Offset of the view in s
+            length (int): Number of characters in the view
+
+        Returns:
+            Str: The characters of s from offset, sharing its buffer
+        """
+        view = Str.__new__(Str)
+        view.buffer = s.buffer
+        view.offset = s.offset + offset
+        view.length = length
+        view.parts = None
+        return view
+
+    @staticmethod
+    def concat(s1, s2):
+        """
+        Returns:
+            Str: A rope of s1 followed by s2
+        """
+        rope = Str.__new__(Str)
+        rope.buffer = ""
+        rope.offset = 0
+        rope.length = s1.length + s2.length
+        rope.parts = (s1, s2)
+        return rope
+
+    def is_flat(self):
+        return self.parts is None
+
+    def flatten(self):
+        """
+        Join the leaves of the rope into one buffer
+
+        Ropes built by Conc in a recursion are as deep as the recursion, so
+        they are walked with an explicit stack.
+        """
+        pieces = []
+        pending = [self]
+        while pending:
+            s = pending.pop()
+            if s.parts is None:
+                pieces.append(s.buffer[s.offset:s.offset + s.length])
+            else:
+                pending.append(s.parts[1])
+                pending.append(s.parts[0])
+        self.set_data("".join(pieces))
+
 class Tau(Symbol):
     """Tau symbol for tuple creation"""
     def __init__(self, n):
@@ -194,10 +381,70 @@ class Tau(Symbol):
         return self.n
 
 class Tup(Rand):
-    """Tuple value symbol"""
-    def __init__(self):
+    """
+    Tuple value symbol
+
+    Tuples are immutable. A Tup is the first length elements of a list that
+    tuples extended from one another share: extending a tuple appends to
+    the list in place if no other tuple has appended past its end, and
+    copies its elements otherwise. Building a tuple with aug is then
+    amortized O(1) per element, and no tuple sees another's elements.
+    """
+    def __init__(self, symbols=None, length=None):
         super().__init__("tup")
-        self.symbols = []
+        self.symbols = [] if symbols is None else symbols
+        self.length = len(self.symbols) if length is None else length
+
+    def get(self, index):
+        """
+        Args:
+            index (int): Position of an element, counting from 1; 0 and
+                negative positions count from the end
+
+        Returns:
+            Symbol: The element at the position
+        """
+        position = index - 1
+        if position < 0:
+            position += self.length
+        if not 0 <= position < self.length:
+            raise IndexError("tuple index out of range")
+        return self.symbols[position]
+
+    def get_symbols(self):
+        """Get the elements of the tuple as a list"""
+        if self.length == len(self.symbols):
+            return self.symbols
+        return self.symbols[:self.length]
+
+    def unpack(self, n):
+        """
+        Args:
+            n (int): Number of elements, e.g. the parameters of a lambda
+
+        Returns:
+            list: The first n elements of the tuple
+        """
+        if n > self.length:
+            raise IndexError("tuple index out of range")
+        return self.symbols[:n]
+
+    def extend(self, elements):
+        """
+        Args:
+            elements (list): Values to add after the tuple's elements
+
+        Returns:
+            Tup: A new tuple of this tuple's elements followed by the values
+        """
+        # The values may be this tuple's own list, which extending grows
+        length = self.length + len(elements)
+        symbols = self.symbols
+        if self.length != len(symbols):
+            # Another tuple has appended past this one's end
+            symbols = symbols[:self.length]
+        symbols.extend(elements)
+        return Tup(symbols, length)
 
 class Uop(Rator):
     """Unary operator symbol"""
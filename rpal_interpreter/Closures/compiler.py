@@ -0,0 +1,363 @@
+"""
+Compiles standardized trees to nested Python closures for the ClosureMachine.
+"""
+
+from Parser.node_type import NodeType
+from CSEMachine.factory import SYMBOL_BUILDERS
+from CSEMachine.symbols import Closure, Err, Symbol, Tup
+from CSEMachine.primitives import UNARY_OPERATORS, BINARY_OPERATORS
+from .machine import Function
+
+UNARY_KINDS = frozenset([NodeType.op_neg, NodeType.op_not])
+
+BINARY_KINDS = frozenset([
+    NodeType.op_plus, NodeType.op_minus, NodeType.op_mul, NodeType.op_div,
+    NodeType.op_pow, NodeType.op_and, NodeType.op_or, NodeType.op_compare,
+    NodeType.aug,
+])
+
+LITERAL_KINDS = frozenset([
+    NodeType.integer, NodeType.string, NodeType.true_value, NodeType.false_value,
+    NodeType.nil, NodeType.dummy,
+])
+
+def resume_sequence(parts, finish, env, conts, values, i):
+    """
+    Evaluate parts[i:] in order, then finish; see ClosureCompiler.sequence
+
+    A staged part that asks for a call has a continuation taking its value
+    pushed first, which resumes the sequence with the next part.
+    """
+    while i < len(parts):
+        evaluate, direct = parts[i]
+        i += 1
+        if direct:
+            values.append(evaluate(env))
+            continue
+
+        def resume(value, i=i):
+            values.append(value)
+            return resume_sequence(parts, finish, env, conts, values, i)
+        conts.append(resume)
+        result = evaluate(env, conts)
+        if type(result) is tuple:
+            return result
+        conts.pop()
+        values.append(result)
+    return finish(env, values)
+
+def evaluate_then(evaluate, env, conts, resume):
+    """
+    Evaluate a staged evaluator and pass its value to resume, a function
+    returning a value or a call, directly or from the continuation stack
+    """
+    conts.append(resume)
+    result = evaluate(env, conts)
+    if type(result) is tuple:
+        return result
+    conts.pop()
+    return resume(result)
+
+def staged(evaluate, direct):
+    """Get a staged evaluator of the same value as an evaluator"""
+    if direct:
+        return lambda env, conts: evaluate(env)
+    return evaluate
+
+class ClosureCompiler:
+    """
+    Compiles a standardized tree to an evaluator
+
+    Every node becomes a Python function taking an environment and returning
+    the node's value, built once with its operator and operands bound, so
+    running the program dispatches on nothing. Children are evaluated right
+    to left, as in the CSE Machine. Environments are lists holding the parent
+    environment first and then the values bound to the lambda's parameters.
+
+    Nodes whose evaluation applies no function compile to direct evaluators,
+    taking only the environment. The others compile to staged evaluators,
+    which also take the machine's continuation stack and return either the
+    node's value or a (rator, rand) tuple: the machine applies rator to rand
+    and passes the result to the continuation on top of the stack, which a
+    node evaluating an application as part of its value pushes first. No
+    application nests a Python call, so neither deep recursion nor long
+    tail-recursive loops use the Python stack.
+    """
+    def __init__(self):
+        """Initialize a new ClosureCompiler instance"""
+        self.i = 1  # Lambda index counter
+        self.scopes = []  # Parameter names of each enclosing lambda, innermost last
+
+    def compile(self, ast):
+        """
+        Compile a standardized tree
+
+        Args:
+            ast: The standardized abstract syntax tree
+
+        Returns:
+            Staged evaluator of the program body
+        """
+        return staged(*self.compile_node(ast.get_root()))
+
+    def compile_node(self, node):
+        """
+        Compile a node to its evaluator
+
+        Args:
+            node: A node from the standardized tree
+
+        Returns:
+            tuple: The node's evaluator, and whether it is direct
+        """
+        kind = node.get_kind()
+        if kind == NodeType.lambda_expr:
+            return self.compile_lambda(node), True
+        elif kind == NodeType.conditional:
+            return self.compile_conditional(node)
+        elif kind == NodeType.identifier:
+            return self.compile_identifier(node.get_value()), True
+        elif kind == NodeType.gamma:
+            return self.compile_gamma(node), False
+        elif kind == NodeType.tau:
+            return self.compile_tau(node)
+        elif kind in UNARY_KINDS:
+            return self.compile_unary(node)
+        elif kind in BINARY_KINDS:
+            return self.compile_binary(node)
+
+        # Literals, which the CSE Machine pushes as they are
+        build = SYMBOL_BUILDERS.get(kind)
+        if build is None:
+            print("Error: Unknown node type:", node.get_data())
+            value = Err()
+        else:
+            value = build(node)
+        return lambda env: value, True
+
+    def sequence(self, parts, finish):
+        """
+        Args:
+            parts (list): Evaluators of a node's operands and whether each is
+                direct, in the order they are evaluated
+            finish: Function of the environment and the operands' values, in
+                the same order, returning the node's value or a call
+
+        Returns:
+            A staged evaluator of the node
+        """
+        def evaluate(env, conts):
+            return resume_sequence(parts, finish, env, conts, [], 0)
+        return evaluate
+
+    def compile_lambda(self, node):
+        """
+        Args:
+            node: A lambda node from the standardized tree
+
+        Returns:
+            An evaluator creating a closure over the current environment
+        """
+        parameters = node.get_children()[0]
+        if parameters.get_kind() == NodeType.comma:
+            identifiers = [identifier.get_value() for identifier in parameters.get_children()]
+        else:
+            identifiers = [parameters.get_value()]
+
+        function = Function(self.i, identifiers)
+        self.i += 1
+
+        # The body sees the parameters as the innermost scope
+        self.scopes.append(identifiers)
+        function.body, function.direct = self.compile_node(node.get_children()[1])
+        self.scopes.pop()
+
+        return lambda env: Closure(function, env)
+
+    def compile_conditional(self, node):
+        """
+        Args:
+            node: A conditional node from the standardized tree
+
+        Returns:
+            tuple: An evaluator of the branch selected by the condition, and
+            whether it is direct
+        """
+        condition, then_branch, else_branch = node.get_children()
+        condition, condition_direct = self.compile_node(condition)
+        then_branch, then_direct = self.compile_node(then_branch)
+        else_branch, else_direct = self.compile_node(else_branch)
+
+        if condition_direct and then_direct and else_direct:
+            def evaluate(env):
+                if condition(env).data is True:
+                    return then_branch(env)
+                return else_branch(env)
+            return evaluate, True
+
+        then_branch = staged(then_branch, then_direct)
+        else_branch = staged(else_branch, else_direct)
+
+        def choose(env, conts, value):
+            if value.data is True:
+                return then_branch(env, conts)
+            return else_branch(env, conts)
+
+        if condition_direct:
+            def evaluate(env, conts):
+                return choose(env, conts, condition(env))
+            return evaluate, False
+
+        def evaluate(env, conts):
+            return evaluate_then(condition, env, conts, lambda value: choose(env, conts, value))
+        return evaluate, False
+
+    def compile_identifier(self, name):
+        """
+        Args:
+            name (str): The identifier's name
+
+        Returns:
+            An evaluator reading the value bound to the identifier, or naming
+            it if no enclosing lambda binds it (e.g. built-in functions)
+        """
+        for depth in range(len(self.scopes)):
+            names = self.scopes[-1 - depth]
+            if name in names:
+                slot = names.index(name) + 1
+                if depth == 0:
+                    return lambda env: env[slot]
+                if depth == 1:
+                    return lambda env: env[0][slot]
+
+                def lookup(env):
+                    for _ in range(depth):
+                        env = env[0]
+                    return env[slot]
+                return lookup
+        return lambda env: Symbol(name)
+
+    def compile_gamma(self, node):
+        """
+        Args:
+            node: A gamma node from the standardized tree
+
+        Returns:
+            A staged evaluator returning the call the application makes
+        """
+        rator, rand = node.get_children()
+        rator, rator_direct = self.compile_node(rator)
+        rand, rand_direct = self.compile_node(rand)
+
+        if rator_direct and rand_direct:
+            def evaluate(env, conts):
+                argument = rand(env)
+                return (rator(env), argument)
+            return evaluate
+        if rand_direct:
+            # A curried application, as in f x y
+            def evaluate(env, conts):
+                argument = rand(env)
+                return evaluate_then(rator, env, conts, lambda function: (function, argument))
+            return evaluate
+        return self.sequence([(rand, rand_direct), (rator, rator_direct)],
+                             lambda env, values: (values[1], values[0]))
+
+    def compile_tau(self, node):
+        """
+        Args:
+            node: A tau node from the standardized tree
+
+        Returns:
+            tuple: An evaluator building the tuple of the node's children,
+            and whether it is direct
+        """
+        parts = [self.compile_node(child) for child in reversed(node.get_children())]
+
+        def build(env, symbols):
+            symbols.reverse()
+            return Tup(symbols)
+
+        if all(direct for _, direct in parts):
+            elements = [element for element, _ in parts]
+
+            def evaluate(env):
+                return build(env, [element(env) for element in elements])
+            return evaluate, True
+        return self.sequence(parts, build), False
+
+    def compile_unary(self, node):
+        """
+        Args:
+            node: A unary operator node from the standardized tree
+
+        Returns:
+            tuple: An evaluator of the operation, and whether it is direct
+        """
+        operator = UNARY_OPERATORS.get(node.get_value())
+        if operator is None:
+            operator = lambda rand: Err()
+        rand, direct = self.compile_node(node.get_children()[0])
+        if direct:
+            return lambda env: operator(rand(env)), True
+
+        def evaluate(env, conts):
+            return evaluate_then(rand, env, conts, operator)
+        return evaluate, False
+
+    def compile_binary(self, node):
+        """
+        Args:
+            node: A binary operator node from the standardized tree
+
+        Returns:
+            tuple: An evaluator of the operation, specialized for a parameter
+            as first operand and a literal as second, as in n - 1, and
+            whether it is direct
+        """
+        operator = BINARY_OPERATORS.get(node.get_value())
+        if operator is None:
+            operator = lambda rand1, rand2: Err()
+        first, second = node.get_children()
+        rand1, direct1 = self.compile_node(first)
+        rand2, direct2 = self.compile_node(second)
+
+        if direct1 and not direct2:
+            # As in n + f (n - 1)
+            def evaluate(env, conts):
+                return evaluate_then(rand2, env, conts, lambda value: operator(rand1(env), value))
+            return evaluate, False
+        if direct2 and not direct1:
+            def evaluate(env, conts):
+                value = rand2(env)
+                return evaluate_then(rand1, env, conts, lambda value1: operator(value1, value))
+            return evaluate, False
+        if not direct1 and not direct2:
+            return self.sequence([(rand2, direct2), (rand1, direct1)],
+                                 lambda env, values: operator(values[1], values[0])), False
+
+        slot = self.get_local_slot(first)
+        if slot is not None and second.get_kind() in LITERAL_KINDS:
+            value = rand2(None)
+            return lambda env: operator(env[slot], value), True
+
+        def evaluate(env):
+            value = rand2(env)
+            return operator(rand1(env), value)
+        return evaluate, True
+
+    def get_local_slot(self, node):
+        """
+        Args:
+            node: A node from the standardized tree
+
+        Returns:
+            int: The environment slot of a parameter of the innermost lambda,
+            or None if the node is not one
+        """
+        if node.get_kind() != NodeType.identifier or not self.scopes:
+            return None
+        names = self.scopes[-1]
+        if node.get_value() in names:
+            return names.index(node.get_value()) + 1
+        return None
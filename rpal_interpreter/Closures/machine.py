@@ -0,0 +1,148 @@
+"""
+Runs programs compiled by the ClosureCompiler.
+"""
+
+from CSEMachine.symbols import Closure, Eta, Tup, Ystar
+from CSEMachine.primitives import format_value, get_builtin
+
+class Function:
+    """
+    A compiled lambda
+
+    Attributes:
+        index (int): The lambda's number
+        identifiers (list): Names of the lambda's parameters
+        body: Evaluator of the lambda's body
+        direct (bool): Whether the body is a direct evaluator, taking only
+            the environment; see ClosureCompiler
+    """
+    def __init__(self, index, identifiers):
+        self.index = index
+        self.identifiers = identifiers
+        self.body = None
+        self.direct = True
+
+    def get_index(self):
+        return self.index
+
+def apply(rator, rand, conts):
+    """
+    Apply a function value to an argument
+
+    Applying a closure evaluates its body, which may itself end in a call:
+    such calls are made by the loop here in place of returning, so tail
+    calls take no stack.
+
+    Args:
+        rator (Symbol): The function: a closure, tuple, Y*, eta or built-in
+        rand (Symbol): The argument
+        conts (list): The machine's continuation stack
+
+    Returns:
+        Symbol: Result of the application, or a (rator, rand) tuple for a
+        call whose result is the result of the application, or is passed to
+        the continuation the body pushed
+    """
+    while True:
+        kind = type(rator)
+        if kind is Closure:
+            function = rator.lambda_
+            n = len(function.identifiers)
+            if n == 1:
+                # Single parameter
+                env = [rator.environment, rand]
+            else:
+                # Multiple parameters as tuple
+                env = [rator.environment]
+                env += rand.unpack(n)
+            if function.direct:
+                return function.body(env)
+            return function.body(env, conts)
+
+        elif kind is Eta:
+            # Apply the wrapped closure to the eta itself, then its result
+            # to the argument
+            wrapped = rator.lambda_
+            function = wrapped.lambda_
+            if function.direct and len(function.identifiers) == 1:
+                rator = function.body([wrapped.environment, rator])
+                continue
+            conts.append(lambda value, rand=rand: (value, rand))
+            rator, rand = wrapped, rator
+
+        elif kind is Tup:
+            # Tuple indexing
+            return rator.get(rand.get_data())
+
+        elif kind is Ystar:
+            # Wrap the closure passed to Y* for recursion
+            function = rand.get_lambda()
+            eta = Eta()
+            eta.set_index(function.get_index())
+            eta.set_environment(rand.get_environment())
+            eta.set_identifier(function.identifiers[0])
+            eta.set_lambda(rand)
+            return eta
+
+        else:
+            # Built-in functions, named by unbound identifiers, and their
+            # partial applications; applying any
+            # other value leaves the argument as the result
+            stack = [rand]
+            builtin = get_builtin(rator)
+            if builtin is not None:
+                builtin(stack)
+            return stack[-1]
+
+def run(evaluate, env):
+    """
+    Run a staged evaluator to its value
+
+    Calls the evaluator asks for are applied here, and their results passed
+    to the continuations on top of an explicit stack, so calls, tail or not,
+    never nest Python calls and recursion is limited only by memory.
+
+    Args:
+        evaluate: A staged evaluator; see ClosureCompiler
+        env (list): The environment to evaluate it in
+
+    Returns:
+        Symbol: The evaluator's value
+    """
+    conts = []
+    result = evaluate(env, conts)
+    while True:
+        if type(result) is tuple:
+            result = apply(result[0], result[1], conts)
+        elif conts:
+            result = conts.pop()(result)
+        else:
+            return result
+
+class ClosureMachine:
+    """
+    Runs a program compiled to nested Python closures
+    """
+    def __init__(self, program):
+        """
+        Initialize a new ClosureMachine instance
+
+        Args:
+            program: Staged evaluator of the program body
+        """
+        self.program = program
+        self.result = None
+
+    def execute(self):
+        """Evaluate the program"""
+        self.result = run(self.program, [None])
+
+    def get_answer(self):
+        """
+        Execute the program and get the final result
+
+        Returns:
+            str: String representation of the final result
+        """
+        self.execute()
+        return format_value(self.result)
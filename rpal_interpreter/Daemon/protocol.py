@@ -0,0 +1,83 @@
+"""
+Messages between the interpreter daemon and its clients.
+
+A client connects to the daemon's Unix domain socket, sends one request and
+reads one response. Each message is a JSON object preceded by its length in
+bytes as a 4-byte big-endian integer.
+
+A request holds the source text ("source"), the path it was read from
+("name", used in messages), the interpreter options as given on the command
+line ("argv") and optionally a time limit in seconds ("time_limit"). A
+response holds the exit status ("status") and what the run printed
+("stdout", "stderr").
+
+It imports none of the interpreter and few standard modules, so that
+clients start quickly.
+"""
+
+import json
+import os
+import struct
+
+# Length prefix of each message
+HEADER = struct.Struct(">I")
+
+# Largest message accepted, in bytes
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+def get_default_socket_path():
+    """
+    Returns:
+        str: $RPAL_SOCKET, or a socket in $TMPDIR (default: /tmp) named
+        after the user
+    """
+    path = os.environ.get("RPAL_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(directory, f"rpal_daemon_{os.getuid()}.sock")
+
+def receive_exactly(sock, size):
+    """
+    Read a number of bytes from a socket
+
+    Raises:
+        ConnectionError: If the connection closes first
+    """
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed in the middle of a message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def send_message(sock, message):
+    """
+    Args:
+        sock (socket.socket): A connected socket
+        message (dict): The message, of JSON values
+    """
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+def receive_message(sock):
+    """
+    Args:
+        sock (socket.socket): A connected socket
+
+    Returns:
+        dict: The message
+
+    Raises:
+        ConnectionError: If the connection closes before a whole message
+        ValueError: If the message is too large or not a JSON object
+    """
+    size, = HEADER.unpack(receive_exactly(sock, HEADER.size))
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"message of {size} bytes is larger than {MAX_MESSAGE_SIZE}")
+    message = json.loads(receive_exactly(sock, size).decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("message is not a JSON object")
+    return message
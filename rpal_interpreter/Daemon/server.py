@@ -0,0 +1,228 @@
+"""
+The interpreter daemon: a server on a Unix domain socket running RPAL
+programs for clients in a pool of warm worker processes.
+
+Workers are forked from a fork server that has imported the interpreter
+once, so they start warm and no request pays for startup and imports. Each
+connection is served by a thread, which hands its request to an idle worker
+and waits for the response. A run that takes longer than its time limit has
+its worker killed and replaced, which stops any engine whatever it is doing.
+"""
+
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import threading
+
+from Daemon.protocol import receive_message, send_message
+from Daemon.worker import DEFAULT_CACHE_SIZE, serve
+
+# Seconds a run may take when no limit is given
+DEFAULT_TIME_LIMIT = 10.0
+
+class Worker:
+    """A worker process and the connection requests are sent on"""
+    def __init__(self, context, cache_size, max_steps):
+        """
+        Start a new worker process
+
+        Args:
+            context: The multiprocessing context to start it with
+            cache_size (int): Number of compiled programs it keeps
+            max_steps (int): Most steps a cse run may take, or None
+        """
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=serve, args=(child_connection, cache_size, max_steps),
+                                       daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def run(self, request, timeout):
+        """
+        Args:
+            request (dict): The request, as described in Daemon.protocol
+            timeout (float): Seconds to wait for the response, or None
+
+        Returns:
+            dict: The response, or None if the time ran out
+
+        Raises:
+            EOFError: If the worker died
+        """
+        self.connection.send(request)
+        if timeout is not None and not self.connection.poll(timeout):
+            return None
+        return self.connection.recv()
+
+    def stop(self):
+        """Kill the worker process"""
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+class WorkerPool:
+    """
+    A fixed number of worker processes, each running one request at a time
+    """
+    def __init__(self, size, cache_size=DEFAULT_CACHE_SIZE, max_steps=None):
+        """
+        Initialize a new WorkerPool instance, starting its workers
+
+        Args:
+            size (int): Number of workers
+            cache_size (int): Number of compiled programs each worker keeps
+            max_steps (int): Most steps a cse run may take, or None
+        """
+        # A fork server forks each worker from a clean process, so workers
+        # started in place of killed ones inherit nothing from the server's
+        # threads and connections
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload(["Daemon.worker"])
+        else:
+            self.context = multiprocessing.get_context()
+        self.cache_size = cache_size
+        self.max_steps = max_steps
+        self.workers = [self.new_worker() for _ in range(size)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+        self.lock = threading.Lock()
+
+    def new_worker(self):
+        return Worker(self.context, self.cache_size, self.max_steps)
+
+    def replace(self, worker):
+        """Kill a worker and start another in its place"""
+        worker.stop()
+        replacement = self.new_worker()
+        with self.lock:
+            self.workers[self.workers.index(worker)] = replacement
+        return replacement
+
+    def run(self, request, time_limit=None):
+        """
+        Run a request on the next idle worker, waiting for one if all are busy
+
+        Args:
+            request (dict): The request, as described in Daemon.protocol
+            time_limit (float): Seconds the run may take, or None
+
+        Returns:
+            dict: The response, as described in Daemon.protocol
+        """
+        worker = self.idle.get()
+        try:
+            response = worker.run(request, time_limit)
+            if response is None:
+                worker = self.replace(worker)
+                response = {"status": 1, "stdout": f"Error: Time limit of {time_limit:g} s exceeded\n",
+                            "stderr": ""}
+        except (EOFError, OSError):
+            # The worker died, e.g. from running out of memory
+            worker = self.replace(worker)
+            response = {"status": 1, "stdout": "Error: Worker process failed\n", "stderr": ""}
+        finally:
+            self.idle.put(worker)
+        return response
+
+    def close(self):
+        """Stop every worker"""
+        with self.lock:
+            for worker in self.workers:
+                worker.stop()
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection: one request and its response"""
+    def handle(self):
+        try:
+            request = receive_message(self.request)
+        except (ConnectionError, ValueError):
+            return
+        try:
+            response = self.server.run(request)
+        except (KeyError, TypeError, ValueError) as e:
+            response = {"status": 2, "stdout": "", "stderr": f"error: invalid request: {e}\n"}
+        send_message(self.request, response)
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Listens on a Unix domain socket and runs each request in a WorkerPool
+    """
+    daemon_threads = True
+
+    def __init__(self, path, pool, time_limit=DEFAULT_TIME_LIMIT):
+        """
+        Initialize a new DaemonServer instance, listening on a socket
+
+        Args:
+            path (str): Path of the socket; a stale socket file is replaced
+            pool (WorkerPool): The workers to run requests in
+            time_limit (float): Most seconds a run may take, or None; a
+                request may ask for less
+        """
+        self.path = path
+        self.pool = pool
+        self.time_limit = time_limit
+        if os.path.exists(path):
+            remove_stale_socket(path)
+        super().__init__(path, RequestHandler)
+        os.chmod(path, 0o600)
+
+    def run(self, request):
+        """
+        Run a request within its time limit
+
+        Args:
+            request (dict): The request, as described in Daemon.protocol
+
+        Returns:
+            dict: The response, as described in Daemon.protocol
+
+        Raises:
+            KeyError, TypeError, ValueError: If the request is malformed
+        """
+        job = {
+            "name": str(request["name"]),
+            "source": request["source"],
+            "argv": [str(argument) for argument in request.get("argv", [])],
+        }
+        if not isinstance(job["source"], str):
+            raise TypeError("source must be a string")
+        time_limit = request.get("time_limit")
+        if time_limit is not None:
+            time_limit = float(time_limit)
+            if time_limit <= 0:
+                raise ValueError("time_limit must be positive")
+            if self.time_limit is not None:
+                time_limit = min(time_limit, self.time_limit)
+        else:
+            time_limit = self.time_limit
+        return self.pool.run(job, time_limit)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def remove_stale_socket(path):
+    """
+    Remove the socket file of a daemon that is no longer running
+
+    Raises:
+        OSError: If a daemon is still listening on the socket, or the path
+            is not a socket
+    """
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    except OSError:
+        raise OSError(f"{path} exists and is not a socket")
+    finally:
+        probe.close()
+    raise OSError(f"A daemon is already listening on {path}")
@@ -0,0 +1,200 @@
+"""
+Worker processes of the interpreter daemon.
+
+A worker runs requests one at a time, as the command line would run them,
+and keeps the programs it compiled in an in-memory cache keyed by a hash of
+their source and the engine, so running an unchanged program again only
+builds a fresh machine around the compiled program and executes it.
+
+Requests for every engine share the workers, as no engine changes state of
+the process that outlives a run, such as the recursion limit.
+"""
+
+import hashlib
+import io
+import signal
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+
+from Lexer.token_analyzer import tokenize
+from CSEMachine.factory import CSEMachineFactory
+from CSEMachine.csemachine import CSEMachine
+from CSEMachine.memo import MemoCache
+from CSEMachine.symbols import E
+from Bytecode.compiler import BytecodeCompiler
+from Bytecode.machine import BytecodeMachine
+from Closures.compiler import ClosureCompiler
+from Closures.machine import ClosureMachine
+from Transpiler.compiler import PythonTranspiler
+from Transpiler.machine import PythonMachine
+from myrpal import ast_label, parse_args, parse_program
+
+# Number of compiled programs each worker keeps when no size is given
+DEFAULT_CACHE_SIZE = 256
+
+# Program name shown in usage messages sent to clients
+CLIENT_NAME = "rpal_client.py"
+
+# Interpreter options whose reports the daemon does not return
+UNSUPPORTED_OPTIONS = ("profile_phases", "profile", "profile_collapsed")
+
+def new_cse_machine(delta):
+    """Build a CSE Machine running a program's compiled body."""
+    e0 = E(0)
+    return CSEMachine([e0, delta], [e0], [e0])
+
+# Compiles a standardized tree, for each engine, to a program that can be run
+# any number of times
+COMPILERS = {
+    'cse': lambda std_tree: CSEMachineFactory().get_control(std_tree)[1],
+    'bytecode': lambda std_tree: BytecodeCompiler().compile(std_tree),
+    'closure': lambda std_tree: ClosureCompiler().compile(std_tree),
+    'python': lambda std_tree: PythonTranspiler().compile(std_tree),
+}
+
+# Builds a machine with a get_answer method from a compiled program
+MACHINES = {
+    'cse': new_cse_machine,
+    'bytecode': BytecodeMachine,
+    'closure': ClosureMachine,
+    'python': PythonMachine,
+}
+
+class ProgramCache:
+    """
+    Least recently used cache of compiled programs, keyed by the SHA-256 of
+    their source and the engine they were compiled for
+    """
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        """
+        Initialize a new ProgramCache instance
+
+        Args:
+            size (int): Largest number of programs kept
+        """
+        self.size = size
+        self.programs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, source, engine):
+        return (hashlib.sha256(source.encode("utf-8")).hexdigest(), engine)
+
+    def get_program(self, source, engine):
+        """
+        Args:
+            source (str): RPAL source
+            engine (str): Name of the engine to run it with
+
+        Returns:
+            The program compiled from the source, from the cache if it is
+            there
+
+        Raises:
+            Exception: If the source does not parse
+        """
+        key = self.get_key(source, engine)
+        program = self.programs.get(key)
+        if program is not None:
+            self.programs.move_to_end(key)
+            self.hits += 1
+            return program
+        self.misses += 1
+        std_tree = parse_program(tokenize(source))
+        std_tree.standardize()
+        program = COMPILERS[engine](std_tree)
+        self.programs[key] = program
+        if len(self.programs) > self.size:
+            self.programs.popitem(last=False)
+        return program
+
+def interpret(args, source, cache):
+    """
+    Interpret an RPAL program, printing what the command line prints
+
+    Args:
+        args (argparse.Namespace): The options of the run, from parse_args
+        source (str): RPAL source
+        cache (ProgramCache): The worker's compiled programs
+
+    Returns:
+        int: The exit status, 0 on success or 1 if the program failed
+    """
+    try:
+        if args.ast or args.st:
+            std_tree = parse_program(tokenize(source))
+            if args.ast:
+                print("Abstract Syntax Tree:")
+                std_tree.print_tree(ast_label)
+            else:
+                std_tree.standardize()
+                print("Standardized Tree:")
+                std_tree.print_tree()
+            return 0
+
+        machine = MACHINES[args.engine](cache.get_program(source, args.engine))
+        if args.memoize is not None:
+            machine.set_memo(MemoCache(args.memoize))
+        if args.max_steps is not None:
+            machine.set_max_steps(args.max_steps)
+        print("Output of the above program is:")
+        print(machine.get_answer())
+        if args.memoize is not None:
+            machine.get_memo().report()
+        return 0
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+def handle_request(request, cache, max_steps=None):
+    """
+    Run a request from a client
+
+    Args:
+        request (dict): The request, as described in Daemon.protocol
+        cache (ProgramCache): The worker's compiled programs
+        max_steps (int): Most steps a cse run may take, or None for no limit;
+            a request may ask for fewer with --max-steps
+
+    Returns:
+        dict: The response, as described in Daemon.protocol
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            args = parse_args([request["name"]] + list(request["argv"]), prog=CLIENT_NAME)
+            unsupported = [name for name in UNSUPPORTED_OPTIONS if getattr(args, name) is not None]
+            if unsupported:
+                option = "--" + unsupported[0].replace("_", "-")
+                print(f"error: {option} is not supported by the daemon", file=stderr)
+                status = 2
+            else:
+                if max_steps is not None and args.engine == 'cse':
+                    if args.max_steps is None or args.max_steps > max_steps:
+                        args.max_steps = max_steps
+                status = interpret(args, request["source"], cache)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+    return {"status": status, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+def serve(connection, cache_size=DEFAULT_CACHE_SIZE, max_steps=None):
+    """
+    Run requests received on a connection until it closes; the target of
+    each worker process
+
+    Args:
+        connection (multiprocessing.connection.Connection): Receives
+            requests and sends back their responses
+        cache_size (int): Number of compiled programs to keep
+        max_steps (int): Most steps a cse run may take, or None for no limit
+    """
+    # Interrupting the daemon stops the workers through the pool instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cache = ProgramCache(cache_size)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        connection.send(handle_request(request, cache, max_steps))
@@ -3,6 +3,7 @@ Token Analyzer Module for RPAL Interpreter
 This module handles the lexical analysis (tokenization) of RPAL source code.
 """
 
+import codecs
 import re
 from enum import Enum, auto
 
@@ -25,9 +26,10 @@ class Token:
         value (str): The string value of the token
         line (int): The line number where the token appears
         column (int): The column number where the token starts
+        offset (int): The offset of the token's first character in the source
     """
     
-    def __init__(self, category, value, line=0, column=0):
+    def __init__(self, category, value, line=0, column=0, offset=0):
         """
         Initialize a new Token instance.
         
@@ -36,11 +38,14 @@ class Token:
             value (str): The string value of the token
             line (int, optional): The line number where the token appears
             column (int, optional): The column number where the token starts
+            offset (int, optional): The offset of the token's first character
+                in the source
         """
         self.category = category
         self.value = value
         self.line = line
         self.column = column
+        self.offset = offset
     
     def __str__(self):
         """Return a string representation of the token."""
@@ -57,141 +62,174 @@ class Token:
     def get_position(self):
         """Get the position (line, column) of the token."""
         return (self.line, self.column)
+    
+    def get_span(self):
+        """Get the offsets (start, end) of the token's first character and just past its last."""
+        return (self.offset, self.offset + len(self.value))
+
+KEYWORDS = frozenset([
+    "let", "in", "fn", "where", "aug", "or", "not", "gr", "ge", "ls", "le", "eq", "ne",
+    "true", "false", "nil", "dummy", "within", "and", "rec",
+])
+
+# A single master pattern, tried at each position with pattern.match(source, pos).
+# The alternatives are ordered exactly like the checks of the original hand-written
+# scanner: whitespace, comments, strings, words, numbers, operators, punctuation.
+# A string ends at the first quote that is not preceded by a backslash.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<SPACE>\s+)
+  | (?P<COMMENT>//[^\n]*\n?)
+  | (?P<TEXT>'(?:[^']|(?<=\\)')*(?<!\\)')
+  | (?P<WORD>[a-zA-Z][a-zA-Z0-9_]*)
+  | (?P<NUMBER>[0-9]\d*)
+  | (?P<OPERATOR>->|>=|<=|==|!=|[-+*/<>&.@:~|$\#!%^_\[\]{}"\\?=])
+  | (?P<PUNCTUATION>[();,])
+""", re.VERBOSE)
+
+# Number of characters (or bytes, for binary sources) read per chunk when
+# tokenizing from a file object or memory map.
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 def tokenize(source_code):
     """
     Convert RPAL source code into a list of tokens.
     
+    The source is scanned left to right with a single precompiled pattern
+    matched at the current offset, so the remaining input is never copied
+    and tokenizing runs in time linear in the size of the source.
+    
     Args:
         source_code (str): The RPAL source code to tokenize
         
     Returns:
         list: A list of Token objects
     """
-    tokens = []
-    line_num = 1
-    position = 0
-    
-    # Process the entire source code as a single string
-    while position < len(source_code):
-        # Track line numbers
-        if position < len(source_code) and source_code[position] == '\n':
-            line_num += 1
-            position += 1
-            continue
+    return list(_scan_chunks(iter((source_code,))))
+
+def iter_tokens(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lazily tokenize RPAL source code.
+    
+    Tokens are produced one at a time, so only the current chunk of input and
+    the token being scanned are held in memory. Tokens, comments and strings
+    that span chunk boundaries are handled by reading ahead until the match
+    can no longer be extended.
+    
+    Args:
+        source: A string, a text or binary file object, or an mmap
+        chunk_size (int, optional): How much to read from the source at a time
         
-        # Skip whitespace
-        match = re.match(r'\s+', source_code[position:])
-        if match:
-            if '\n' in match.group():
-                line_num += match.group().count('\n')
-            position += match.end()
-            continue
-            
-        # Check for comments
-        if source_code[position:].startswith('//'):
-            # Find the end of the line
-            end_of_line = source_code.find('\n', position)
-            if end_of_line == -1:  # No newline found
-                position = len(source_code)  # Move to the end of the source
-            else:
-                position = end_of_line + 1
-                line_num += 1
+    Yields:
+        Token: The tokens of the program, ending with an EOF token
+    """
+    if isinstance(source, str):
+        return _scan_chunks(iter((source,)))
+    return _scan_chunks(_read_chunks(source, chunk_size))
+
+def _read_chunks(source, chunk_size):
+    """
+    Read a file object or mmap in chunks, decoding bytes as UTF-8.
+    
+    Args:
+        source: An object with a read(size) method
+        chunk_size (int): How much to read at a time
+        
+    Yields:
+        str: Successive pieces of the source text
+    """
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            yield chunk
             continue
-            
-        # Try to match a token
-        token = None
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+        yield decoder.decode(chunk)
+    if decoder is not None:
+        yield decoder.decode(b'', final=True)
+
+def _scan_chunks(chunks):
+    """
+    Tokenize source text arriving as a sequence of string chunks.
+    
+    Args:
+        chunks (iterator): Pieces of the source text, in order
         
-        # Check for text (strings) - must be checked before operators
-        if position < len(source_code) and source_code[position] == "'":
-            # Find the closing quote
-            start_pos = position
-            position += 1  # Skip the opening quote
-            
-            # Continue until we find a closing quote that's not escaped
-            while position < len(source_code) and (source_code[position] != "'" or source_code[position-1] == '\\'):
-                if source_code[position] == '\n':
-                    line_num += 1
-                position += 1
-            
-            if position < len(source_code) and source_code[position] == "'":
-                # Include the closing quote
-                position += 1
-                token = Token(TokenCategory.TEXT, source_code[start_pos:position], line_num, start_pos + 1)
-            else:
-                raise ValueError(f"Unclosed string starting at line {line_num}, column {start_pos + 1}")
+    Yields:
+        Token: The tokens of the program, ending with an EOF token
+    """
+    match = TOKEN_PATTERN.match
+    buffer = ''
+    base = 0  # Offset of buffer[0] in the whole source
+    position = 0  # Offset of the scanner within the buffer
+    line_num = 1
+    line_start = 0  # Offset of the first character of the current line
+    exhausted = False
+    
+    while True:
+        length = len(buffer)
+        if position < length:
+            m = match(buffer, position)
+            end = length if m is None else m.end()
+        else:
+            m = None
+            end = length
         
-        # Check for keywords
-        elif re.match(r'[a-zA-Z]', source_code[position:position+1]):
-            word_match = re.match(r'[a-zA-Z][a-zA-Z0-9_]*', source_code[position:])
-            word = word_match.group()
-            
-            if word in ["let", "in", "fn", "where", "aug", "or", "not", "gr", "ge", "ls", "le", "eq", "ne", 
-                       "true", "false", "nil", "dummy", "within", "and", "rec"]:
-                token = Token(TokenCategory.KEYWORD, word, line_num, position + 1)
+        # A match that runs into the end of the buffer (or no match at all)
+        # may change once more input is available, so read ahead first.
+        if end == length and not exhausted:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
             else:
-                token = Token(TokenCategory.IDENTIFIER, word, line_num, position + 1)
-            
-            position += len(word)
+                base += position
+                buffer = buffer[position:] + chunk
+                position = 0
+            continue
         
-        # Check for numbers
-        elif re.match(r'[0-9]', source_code[position:position+1]):
-            number_match = re.match(r'\d+', source_code[position:])
-            token = Token(TokenCategory.NUMBER, number_match.group(), line_num, position + 1)
-            position += number_match.end()
+        if position >= length:
+            break
         
-        # Check for multi-character operators
-        elif position + 1 < len(source_code):
-            if source_code[position:position+2] == '->':
-                token = Token(TokenCategory.OPERATOR, '->', line_num, position + 1)
-                position += 2
-            elif source_code[position:position+2] == '>=':
-                token = Token(TokenCategory.OPERATOR, '>=', line_num, position + 1)
-                position += 2
-            elif source_code[position:position+2] == '<=':
-                token = Token(TokenCategory.OPERATOR, '<=', line_num, position + 1)
-                position += 2
-            elif source_code[position:position+2] == '==':
-                token = Token(TokenCategory.OPERATOR, '==', line_num, position + 1)
-                position += 2
-            elif source_code[position:position+2] == '!=':
-                token = Token(TokenCategory.OPERATOR, '!=', line_num, position + 1)
-                position += 2
-            elif source_code[position] == '=':
-                token = Token(TokenCategory.OPERATOR, '=', line_num, position + 1)
-                position += 1
-            # Check for single-character operators
-            elif source_code[position] in '+-*/<>&.@/:~|$#!%^_[]{}"\?':
-                token = Token(TokenCategory.OPERATOR, source_code[position], line_num, position + 1)
-                position += 1
-            # Check for punctuation
-            elif source_code[position] in '();,':
-                token = Token(TokenCategory.PUNCTUATION, source_code[position], line_num, position + 1)
-                position += 1
-            else:
-                raise ValueError(f"Unexpected character at line {line_num}, column {position + 1}: '{source_code[position]}'")
+        offset = base + position
+        column = offset - line_start + 1
+        if m is None:
+            if buffer[position] == "'":
+                # The original scanner counted the newlines it walked over
+                # before giving up on the string, so report the same line.
+                line_num += buffer.count('\n', position)
+                raise ValueError(f"Unclosed string starting at line {line_num}, column {column}")
+            raise ValueError(f"Unexpected character at line {line_num}, column {column}: '{buffer[position]}'")
         
-        # Handle single characters at the end of the file
-        elif position < len(source_code):
-            if source_code[position] == '=':
-                token = Token(TokenCategory.OPERATOR, '=', line_num, position + 1)
-                position += 1
-            elif source_code[position] in '+-*/<>&.@/:~|$#!%^_[]{}"\?':
-                token = Token(TokenCategory.OPERATOR, source_code[position], line_num, position + 1)
-                position += 1
-            elif source_code[position] in '();,':
-                token = Token(TokenCategory.PUNCTUATION, source_code[position], line_num, position + 1)
-                position += 1
-            else:
-                raise ValueError(f"Unexpected character at line {line_num}, column {position + 1}: '{source_code[position]}'")
+        kind = m.lastgroup
         
-        if token:
-            tokens.append(token)
+        if kind == 'WORD':
+            word = m.group()
+            category = TokenCategory.KEYWORD if word in KEYWORDS else TokenCategory.IDENTIFIER
+            yield Token(category, word, line_num, column, offset)
+        elif kind == 'OPERATOR':
+            yield Token(TokenCategory.OPERATOR, m.group(), line_num, column, offset)
+        elif kind == 'PUNCTUATION':
+            yield Token(TokenCategory.PUNCTUATION, m.group(), line_num, column, offset)
+        elif kind == 'NUMBER':
+            yield Token(TokenCategory.NUMBER, m.group(), line_num, column, offset)
+        else:
+            # Whitespace, comments and strings may span lines
+            newlines = buffer.count('\n', position, end)
+            if newlines:
+                line_num += newlines
+                line_start = base + buffer.rfind('\n', position, end) + 1
+            if kind == 'TEXT':
+                # Multi-line strings are reported on the line where they
+                # close, at the column where they open
+                yield Token(TokenCategory.TEXT, m.group(), line_num, column, offset)
+        
+        position = end
     
     # Add an EOF token
-    tokens.append(Token(TokenCategory.EOF, "", line_num, position + 1))
-    
-    return tokens
+    yield Token(TokenCategory.EOF, "", line_num, base + position - line_start + 1, base + position)
 
 # For testing the module independently
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Compact Token Stream Module for RPAL Interpreter
+This module stores tokens column-wise in typed arrays instead of as one
+Token object per token.
+"""
+
+from array import array
+
+from Lexer.token_analyzer import Token, TokenCategory
+
+# Category codes stored in the category array, indexed by code
+CATEGORIES = tuple(TokenCategory)
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+class TokenStream:
+    """
+    Array-backed sequence of tokens with a read cursor.
+    
+    Each token costs one byte for its category, four bytes each for its start
+    and end offsets, line and column, and four bytes for the index of its
+    value in a table of distinct values. Token objects are only created on
+    demand when the parser looks at the token under the cursor.
+    
+    Attributes:
+        categories (array): Category code of each token
+        starts (array): Offset of the first character of each token
+        ends (array): Offset just past the last character of each token
+        lines (array): Line number of each token
+        columns (array): Column of the first character of each token
+        value_ids (array): Index of each token's value in values
+        values (list): The distinct token values, in order of first use
+        position (int): Index of the token under the cursor
+    """
+    
+    def __init__(self, tokens):
+        """
+        Pack a sequence of tokens into the stream.
+        
+        Args:
+            tokens (iterable): Token objects, e.g. from tokenize or iter_tokens
+        """
+        self.categories = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.value_ids = array('I')
+        self.values = []
+        self.position = 0
+        self._value_index = {}
+        self._cached_index = -1
+        self._cached_token = None
+        
+        value_index = self._value_index
+        for token in tokens:
+            value = token.value
+            value_id = value_index.get(value)
+            if value_id is None:
+                value_id = value_index[value] = len(self.values)
+                self.values.append(value)
+            self.categories.append(CATEGORY_CODES[token.category])
+            self.starts.append(token.offset)
+            self.ends.append(token.offset + len(value))
+            self.lines.append(token.line)
+            self.columns.append(token.column)
+            self.value_ids.append(value_id)
+    
+    def __len__(self):
+        """Return the number of tokens left from the cursor on."""
+        return len(self.categories) - self.position
+    
+    def get_category(self, index):
+        """Get the category of the token at an absolute index."""
+        return CATEGORIES[self.categories[index]]
+    
+    def get_value(self, index):
+        """Get the string value of the token at an absolute index."""
+        return self.values[self.value_ids[index]]
+    
+    def get_span(self, index):
+        """Get the offsets (start, end) of the token at an absolute index."""
+        return (self.starts[index], self.ends[index])
+    
+    def get_token(self, index):
+        """Build a Token object for the token at an absolute index."""
+        if index != self._cached_index:
+            self._cached_token = Token(CATEGORIES[self.categories[index]],
+                                       self.values[self.value_ids[index]],
+                                       self.lines[index],
+                                       self.columns[index],
+                                       self.starts[index])
+            self._cached_index = index
+        return self._cached_token
+    
+    def peek(self, offset=0):
+        """
+        Look at a token ahead of the cursor without consuming it.
+        
+        Args:
+            offset (int, optional): How far past the cursor to look
+            
+        Returns:
+            Token: The token
+            
+        Raises:
+            IndexError: If the stream ends before that token
+        """
+        index = self.position + offset
+        if index >= len(self.categories):
+            raise IndexError("token stream index out of range")
+        return self.get_token(index)
+    
+    def advance(self):
+        """
+        Consume the token under the cursor.
+        
+        Returns:
+            Token: The consumed token
+        """
+        token = self.peek()
+        self.position += 1
+        return token
+    
+    def __iter__(self):
+        """Consume and yield the remaining tokens."""
+        while self.position < len(self.categories):
+            yield self.advance()
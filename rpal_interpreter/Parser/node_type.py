@@ -0,0 +1,46 @@
+"""
+Node kinds of the RPAL Abstract Syntax Tree.
+"""
+
+from enum import IntEnum, auto
+
+class NodeType(IntEnum):
+    """
+    Kinds of AST and standardized tree nodes.
+    
+    Integer-valued so that kinds hash and compare as plain ints in the
+    standardizer's and CSE Machine factory's dispatch tables.
+    """
+    let = auto()
+    fcn_form = auto()
+    identifier = auto()
+    integer = auto()
+    string = auto()
+    where = auto()
+    gamma = auto()
+    lambda_expr = auto()
+    tau = auto()
+    rec = auto()
+    aug = auto()
+    conditional = auto()
+    op_or = auto()
+    op_and = auto()
+    op_not = auto()
+    op_compare = auto()
+    op_plus = auto()
+    op_minus = auto()
+    op_neg = auto()
+    op_mul = auto()
+    op_div = auto()
+    op_pow = auto()
+    at = auto()
+    true_value = auto()
+    false_value = auto()
+    nil = auto()
+    dummy = auto()
+    within = auto()
+    and_op = auto()
+    equal = auto()
+    comma = auto()
+    empty_params = auto()
+    ystar = auto()
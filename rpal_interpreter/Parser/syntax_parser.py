@@ -3,68 +3,130 @@ Parser Module for RPAL Interpreter
 Modified to be compatible with the provided lexical analyzer
 """
 
-from enum import Enum, auto
+from collections import deque
 # Modified import to use the provided lexical analyzer
 from Lexer.token_analyzer import TokenCategory, Token
+from Lexer.token_stream import TokenStream
+from Parser.node_type import NodeType
+from Standardizer.tree_node import NodeFactory
 
-class NodeType(Enum):
-    let = auto()
-    fcn_form = auto()
-    identifier = auto()
-    integer = auto()
-    string = auto()
-    where = auto()
-    gamma = auto()
-    lambda_expr = auto()
-    tau = auto()
-    rec = auto()
-    aug = auto()
-    conditional = auto()
-    op_or = auto()
-    op_and = auto()
-    op_not = auto()
-    op_compare = auto()
-    op_plus = auto()
-    op_minus = auto()
-    op_neg = auto()
-    op_mul = auto()
-    op_div = auto()
-    op_pow = auto()
-    at = auto()
-    true_value = auto()
-    false_value = auto()
-    nil = auto()
-    dummy = auto()
-    within = auto()
-    and_op = auto()
-    equal = auto()
-    comma = auto()
-    empty_params = auto()
-
-
-class Node:
-    def __init__(self, node_type, value, children):
-        self.type = node_type
-        self.value = value
-        self.no_of_children = children
+class TokenCursor:
+    """
+    Index cursor over a list of tokens.
+    
+    Consuming a token only moves the cursor, so the list is never shifted.
+    """
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+    
+    def peek(self, offset=0):
+        """Look at a token ahead of the cursor without consuming it."""
+        return self.tokens[self.position + offset]
+    
+    def advance(self):
+        """Consume and return the token under the cursor."""
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+    
+    def __iter__(self):
+        while self.position < len(self.tokens):
+            yield self.advance()
+
+class TokenLookahead:
+    """
+    Lookahead buffer over a token iterator such as Lexer.token_analyzer.iter_tokens.
+    
+    Tokens are pulled from the iterator only as far ahead as the parser peeks.
+    """
+    
+    def __init__(self, tokens):
+        self.source = iter(tokens)
+        self.buffer = deque()
+    
+    def _fill(self, n):
+        """Make sure at least n tokens are buffered, if the source has them."""
+        while len(self.buffer) < n:
+            token = next(self.source, None)
+            if token is None:
+                break
+            self.buffer.append(token)
+    
+    def peek(self, offset=0):
+        """Look at a token ahead of the cursor without consuming it."""
+        self._fill(offset + 1)
+        return self.buffer[offset]
+    
+    def advance(self):
+        """Consume and return the token under the cursor."""
+        self._fill(1)
+        return self.buffer.popleft()
+    
+    def __iter__(self):
+        self._fill(1)
+        while self.buffer:
+            yield self.buffer.popleft()
+            self._fill(1)
 
 class SyntaxParser:
+    """
+    Recursive descent parser for RPAL.
+    
+    Tokens may be given as a list, a TokenStream or any iterable of tokens.
+    Whatever the source, the grammar methods only look at it through peek()
+    and advance(), which are constant time for all of them.
+    """
+    
     def __init__(self, tokens):
+        if isinstance(tokens, list):
+            # Add an EOF marker if not present
+            if not tokens or tokens[-1].get_category() != TokenCategory.EOF:
+                tokens.append(Token(TokenCategory.EOF, ""))
+            tokens = TokenCursor(tokens)
+        elif not isinstance(tokens, TokenStream):
+            tokens = TokenLookahead(tokens)
         self.tokens = tokens
-        self.ast = []
-        self.string_ast = []
+        self.peek = tokens.peek
+        self.advance = tokens.advance
+        self.ast = []  # Stack of subtrees built so far
+
+    def build(self, node_type, value, no_of_children, token=None):
+        """
+        Build an AST node whose children are the top subtrees on the stack.
+        
+        Args:
+            node_type (NodeType): The kind of node
+            value (str): The token value or operator name of the node
+            no_of_children (int): How many subtrees to take from the stack
+            token (Token, optional): The token the construct starts with;
+                without it, the construct starts where its first child does
+        """
+        if no_of_children:
+            children = self.ast[-no_of_children:]
+            del self.ast[-no_of_children:]
+            position = children[0].position if token is None else token.get_position()
+            node = NodeFactory.create_ast_node(node_type, value, position)
+            for child in children:
+                child.set_parent(node)
+            node.children = children
+        else:
+            node = NodeFactory.create_ast_node(node_type, value, token.get_position())
+        self.ast.append(node)
 
     def parse(self):
-        # Modified to use TokenCategory.EOF instead of TokenType.END_OF_TOKENS
+        """
+        Parse the whole program.
+        
+        Returns:
+            TreeNode: The root of the Abstract Syntax Tree, or None on failure
+        """
         # Note: The lexical analyzer already adds an EOF token at the end
-        if not self.tokens or self.tokens[-1].get_category() != TokenCategory.EOF:
-            self.tokens.append(Token(TokenCategory.EOF, ""))  # Add an EOF marker if not present
-            
         self.E()  # Start parsing from the entry point
         
-        # Modified to check for EOF using TokenCategory
-        if self.tokens and self.tokens[0].get_category() == TokenCategory.EOF:
-            return self.ast
+        if self.peek().get_category() == TokenCategory.EOF:
+            return self.ast[-1] if self.ast else None
         else:
             print("Parsing Unsuccessful!...........")
             print("REMAINING UNPARSED TOKENS:")
@@ -80,43 +142,41 @@ class SyntaxParser:
     # 	->Ew;
 
     def E(self):
-        if self.tokens:  # Ensure tokens list is not empty
-            token = self.tokens[0]
-            # Modified to use get_category() and get_value() methods
-            if token.get_category() == TokenCategory.KEYWORD and token.get_value() in ["let", "fn"]:
-                if token.get_value() == "let":
-                    self.tokens.pop(0)  # Remove "let"
-                    self.D()
-                    if self.tokens[0].get_value() != "in":
-                        print("Parse error at E : 'in' Expected")
-                    self.tokens.pop(0)  # Remove "in"
-                    self.E()
-                    self.ast.append(Node(NodeType.let, "let", 2))
-                else:
-                    self.tokens.pop(0)  # Remove "fn"
-                    n = 0
-                    # Modified to use get_category() and get_value() methods
-                    while self.tokens and (self.tokens[0].get_category() == TokenCategory.IDENTIFIER or self.tokens[0].get_value() == "("):
-                        self.Vb()
-                        n += 1
-                    if self.tokens and self.tokens[0].get_value() != ".":
-                        print("Parse error at E : '.' Expected")
-                    if self.tokens:
-                        self.tokens.pop(0)  # Remove "."
-                        self.E()
-                        self.ast.append(Node(NodeType.lambda_expr, "lambda", n + 1))
+        token = self.peek()
+        # Modified to use get_category() and get_value() methods
+        if token.get_category() == TokenCategory.KEYWORD and token.get_value() in ["let", "fn"]:
+            if token.get_value() == "let":
+                self.advance()  # Remove "let"
+                self.D()
+                if self.peek().get_value() != "in":
+                    print("Parse error at E : 'in' Expected")
+                self.advance()  # Remove "in"
+                self.E()
+                self.build(NodeType.let, "let", 2, token)
             else:
-                self.Ew()
+                self.advance()  # Remove "fn"
+                n = 0
+                # Modified to use get_category() and get_value() methods
+                while self.peek().get_category() == TokenCategory.IDENTIFIER or self.peek().get_value() == "(":
+                    self.Vb()
+                    n += 1
+                if self.peek().get_value() != ".":
+                    print("Parse error at E : '.' Expected")
+                self.advance()  # Remove "."
+                self.E()
+                self.build(NodeType.lambda_expr, "lambda", n + 1, token)
+        else:
+            self.Ew()
 
     # Ew	->T 'where' Dr			=> 'where'
     # 		->T;
 
     def Ew(self):
         self.T()
-        if self.tokens[0].get_value() == "where":
-            self.tokens.pop(0)  # Remove "where"
+        if self.peek().get_value() == "where":
+            self.advance()  # Remove "where"
             self.Dr()
-            self.ast.append(Node(NodeType.where, "where", 2))
+            self.build(NodeType.where, "where", 2)
 
     # Tuple Expressions
 
@@ -126,12 +186,12 @@ class SyntaxParser:
     def T(self):
         self.Ta()
         n = 1
-        while self.tokens[0].get_value() == ",":
-            self.tokens.pop(0)  # Remove comma(,)
+        while self.peek().get_value() == ",":
+            self.advance()  # Remove comma(,)
             self.Ta()
             n += 1
         if n > 1:
-            self.ast.append(Node(NodeType.tau, "tau", n))
+            self.build(NodeType.tau, "tau", n)
 
     '''
     # Ta 	-> Ta 'aug' Tc => 'aug'
@@ -141,10 +201,10 @@ class SyntaxParser:
     '''
     def Ta(self):
         self.Tc()
-        while self.tokens[0].get_value() == "aug":
-            self.tokens.pop(0)  # Remove "aug"
+        while self.peek().get_value() == "aug":
+            self.advance()  # Remove "aug"
             self.Tc()
-            self.ast.append(Node(NodeType.aug, "aug", 2))
+            self.build(NodeType.aug, "aug", 2)
 
     '''
     Tc 	-> B '->' Tc '|' Tc => '->'
@@ -152,15 +212,15 @@ class SyntaxParser:
     '''    
     def Tc(self):
         self.B()
-        if self.tokens[0].get_value() == "->":
-            self.tokens.pop(0)  # Remove '->'
+        if self.peek().get_value() == "->":
+            self.advance()  # Remove '->'
             self.Tc()
-            if self.tokens[0].get_value() != "|":
+            if self.peek().get_value() != "|":
                 print("Parse error at Tc: conditional '|' expected")
                 # return
-            self.tokens.pop(0)  # Remove '|'
+            self.advance()  # Remove '|'
             self.Tc()
-            self.ast.append(Node(NodeType.conditional, "->", 3))
+            self.build(NodeType.conditional, "->", 3)
 
     # Boolean Expressions
     '''
@@ -171,10 +231,10 @@ class SyntaxParser:
     '''
     def B(self):
         self.Bt()
-        while self.tokens[0].get_value() == "or":
-            self.tokens.pop(0)  # Remove 'or'
+        while self.peek().get_value() == "or":
+            self.advance()  # Remove 'or'
             self.Bt()
-            self.ast.append(Node(NodeType.op_or, "or", 2))
+            self.build(NodeType.op_or, "or", 2)
 
     '''
     # Bt	-> Bt '&' Bs => '&'
@@ -184,19 +244,20 @@ class SyntaxParser:
     '''
     def Bt(self):
         self.Bs()
-        while self.tokens[0].get_value() == "&":
-            self.tokens.pop(0)  # Remove '&'
+        while self.peek().get_value() == "&":
+            self.advance()  # Remove '&'
             self.Bs()
-            self.ast.append(Node(NodeType.op_and, "&", 2))
+            self.build(NodeType.op_and, "&", 2)
 
     # Bs	-> 'not' Bp => 'not'
     # 		-> Bp ;
 
     def Bs(self):
-        if self.tokens[0].get_value() == "not":
-            self.tokens.pop(0)  # Remove 'not'
+        token = self.peek()
+        if token.get_value() == "not":
+            self.advance()  # Remove 'not'
             self.Bp()
-            self.ast.append(Node(NodeType.op_not, "not", 1))
+            self.build(NodeType.op_not, "not", 1, token)
         else:
             self.Bp()
 
@@ -210,20 +271,20 @@ class SyntaxParser:
             
     def Bp(self):
         self.A()
-        token = self.tokens[0]
+        token = self.peek()
         if token.get_value() in [">", ">=", "<", "<=", "gr", "ge", "ls", "le", "eq", "ne"]:
-            self.tokens.pop(0)
+            self.advance()
             self.A()
             if token.get_value() == ">":
-                self.ast.append(Node(NodeType.op_compare, "gr", 2))
+                self.build(NodeType.op_compare, "gr", 2)
             elif token.get_value() == ">=":
-                self.ast.append(Node(NodeType.op_compare, "ge", 2))
+                self.build(NodeType.op_compare, "ge", 2)
             elif token.get_value() == "<":
-                self.ast.append(Node(NodeType.op_compare, "ls", 2))
+                self.build(NodeType.op_compare, "ls", 2)
             elif token.get_value() == "<=":
-                self.ast.append(Node(NodeType.op_compare, "le", 2))
+                self.build(NodeType.op_compare, "le", 2)
             else:
-                self.ast.append(Node(NodeType.op_compare, token.get_value(), 2))
+                self.build(NodeType.op_compare, token.get_value(), 2)
 
     # Arithmetic Expressions
 
@@ -234,24 +295,24 @@ class SyntaxParser:
     # 		-> At ;
 
     def A(self):
-        if self.tokens[0].get_value() == "+":
-            self.tokens.pop(0)  # Remove unary plus
+        if self.peek().get_value() == "+":
+            self.advance()  # Remove unary plus
             self.At()
-        elif self.tokens[0].get_value() == "-":
-            self.tokens.pop(0)  # Remove unary minus
+        elif self.peek().get_value() == "-":
+            token = self.advance()  # Remove unary minus
             self.At()
-            self.ast.append(Node(NodeType.op_neg, "neg", 1))
+            self.build(NodeType.op_neg, "neg", 1, token)
         else:
             self.At()
 
-        while self.tokens[0].get_value() in {"+", "-"}:
-            current_token = self.tokens[0]  # Save present token
-            self.tokens.pop(0)  # Remove plus or minus operators
+        while self.peek().get_value() in {"+", "-"}:
+            current_token = self.peek()  # Save present token
+            self.advance()  # Remove plus or minus operators
             self.At()
             if current_token.get_value() == "+":
-                self.ast.append(Node(NodeType.op_plus, "+", 2))
+                self.build(NodeType.op_plus, "+", 2)
             else:
-                self.ast.append(Node(NodeType.op_minus, "-", 2))
+                self.build(NodeType.op_minus, "-", 2)
 
     '''
     At 	-> At '*' Af => '*'
@@ -262,14 +323,14 @@ class SyntaxParser:
     '''           
     def At(self):
         self.Af()
-        while self.tokens[0].get_value() in {"*", "/"}:
-            current_token = self.tokens[0]  # Save present token
-            self.tokens.pop(0)  # Remove multiply or divide operators
+        while self.peek().get_value() in {"*", "/"}:
+            current_token = self.peek()  # Save present token
+            self.advance()  # Remove multiply or divide operators
             self.Af()
             if current_token.get_value() == "*":
-                self.ast.append(Node(NodeType.op_mul, "*", 2))
+                self.build(NodeType.op_mul, "*", 2)
             else:
-                self.ast.append(Node(NodeType.op_div, "/", 2))
+                self.build(NodeType.op_div, "/", 2)
 
     '''
     Af 	-> Ap '**' Af => '**'
@@ -280,10 +341,10 @@ class SyntaxParser:
 
     def Af(self):
         self.Ap()
-        if self.tokens[0].get_value() == "**":
-            self.tokens.pop(0)  # Remove power operator
+        if self.peek().get_value() == "**":
+            self.advance()  # Remove power operator
             self.Af()
-            self.ast.append(Node(NodeType.op_pow, "**", 2))
+            self.build(NodeType.op_pow, "**", 2)
 
     '''
     Ap 	-> Ap '@' '<IDENTIFIER>' R => '@'
@@ -293,20 +354,20 @@ class SyntaxParser:
     '''   
     def Ap(self):
         self.R()
-        while self.tokens[0].get_value() == "@":
-            self.tokens.pop(0)  # Remove @ operator
+        while self.peek().get_value() == "@":
+            self.advance()  # Remove @ operator
             
             # Modified to use get_category()
-            if self.tokens[0].get_category() != TokenCategory.IDENTIFIER:
+            if self.peek().get_category() != TokenCategory.IDENTIFIER:
                 print("Parsing error at Ap: IDENTIFIER EXPECTED")
                 # Handle parsing error here
                 return
             
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].get_value(), 0))
-            self.tokens.pop(0)  # Remove IDENTIFIER
+            self.build(NodeType.identifier, self.peek().get_value(), 0, self.peek())
+            self.advance()  # Remove IDENTIFIER
             
             self.R()
-            self.ast.append(Node(NodeType.at, "@", 3))
+            self.build(NodeType.at, "@", 3)
 
     # Rators And Rands
     '''
@@ -319,12 +380,12 @@ class SyntaxParser:
     def R(self):
         self.Rn()
         # Modified to use get_category() and get_value() methods
-        while (self.tokens[0].get_category() in [TokenCategory.IDENTIFIER, TokenCategory.NUMBER, TokenCategory.TEXT] or
-            self.tokens[0].get_value() in ["true", "false", "nil", "dummy"] or
-            self.tokens[0].get_value() == "("):
+        while (self.peek().get_category() in [TokenCategory.IDENTIFIER, TokenCategory.NUMBER, TokenCategory.TEXT] or
+            self.peek().get_value() in ["true", "false", "nil", "dummy"] or
+            self.peek().get_value() == "("):
             
             self.Rn()
-            self.ast.append(Node(NodeType.gamma, "gamma", 2))
+            self.build(NodeType.gamma, "gamma", 2)
 
     #        Rn 	-> '<IDENTIFIER>'
     # 				-> '<INTEGER>'
@@ -337,42 +398,42 @@ class SyntaxParser:
             
     def Rn(self):
         # Modified to use get_category() and get_value() methods
-        token_category = self.tokens[0].get_category()
-        token_value = self.tokens[0].get_value()
+        token_category = self.peek().get_category()
+        token_value = self.peek().get_value()
         
         if token_category == TokenCategory.IDENTIFIER:
-            self.ast.append(Node(NodeType.identifier, token_value, 0))
-            self.tokens.pop(0)
+            self.build(NodeType.identifier, token_value, 0, self.peek())
+            self.advance()
         elif token_category == TokenCategory.NUMBER:  # Changed from INTEGER to NUMBER
-            self.ast.append(Node(NodeType.integer, token_value, 0))
-            self.tokens.pop(0)
+            self.build(NodeType.integer, token_value, 0, self.peek())
+            self.advance()
         elif token_category == TokenCategory.TEXT:  # Changed from STRING to TEXT
-            self.ast.append(Node(NodeType.string, token_value, 0))
-            self.tokens.pop(0)
+            self.build(NodeType.string, token_value, 0, self.peek())
+            self.advance()
         elif token_category == TokenCategory.KEYWORD:
             if token_value == "true":
-                self.ast.append(Node(NodeType.true_value, token_value, 0))
-                self.tokens.pop(0)
+                self.build(NodeType.true_value, token_value, 0, self.peek())
+                self.advance()
             elif token_value == "false":
-                self.ast.append(Node(NodeType.false_value, token_value, 0))
-                self.tokens.pop(0)
+                self.build(NodeType.false_value, token_value, 0, self.peek())
+                self.advance()
             elif token_value == "nil":
-                self.ast.append(Node(NodeType.nil, token_value, 0))
-                self.tokens.pop(0)
+                self.build(NodeType.nil, token_value, 0, self.peek())
+                self.advance()
             elif token_value == "dummy":
-                self.ast.append(Node(NodeType.dummy, token_value, 0))
-                self.tokens.pop(0)
+                self.build(NodeType.dummy, token_value, 0, self.peek())
+                self.advance()
             else:
                 print("Parse Error at Rn: Unexpected KEYWORD")
         elif token_category == TokenCategory.PUNCTUATION:
             if token_value == "(":
-                self.tokens.pop(0)  # Remove '('
+                self.advance()  # Remove '('
                 
                 self.E()
                 
-                if self.tokens[0].get_value() != ")":
+                if self.peek().get_value() != ")":
                     print("Parsing error at Rn: Expected a matching ')'")
-                self.tokens.pop(0)  # Remove ')'
+                self.advance()  # Remove ')'
             else:
                 print("Parsing error at Rn: Unexpected PUNCTUATION")
         else:
@@ -386,10 +447,10 @@ class SyntaxParser:
             
     def D(self):
         self.Da()
-        if self.tokens[0].get_value() == "within":
-            self.tokens.pop(0)  # Remove 'within'
+        if self.peek().get_value() == "within":
+            self.advance()  # Remove 'within'
             self.D()
-            self.ast.append(Node(NodeType.within, "within", 2))
+            self.build(NodeType.within, "within", 2)
 
     # Da  -> Dr ( 'and' Dr )+ => 'and'
     # 					-> Dr ;
@@ -397,24 +458,25 @@ class SyntaxParser:
     def Da(self): 
         self.Dr()
         n = 1
-        while self.tokens[0].get_value() == "and":
-            self.tokens.pop(0)
+        while self.peek().get_value() == "and":
+            self.advance()
             self.Dr()
             n += 1
         if n > 1:
-            self.ast.append(Node(NodeType.and_op, "and", n))
+            self.build(NodeType.and_op, "and", n)
 
     # Dr  -> 'rec' Db => 'rec'
     # 	-> Db ;
             
     def Dr(self):
+        token = self.peek()
         is_rec = False
-        if self.tokens[0].get_value() == "rec":
-            self.tokens.pop(0)
+        if token.get_value() == "rec":
+            self.advance()
             is_rec = True
         self.Db()
         if is_rec:
-            self.ast.append(Node(NodeType.rec, "rec", 1))
+            self.build(NodeType.rec, "rec", 1, token)
 
     # Db  -> Vl '=' E => '='
     # 				-> '<IDENTIFIER>' Vb+ '=' E => 'fcn_form'
@@ -422,36 +484,36 @@ class SyntaxParser:
             
     def Db(self): 
         # Modified to use get_category() and get_value() methods
-        if self.tokens[0].get_category() == TokenCategory.PUNCTUATION and self.tokens[0].get_value() == "(":
-            self.tokens.pop(0)
+        if self.peek().get_category() == TokenCategory.PUNCTUATION and self.peek().get_value() == "(":
+            self.advance()
             self.D()
-            if self.tokens[0].get_value() != ")":
+            if self.peek().get_value() != ")":
                 print("Parsing error at Db #1")
-            self.tokens.pop(0)
-        elif self.tokens[0].get_category() == TokenCategory.IDENTIFIER:
-            if self.tokens[1].get_value() == "(" or self.tokens[1].get_category() == TokenCategory.IDENTIFIER:
+            self.advance()
+        elif self.peek().get_category() == TokenCategory.IDENTIFIER:
+            if self.peek(1).get_value() == "(" or self.peek(1).get_category() == TokenCategory.IDENTIFIER:
                 # Expect a fcn_form
-                self.ast.append(Node(NodeType.identifier, self.tokens[0].get_value(), 0))
-                self.tokens.pop(0)  # Remove ID
+                self.build(NodeType.identifier, self.peek().get_value(), 0, self.peek())
+                self.advance()  # Remove ID
 
                 n = 1  # Identifier child
                 # Modified to use get_category() and get_value() methods
-                while self.tokens[0].get_category() == TokenCategory.IDENTIFIER or self.tokens[0].get_value() == "(":
+                while self.peek().get_category() == TokenCategory.IDENTIFIER or self.peek().get_value() == "(":
                     self.Vb()
                     n += 1
-                if self.tokens[0].get_value() != "=":
+                if self.peek().get_value() != "=":
                     print("Parsing error at Db #2")
-                self.tokens.pop(0)
+                self.advance()
                 
                 self.E()
-                self.ast.append(Node(NodeType.fcn_form, "function_form", n + 1))
+                self.build(NodeType.fcn_form, "function_form", n + 1)
             else:
                 self.Vl()
-                if self.tokens[0].get_value() != "=":
+                if self.peek().get_value() != "=":
                     print("Parsing error at Db #3")
-                self.tokens.pop(0)
+                self.advance()
                 self.E()
-                self.ast.append(Node(NodeType.equal, "=", 2))
+                self.build(NodeType.equal, "=", 2)
         else:
             print("Parsing error at Db #4")
 
@@ -461,19 +523,19 @@ class SyntaxParser:
             
     def Vb(self):
         # Modified to use get_category() and get_value() methods
-        if self.tokens[0].get_category() == TokenCategory.IDENTIFIER:
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].get_value(), 0))
-            self.tokens.pop(0)
-        elif self.tokens[0].get_category() == TokenCategory.PUNCTUATION and self.tokens[0].get_value() == "(":
-            self.tokens.pop(0)
-            if self.tokens[0].get_value() == ")":
-                self.tokens.pop(0)
-                self.ast.append(Node(NodeType.empty_params, "", 0))
+        if self.peek().get_category() == TokenCategory.IDENTIFIER:
+            self.build(NodeType.identifier, self.peek().get_value(), 0, self.peek())
+            self.advance()
+        elif self.peek().get_category() == TokenCategory.PUNCTUATION and self.peek().get_value() == "(":
+            token = self.advance()
+            if self.peek().get_value() == ")":
+                self.advance()
+                self.build(NodeType.empty_params, "", 0, token)
             else:
                 self.Vl()
-                if self.tokens[0].get_value() != ")":
+                if self.peek().get_value() != ")":
                     print("Parsing error at Vb")
-                self.tokens.pop(0)
+                self.advance()
         else:
             print("Parsing error at Vb")
 
@@ -482,23 +544,23 @@ class SyntaxParser:
             
     def Vl(self):
         # Modified to use get_category() and get_value() methods
-        if self.tokens[0].get_category() != TokenCategory.IDENTIFIER:
+        if self.peek().get_category() != TokenCategory.IDENTIFIER:
             print("Parsing error at Vl")
             return
         
-        self.ast.append(Node(NodeType.identifier, self.tokens[0].get_value(), 0))
-        self.tokens.pop(0)
+        self.build(NodeType.identifier, self.peek().get_value(), 0, self.peek())
+        self.advance()
         
         n = 1
-        while self.tokens[0].get_value() == ",":
-            self.tokens.pop(0)
-            if self.tokens[0].get_category() != TokenCategory.IDENTIFIER:
+        while self.peek().get_value() == ",":
+            self.advance()
+            if self.peek().get_category() != TokenCategory.IDENTIFIER:
                 print("Parsing error at Vl")
                 return
             
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].get_value(), 0))
-            self.tokens.pop(0)
+            self.build(NodeType.identifier, self.peek().get_value(), 0, self.peek())
+            self.advance()
             n += 1
         
         if n > 1:
-            self.ast.append(Node(NodeType.comma, ",", n))
+            self.build(NodeType.comma, ",", n)
@@ -0,0 +1,305 @@
+"""
+Profiles of the RPAL functions a CSE Machine runs.
+
+A FunctionProfiler traces every application of a lambda and attributes
+machine steps, time and allocated memory blocks to the function applied, both
+itself (self) and with the functions it calls (cumulative). A
+SamplingProfiler instead interrupts the machine with a profiling timer and
+records which functions were active, which costs far less on call-heavy
+programs.
+
+Functions are named after the identifier their lambda is bound to, if any,
+and the line and column in the source where the lambda starts. Both profilers write a text report
+sorted by self cost, and collapsed stacks, "<main>;f;g weight" lines, as
+flame graph tools read. Directly recursive calls are folded into one frame
+of the stacks.
+"""
+
+import signal
+import sys
+import time
+
+from CSEMachine.csemachine import CSEMachine
+
+# Frames of a sampled stack kept, innermost first; deeper ones are cut
+MAX_SAMPLE_DEPTH = 256
+
+# Stands for the frames cut from a sampled stack
+TRUNCATED = "..."
+
+def function_label(lambda_expr):
+    """
+    Args:
+        lambda_expr (Lambda): A function's Lambda, None for the program body
+
+    Returns:
+        str: The name the function is reported under
+    """
+    if lambda_expr is None:
+        return "<main>"
+    elif lambda_expr is TRUNCATED:
+        return TRUNCATED
+    name = lambda_expr.get_name() or "lambda"
+    position = lambda_expr.get_position()
+    if position is None:
+        return f"{name}#{lambda_expr.get_index()}"
+    line, column = position
+    return f"{name}:{line}:{column}"
+
+class FunctionStats:
+    """Costs attributed to one function"""
+    def __init__(self, lambda_expr):
+        self.lambda_ = lambda_expr
+        self.calls = 0
+        self.self_steps = 0
+        self.cumulative_steps = 0
+        self.self_time = 0.0
+        self.cumulative_time = 0.0
+        self.self_blocks = 0
+        self.cumulative_blocks = 0
+        self.self_samples = 0
+        self.cumulative_samples = 0
+
+class CallNode:
+    """
+    A node of the call tree: a function called along the path from the
+    program body to it
+
+    Attributes:
+        lambda_ (Lambda): The function, None for the program body
+        children (dict): The nodes of the functions it calls, by Lambda
+        weight: Self cost of the function along this path
+    """
+    def __init__(self, lambda_expr):
+        self.lambda_ = lambda_expr
+        self.children = {}
+        self.weight = 0
+
+    def get_child(self, lambda_expr):
+        """Get the node of a function called here; a recursive call stays here"""
+        if lambda_expr is self.lambda_:
+            return self
+        child = self.children.get(lambda_expr)
+        if child is None:
+            child = CallNode(lambda_expr)
+            self.children[lambda_expr] = child
+        return child
+
+    def write_collapsed(self, file, scale=1):
+        """
+        Write the weights of the tree as collapsed stacks
+
+        Args:
+            file: Where to write them
+            scale: Factor the weights are multiplied by, rounded to integers
+        """
+        pending = [(self, function_label(self.lambda_))]
+        while pending:
+            node, path = pending.pop()
+            weight = round(node.weight * scale)
+            if weight > 0:
+                print(f"{path} {weight}", file=file)
+            for child in node.children.values():
+                pending.append((child, path + ";" + function_label(child.lambda_)))
+
+class ActiveCall:
+    """A function application in progress, as traced by a FunctionProfiler"""
+    def __init__(self, lambda_expr, node, steps):
+        self.lambda_ = lambda_expr
+        self.node = node
+        self.steps = steps
+        self.blocks = sys.getallocatedblocks()
+        self.time = time.perf_counter()
+        self.child_steps = 0
+        self.child_time = 0.0
+        self.child_blocks = 0
+
+class FunctionProfiler:
+    """
+    Traces the function applications of a CSE Machine
+
+    The machine calls enter when it applies a lambda (and for the program
+    body when it starts), exit when the frame exits or a tail call replaces
+    it, and finish when it stops.
+    """
+    def __init__(self):
+        """Initialize a new FunctionProfiler instance"""
+        self.stats = {}  # FunctionStats by Lambda
+        self.root = CallNode(None)
+        self.calls = []  # ActiveCall of each active frame, innermost last
+        self.active = {}  # Number of active frames of each Lambda
+
+    def get_stats(self, lambda_expr):
+        stats = self.stats.get(lambda_expr)
+        if stats is None:
+            stats = FunctionStats(lambda_expr)
+            self.stats[lambda_expr] = stats
+        return stats
+
+    def enter(self, lambda_expr, steps):
+        """
+        Args:
+            lambda_expr (Lambda): The function applied, None for the program
+            steps (int): Steps the machine has taken
+        """
+        node = self.calls[-1].node.get_child(lambda_expr) if self.calls else self.root
+        self.calls.append(ActiveCall(lambda_expr, node, steps))
+        self.get_stats(lambda_expr).calls += 1
+        self.active[lambda_expr] = self.active.get(lambda_expr, 0) + 1
+
+    def exit(self, steps):
+        """
+        Args:
+            steps (int): Steps the machine has taken, None if unknown
+        """
+        now = time.perf_counter()
+        blocks = sys.getallocatedblocks()
+        call = self.calls.pop()
+        total_steps = call.child_steps if steps is None else steps - call.steps
+        total_time = now - call.time
+        total_blocks = blocks - call.blocks
+
+        stats = self.get_stats(call.lambda_)
+        stats.self_steps += total_steps - call.child_steps
+        stats.self_time += total_time - call.child_time
+        stats.self_blocks += total_blocks - call.child_blocks
+        call.node.weight += total_time - call.child_time
+
+        # Recursive applications count towards the cumulative costs once,
+        # in the outermost of them
+        self.active[call.lambda_] -= 1
+        if self.active[call.lambda_] == 0:
+            stats.cumulative_steps += total_steps
+            stats.cumulative_time += total_time
+            stats.cumulative_blocks += total_blocks
+
+        if self.calls:
+            caller = self.calls[-1]
+            caller.child_steps += total_steps
+            caller.child_time += total_time
+            caller.child_blocks += total_blocks
+
+    def finish(self, steps=None):
+        """
+        Exit the frames left active: the program body, and every frame of
+        a program that failed
+
+        Args:
+            steps (int): Steps the machine has taken, None if unknown
+        """
+        while self.calls:
+            self.exit(steps)
+
+    def report(self, file=None):
+        """Print the costs of each function, highest self time first"""
+        file = file or sys.stderr
+        self.finish()
+        print(f"{'calls':>10} {'steps':>12} {'cum steps':>12} {'self (s)':>10} {'cum (s)':>10} "
+              f"{'blocks':>10} {'cum blocks':>10}  function", file=file)
+        for stats in sorted(self.stats.values(), key=lambda stats: stats.self_time, reverse=True):
+            print(f"{stats.calls:>10} {stats.self_steps:>12} {stats.cumulative_steps:>12} "
+                  f"{stats.self_time:>10.4f} {stats.cumulative_time:>10.4f} "
+                  f"{stats.self_blocks:>+10} {stats.cumulative_blocks:>+10}  {function_label(stats.lambda_)}",
+                  file=file)
+
+    def write_collapsed(self, file):
+        """Write collapsed stacks weighted by self time in microseconds"""
+        self.finish()
+        self.root.write_collapsed(file, scale=1000000)
+
+class SamplingProfiler:
+    """
+    Samples the active functions of a CSE Machine on a profiling timer
+
+    The timer's signal interrupts the Python code running, and the handler
+    finds the machine's execute frame and reads its current environment.
+    The chain of previous environments then gives the active functions, so
+    the machine itself does no extra work.
+    """
+    def __init__(self, interval=0.001):
+        """
+        Initialize a new SamplingProfiler instance
+
+        Args:
+            interval (float): Seconds of CPU time between samples
+        """
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("Sampling needs signal.setitimer, which this platform does not have")
+        self.interval = interval
+        self.stats = {}  # FunctionStats by Lambda
+        self.root = CallNode(None)
+        self.samples = 0
+        self.handler = None
+        self.cpu = 0.0  # CPU time spent sampling
+
+    def get_stats(self, lambda_expr):
+        stats = self.stats.get(lambda_expr)
+        if stats is None:
+            stats = FunctionStats(lambda_expr)
+            self.stats[lambda_expr] = stats
+        return stats
+
+    def start(self):
+        """Start sampling; the machine must run in the main thread"""
+        self.handler = signal.signal(signal.SIGPROF, self.sample)
+        self.start_cpu = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """Stop sampling"""
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        self.cpu += time.process_time() - self.start_cpu
+        if self.handler is not None:
+            signal.signal(signal.SIGPROF, self.handler)
+            self.handler = None
+
+    def sample(self, signum, frame):
+        """Record the functions active in the machine, if it is running"""
+        while frame is not None and frame.f_code is not CSEMachine.execute.__code__:
+            frame = frame.f_back
+        if frame is None:
+            return
+        environment = frame.f_locals.get("current_environment")
+
+        # Active functions from the innermost out, recursive calls folded
+        functions = []
+        while environment is not None and len(functions) < MAX_SAMPLE_DEPTH:
+            if not functions or environment.lambda_ is not functions[-1]:
+                functions.append(environment.lambda_)
+            environment = environment.get_previous()
+        if environment is not None:
+            functions.append(TRUNCATED)
+        if not functions or functions[-1] is not None:
+            functions.append(None)
+        self.samples += 1
+
+        self.get_stats(functions[0]).self_samples += 1
+        for lambda_expr in set(functions):
+            self.get_stats(lambda_expr).cumulative_samples += 1
+
+        node = self.root
+        for lambda_expr in reversed(functions[:-1]):
+            node = node.get_child(lambda_expr)
+        node.weight += 1
+
+    def report(self, file=None):
+        """
+        Print the samples of each function, most samples in it first
+
+        The kernel may deliver the timer's signals less often than asked,
+        so times are estimated from the share of the samples of the CPU time
+        spent sampling.
+        """
+        file = file or sys.stderr
+        total = max(self.samples, 1)
+        print(f"{self.samples} samples over {self.cpu:.3f} s of CPU time", file=file)
+        print(f"{'samples':>10} {'self %':>8} {'cum %':>8} {'self (s)':>10} {'cum (s)':>10}  function", file=file)
+        for stats in sorted(self.stats.values(), key=lambda stats: stats.self_samples, reverse=True):
+            print(f"{stats.self_samples:>10} {100 * stats.self_samples / total:>8.1f} "
+                  f"{100 * stats.cumulative_samples / total:>8.1f} "
+                  f"{self.cpu * stats.self_samples / total:>10.3f} {self.cpu * stats.cumulative_samples / total:>10.3f}  "
+                  f"{function_label(stats.lambda_)}", file=file)
+
+    def write_collapsed(self, file):
+        """Write collapsed stacks weighted by sample counts"""
+        self.root.write_collapsed(file)
@@ -0,0 +1,131 @@
+"""
+Per-phase measurements of an interpreter run.
+
+A PhaseProfiler records, for each phase of a run (lexing, parsing,
+standardizing, building the machine, executing), its wall time, CPU time,
+the change in the number of memory blocks Python has allocated, and counts
+of the items the phase produced, and reports them as a table or as JSON.
+"""
+
+import json
+import sys
+import time
+
+from CSEMachine.symbols import B, Delta, Lambda, Rec
+
+class Phase:
+    """
+    Measurements of one phase, taken by using it as a context manager
+
+    Attributes:
+        name (str): Name of the phase
+        wall (float): Elapsed wall time in seconds
+        cpu (float): CPU time of the process in seconds
+        blocks (int): Change in the number of allocated memory blocks
+        counts (dict): Item counts, by item name
+        failed (bool): Whether the phase raised an exception
+    """
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.blocks = 0
+        self.counts = {}
+        self.failed = False
+
+    def __enter__(self):
+        self.start_blocks = sys.getallocatedblocks()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall = time.perf_counter() - self.start_wall
+        self.cpu = time.process_time() - self.start_cpu
+        self.blocks = sys.getallocatedblocks() - self.start_blocks
+        self.failed = exc_type is not None
+        self.profiler.phases.append(self)
+        return False
+
+    def set_count(self, name, count):
+        """Record the number of items of a kind the phase produced"""
+        self.counts[name] = count
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "wall_s": round(self.wall, 6),
+            "cpu_s": round(self.cpu, 6),
+            "allocated_blocks": self.blocks,
+            "counts": self.counts,
+            "failed": self.failed,
+        }
+
+class PhaseProfiler:
+    """
+    Collects the measurements of the phases of a run, in the order they
+    finish
+    """
+    def __init__(self):
+        """Initialize a new PhaseProfiler instance"""
+        self.phases = []
+
+    def phase(self, name):
+        """
+        Args:
+            name (str): Name of the phase
+
+        Returns:
+            Phase: A context manager measuring the code it runs
+        """
+        return Phase(self, name)
+
+    def report(self, format="table", file=None):
+        """
+        Print the measurements
+
+        Args:
+            format (str): "table" for a table, or "json" for one JSON object
+            file: Where to print them (default: stderr)
+        """
+        file = file or sys.stderr
+        if format == "json":
+            print(json.dumps({"phases": [phase.to_dict() for phase in self.phases]}), file=file)
+            return
+
+        print(f"{'phase':<12} {'wall (s)':>10} {'cpu (s)':>10} {'blocks':>10}  counts", file=file)
+        for phase in self.phases:
+            counts = " ".join(f"{name}={count}" for name, count in phase.counts.items())
+            if phase.failed:
+                counts = (counts + " (failed)").lstrip()
+            print(f"{phase.name:<12} {phase.wall:>10.4f} {phase.cpu:>10.4f} {phase.blocks:>+10}  {counts}",
+                  file=file)
+        wall = sum(phase.wall for phase in self.phases)
+        cpu = sum(phase.cpu for phase in self.phases)
+        blocks = sum(phase.blocks for phase in self.phases)
+        print(f"{'total':<12} {wall:>10.4f} {cpu:>10.4f} {blocks:>+10}", file=file)
+
+def count_control_symbols(control):
+    """
+    Count the symbols of a CSE Machine's control structures
+
+    Args:
+        control (list): The machine's initial control list
+
+    Returns:
+        int: The number of symbols, including those of every delta, condition
+        block and lambda body reachable from the list
+    """
+    count = 0
+    pending = list(control)
+    while pending:
+        symbol = pending.pop()
+        count += 1
+        if isinstance(symbol, (Delta, B)):
+            pending.extend(symbol.symbols)
+        elif isinstance(symbol, Lambda):
+            pending.append(symbol.get_delta())
+        elif isinstance(symbol, Rec):
+            pending.append(symbol.get_lambda())
+    return count
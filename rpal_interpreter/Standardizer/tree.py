@@ -37,25 +37,51 @@ class StandardTree:
         if self.root and not self.root.is_standardized:
             self.root.standardize()
     
-    def pre_order_traverse(self, node, indent_level):
+    def count_nodes(self):
+        """
+        Count the nodes of the tree, using an explicit stack.
+        
+        Returns:
+            int: The number of nodes
+        """
+        count = 0
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children)
+        return count
+    
+    def pre_order_traverse(self, node, indent_level, label=str):
         """
         Traverse the tree in pre-order and print each node.
         
+        Uses an explicit stack, so trees of any depth can be printed.
+        
         Args:
-            node (TreeNode): The current node being visited
-            indent_level (int): The current indentation level
+            node (TreeNode): The node to start from
+            indent_level (int): The indentation level of that node
+            label (callable, optional): Maps a node's data to the text printed for it
         """
-        # Print the node's data with indentation based on the level
-       
-        print("." * indent_level + str(node.get_data()))
-        
-        # Traverse through each child node recursively
-        for child in node.children:
-            self.pre_order_traverse(child, indent_level + 1)
+        stack = [(node, indent_level)]
+        while stack:
+            node, indent_level = stack.pop()
+            
+            # Print the node's data with indentation based on the level
+            print("." * indent_level + label(node.get_data()))
+            
+            # Push children in reverse so they are printed left to right
+            for child in reversed(node.children):
+                stack.append((child, indent_level + 1))
     
-    def print_tree(self):
-        """Print the entire tree in a hierarchical format."""
+    def print_tree(self, label=str):
+        """
+        Print the entire tree in a hierarchical format.
+        
+        Args:
+            label (callable, optional): Maps a node's data to the text printed for it
+        """
         if self.root:
-            self.pre_order_traverse(self.root, 0)
+            self.pre_order_traverse(self.root, 0, label)
         else:
             print("Empty tree")
@@ -2,33 +2,63 @@
 This module defines the node structure for the Abstract Syntax Tree.
 """
 
+from Parser.node_type import NodeType
+
+# Leaf kinds printed as <TYPE:value>
+LABELLED_LEAF_TYPES = frozenset([
+    NodeType.identifier, NodeType.integer, NodeType.string, NodeType.true_value,
+    NodeType.false_value, NodeType.nil, NodeType.dummy,
+])
+
 class TreeNode:
     """
     Represents a node in the Abstract Syntax Tree.
     
     Attributes:
-        data (str): The data/value stored in the node
+        kind (NodeType): The kind of node
+        value (str): The payload of the node: the name of an identifier, the
+            text of a literal, or the operator or construct name otherwise
         depth (int): The depth of the node in the tree
         parent (TreeNode): The parent node
         children (list): List of child nodes
         is_standardized (bool): Whether the node has been standardized
+        position (tuple): The (line, column) in the source where the
+            construct the node stands for starts, or None if unknown
     """
     
     def __init__(self):
         """Initialize a new TreeNode instance."""
-        self.data = None
+        self.kind = None
+        self.value = None
         self.depth = 0
         self.parent = None
         self.children = []
         self.is_standardized = False
+        self.position = None
+    
+    def set_kind(self, kind, value):
+        """Set the kind of the node along with its payload."""
+        self.kind = kind
+        self.value = value
+    
+    def get_kind(self):
+        """Get the kind of the node."""
+        return self.kind
     
-    def set_data(self, data):
-        """Set the data/value of the node."""
-        self.data = data
+    def get_value(self):
+        """Get the payload of the node."""
+        return self.value
     
     def get_data(self):
-        """Get the data/value of the node."""
-        return self.data
+        """
+        Get the label of the node as shown in the tree printouts.
+        
+        Identifiers and literals are shown as <TYPE:value>, e.g. <IDENTIFIER:x>;
+        every other node is shown by its value, e.g. gamma or +.
+        """
+        if self.kind in LABELLED_LEAF_TYPES:
+            return "<" + self.kind.name.upper() + ":" + self.value + ">"
+        return self.value
     
     def get_degree(self):
         """Get the number of children (degree) of the node."""
@@ -54,37 +84,42 @@ class TreeNode:
         """Get the parent node."""
         return self.parent
     
+    def set_position(self, position):
+        """Set the (line, column) where the node's construct starts."""
+        self.position = position
+    
+    def get_position(self):
+        """Get the (line, column) where the node's construct starts."""
+        return self.position
+    
     def standardize(self):
         """
         Standardize the node and its subtree according to RPAL transformation rules.
-        This method applies the appropriate standardization rule based on the node's data.
+        
+        Nodes are collected with an explicit stack and then rewritten in
+        reverse order of collection, so every node is standardized after all
+        of its descendants and arbitrarily deep trees do not run into Python's
+        recursion limit.
         """
         if self.is_standardized:
             return
         
-        # First standardize all children
-        for child in self.children:
-            child.standardize()
-        
-        # Apply standardization rules based on node type
-        if self.data == "let":
-            self._standardize_let()
-        elif self.data == "where":
-            self._standardize_where()
-        elif self.data == "function_form":
-            self._standardize_function_form()
-        elif self.data == "lambda":
-            self._standardize_lambda()
-        elif self.data == "within":
-            self._standardize_within()
-        elif self.data == "@":
-            self._standardize_at()
-        elif self.data == "and":
-            self._standardize_and()
-        elif self.data == "rec":
-            self._standardize_rec()
-        
-        self.is_standardized = True
+        # Collect the nodes still to be standardized, parents before children
+        pending = []
+        stack = [self]
+        pop, extend, append = stack.pop, stack.extend, pending.append
+        while stack:
+            node = pop()
+            if not node.is_standardized:
+                append(node)
+                extend(node.children)
+        
+        rules = STANDARDIZATION_RULES
+        for node in reversed(pending):
+            rule = rules.get(node.kind)
+            if rule is not None:
+                rule(node)
+            node.is_standardized = True
     
     def _standardize_let(self):
         """
@@ -111,9 +146,10 @@ class TreeNode:
         temp2.set_depth(self.depth + 2)
         
         self.children[1] = temp1
-        equal_node.set_data("lambda")
+        equal_node.set_kind(NodeType.lambda_expr, "lambda")
+        equal_node.set_position(self.position)  # The scope of the let
         equal_node.children[1] = temp2
-        self.set_data("gamma")
+        self.set_kind(NodeType.gamma, "gamma")
     
     def _standardize_where(self):
         """
@@ -131,9 +167,9 @@ class TreeNode:
         self.children[0] = self.children[1]
         self.children[1] = temp
         
-        # Change node type and re-standardize
-        self.set_data("let")
-        self.standardize()  # Apply let standardization
+        # Change node type and apply let standardization
+        self.set_kind(NodeType.let, "let")
+        self._standardize_let()
     
     def _standardize_function_form(self):
         """
@@ -151,7 +187,7 @@ class TreeNode:
         e_node = self.children[-1]  # E (function body)
         
         # Create lambda node
-        current_lambda = NodeFactory.create_node_with_parent("lambda", self.depth + 1, self, [], True)
+        current_lambda = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", self.depth + 1, self, [], True)
         self.children.insert(1, current_lambda)
         
         # Process variable bindings
@@ -165,7 +201,8 @@ class TreeNode:
             
             # Create nested lambda if more variables exist
             if len(self.children) > 3:
-                new_lambda = NodeFactory.create_node_with_parent("lambda", current_lambda.depth + 1, current_lambda, [], True)
+                new_lambda = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", current_lambda.depth + 1, current_lambda, [], True,
+                                                                 self.children[i].position)
                 current_lambda.children.append(new_lambda)
                 current_lambda = new_lambda
         
@@ -174,7 +211,7 @@ class TreeNode:
         self.children.pop(2)  # Remove E from original position
         
         # Change node type
-        self.set_data("=")
+        self.set_kind(NodeType.equal, "=")
     
     def _standardize_lambda(self):
         """
@@ -191,7 +228,7 @@ class TreeNode:
             e_node = self.children[-1]  # Function body
             
             # Create first nested lambda
-            current_lambda = NodeFactory.create_node_with_parent("lambda", self.depth + 1, self, [], True)
+            current_lambda = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", self.depth + 1, self, [], True)
             self.children.insert(1, current_lambda)
             
             # Process variable bindings
@@ -205,7 +242,8 @@ class TreeNode:
                 
                 # Create nested lambda if more variables exist
                 if len(self.children) > 3:
-                    new_lambda = NodeFactory.create_node_with_parent("lambda", current_lambda.depth + 1, current_lambda, [], True)
+                    new_lambda = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", current_lambda.depth + 1, current_lambda, [], True,
+                                                                     self.children[i].position)
                     current_lambda.children.append(new_lambda)
                     current_lambda = new_lambda
             
@@ -233,8 +271,8 @@ class TreeNode:
         e2_node = self.children[1].children[1]
         
         # Create new nodes
-        gamma_node = NodeFactory.create_node_with_parent("gamma", self.depth + 1, self, [], True)
-        lambda_node = NodeFactory.create_node_with_parent("lambda", self.depth + 2, gamma_node, [], True)
+        gamma_node = NodeFactory.create_node_with_parent(NodeType.gamma, "gamma", self.depth + 1, self, [], True)
+        lambda_node = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", self.depth + 2, gamma_node, [], True)
         
         # Adjust depths and parents
         x1_node.set_depth(x1_node.get_depth() + 1)
@@ -260,7 +298,7 @@ class TreeNode:
         self.children.append(x2_node)
         self.children.append(gamma_node)
         
-        self.set_data("=")
+        self.set_kind(NodeType.equal, "=")
     
     def _standardize_at(self):
         """
@@ -279,7 +317,7 @@ class TreeNode:
         e2_node = self.children[2]
         
         # Create new gamma node
-        gamma1_node = NodeFactory.create_node_with_parent("gamma", self.depth + 1, self, [], True)
+        gamma1_node = NodeFactory.create_node_with_parent(NodeType.gamma, "gamma", self.depth + 1, self, [], True)
         
         # Adjust depths and parents
         e1_node.set_depth(e1_node.get_depth() + 1)
@@ -296,7 +334,7 @@ class TreeNode:
         self.children.pop(0)
         self.children.insert(0, gamma1_node)
         
-        self.set_data("gamma")
+        self.set_kind(NodeType.gamma, "gamma")
     
     def _standardize_and(self):
         """
@@ -310,8 +348,8 @@ class TreeNode:
              X     E           X++    E++
         """
         # Create new nodes
-        comma_node = NodeFactory.create_node_with_parent(",", self.depth + 1, self, [], True)
-        tau_node = NodeFactory.create_node_with_parent("tau", self.depth + 1, self, [], True)
+        comma_node = NodeFactory.create_node_with_parent(NodeType.comma, ",", self.depth + 1, self, [], True)
+        tau_node = NodeFactory.create_node_with_parent(NodeType.tau, "tau", self.depth + 1, self, [], True)
         
         # Process each equal node
         for equal_node in self.children:
@@ -332,7 +370,7 @@ class TreeNode:
         self.children.append(comma_node)
         self.children.append(tau_node)
         
-        self.set_data("=")
+        self.set_kind(NodeType.equal, "=")
     
     def _standardize_rec(self):
         """
@@ -352,10 +390,11 @@ class TreeNode:
         e_node = self.children[0].children[1]
         
         # Create new nodes
-        f_node = NodeFactory.create_node_with_parent(x_node.get_data(), self.depth + 1, self, x_node.children.copy(), True)
-        g_node = NodeFactory.create_node_with_parent("gamma", self.depth + 1, self, [], True)
-        y_node = NodeFactory.create_node_with_parent("<Y*>", self.depth + 2, g_node, [], True)
-        l_node = NodeFactory.create_node_with_parent("lambda", self.depth + 2, g_node, [], True)
+        f_node = NodeFactory.create_node_with_parent(x_node.get_kind(), x_node.get_value(), self.depth + 1, self, x_node.children.copy(), True,
+                                                 x_node.position)
+        g_node = NodeFactory.create_node_with_parent(NodeType.gamma, "gamma", self.depth + 1, self, [], True)
+        y_node = NodeFactory.create_node_with_parent(NodeType.ystar, "<Y*>", self.depth + 2, g_node, [], True)
+        l_node = NodeFactory.create_node_with_parent(NodeType.lambda_expr, "lambda", self.depth + 2, g_node, [], True)
         
         # Adjust depths and parents
         x_node.set_depth(l_node.depth + 1)
@@ -375,49 +414,68 @@ class TreeNode:
         self.children.append(f_node)
         self.children.append(g_node)
         
-        self.set_data("=")
+        self.set_kind(NodeType.equal, "=")
 
 
 class NodeFactory:
     """Factory class for creating TreeNode instances."""
     
     @staticmethod
-    def create_node(data, depth):
+    def create_ast_node(kind, value, position=None):
         """
-        Create a new TreeNode with the specified data and depth.
+        Create a TreeNode for the parser.
         
         Args:
-            data (str): The data/value for the node
-            depth (int): The depth of the node in the tree
+            kind (NodeType): The kind of node
+            value (str): The token value or operator name
+            position (tuple, optional): The (line, column) where the
+                construct starts
             
         Returns:
             TreeNode: A new TreeNode instance
         """
         node = TreeNode()
-        node.set_data(data)
-        node.set_depth(depth)
-        node.children = []
+        node.set_kind(kind, value)
+        node.position = position
         return node
     
     @staticmethod
-    def create_node_with_parent(data, depth, parent, children, is_standardized):
+    def create_node_with_parent(kind, value, depth, parent, children, is_standardized, position=None):
         """
         Create a new TreeNode with the specified attributes.
         
         Args:
-            data (str): The data/value for the node
+            kind (NodeType): The kind of node
+            value (str): The payload of the node
             depth (int): The depth of the node in the tree
             parent (TreeNode): The parent node
             children (list): List of child nodes
             is_standardized (bool): Whether the node is already standardized
+            position (tuple, optional): The (line, column) where the node's
+                construct starts; by default the parent's, as nodes made by
+                standardization stand for part of the construct rewritten
             
         Returns:
             TreeNode: A new TreeNode instance
         """
         node = TreeNode()
-        node.set_data(data)
+        node.set_kind(kind, value)
         node.set_depth(depth)
         node.set_parent(parent)
         node.children = children
         node.is_standardized = is_standardized
+        node.position = parent.position if position is None and parent is not None else position
         return node
+
+
+# Standardization rule for each kind of node that has one
+STANDARDIZATION_RULES = {
+    NodeType.let: TreeNode._standardize_let,
+    NodeType.where: TreeNode._standardize_where,
+    NodeType.fcn_form: TreeNode._standardize_function_form,
+    NodeType.lambda_expr: TreeNode._standardize_lambda,
+    NodeType.within: TreeNode._standardize_within,
+    NodeType.at: TreeNode._standardize_at,
+    NodeType.and_op: TreeNode._standardize_and,
+    NodeType.rec: TreeNode._standardize_rec,
+}
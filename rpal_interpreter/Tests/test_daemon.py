@@ -0,0 +1,41 @@
+"""
+Tests of the daemon's workers: a request must run the same way whatever the
+worker ran before it, with any engine.
+
+Run from the rpal_interpreter directory:
+    python -m unittest discover Tests
+"""
+
+import sys
+import threading
+import unittest
+
+from Daemon.worker import ProgramCache, handle_request
+
+# Nested deeper than the parser's recursion allows under the default limit
+DEEP_PARENS_PROGRAM = "Print " + "(" * 2000 + "1" + ")" * 2000
+
+# Recursion nested far deeper than Python's recursion limit
+DEEP_SUM_PROGRAM = "let rec Sum n = n eq 0 -> 0 | n + Sum (n - 1) in Print (Sum 100000)"
+
+def request(source, *argv):
+    """Build a request to run a source with the given interpreter options"""
+    return {"name": "program.rpal", "argv": list(argv), "source": source}
+
+class WorkerStateTest(unittest.TestCase):
+    """No engine changes the state of the process its worker runs in"""
+    def test_engines_share_worker(self):
+        cache = ProgramCache()
+        expected = handle_request(request(DEEP_PARENS_PROGRAM), cache)
+        recursion_limit = sys.getrecursionlimit()
+        stack_size = threading.stack_size()
+        for engine in ("cse", "bytecode", "closure", "python"):
+            with self.subTest(engine=engine):
+                response = handle_request(request(DEEP_SUM_PROGRAM, f"--engine={engine}"), cache)
+                self.assertEqual(response["stdout"], "Output of the above program is:\n5000050000\n")
+                self.assertEqual(sys.getrecursionlimit(), recursion_limit)
+                self.assertEqual(threading.stack_size(), stack_size)
+                self.assertEqual(handle_request(request(DEEP_PARENS_PROGRAM), cache), expected)
+
+if __name__ == "__main__":
+    unittest.main()
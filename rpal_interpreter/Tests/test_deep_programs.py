@@ -0,0 +1,171 @@
+"""
+Tests of programs nested far deeper than Python's recursion limit, and of
+loops running far more iterations: every phase handling them must do so
+without RecursionError, building the same trees as it does for shallow
+programs and printing the expected values.
+
+The let and where chains are built directly from nodes, as in
+Benchmarks/deep_standardize.py, since the parser recurses on them.
+
+Run from the rpal_interpreter directory:
+    python -m unittest discover Tests
+"""
+
+import contextlib
+import io
+import unittest
+
+from Benchmarks.deep_standardize import let_chain, where_chain
+from Benchmarks.tail_calls import MAX_DEPTH, DepthTracker
+from Lexer.token_analyzer import iter_tokens, tokenize
+from Lexer.token_stream import TokenStream
+from myrpal import ENGINES, parse_program
+from Tests.test_engines import run_program
+
+# Deeper than the default recursion limit many times over
+DEPTH = 20000
+
+# Iterations of the tail-recursive loops
+ITERATIONS = 100000
+
+# Sums 1..n by tail calls
+SUM_PROGRAM = f"""
+    let rec Sum n acc = n eq 0 -> acc | Sum (n - 1) (acc + n)
+    in Print (Sum {ITERATIONS} 0)
+"""
+
+# Sums 1..n by calls that are not in tail position, nested n deep
+DEEP_SUM_PROGRAM = f"""
+    let rec Sum n = n eq 0 -> 0 | n + Sum (n - 1)
+    in Print (Sum {ITERATIONS})
+"""
+
+def pre_order(tree):
+    """
+    Returns:
+        list: The data of every node of a tree, in pre-order
+    """
+    data = []
+    stack = [tree.get_root()]
+    while stack:
+        node = stack.pop()
+        data.append(node.get_data())
+        stack.extend(reversed(node.children))
+    return data
+
+def left_spine(tree):
+    """
+    Returns:
+        list: The data of the nodes on the path that always follows the
+        first child, from the root
+    """
+    data = []
+    node = tree.get_root()
+    while node is not None:
+        data.append(node.get_data())
+        node = node.children[0] if node.children else None
+    return data
+
+class DeepParseTest(unittest.TestCase):
+    """Long left-associative chains parse into left-deep trees"""
+    def assert_left_deep(self, source, operator, first):
+        # Every way of giving the parser its tokens builds the same tree
+        trees = [parse_program(tokens) for tokens in
+                 (tokenize(source), TokenStream(iter_tokens(source)), iter_tokens(source))]
+        self.assertEqual(left_spine(trees[0]), [operator] * DEPTH + [first])
+        self.assertEqual(trees[0].count_nodes(), 2 * DEPTH + 1)
+        expected = pre_order(trees[0])
+        for tree in trees[1:]:
+            self.assertEqual(pre_order(tree), expected)
+
+    def test_sum(self):
+        self.assert_left_deep("0" + " + 1" * DEPTH, "+", "<INTEGER:0>")
+
+    def test_product(self):
+        self.assert_left_deep("1" + " * 2" * DEPTH, "*", "<INTEGER:1>")
+
+    def test_conjunction(self):
+        self.assert_left_deep("true" + " & true" * DEPTH, "&", "<TRUE_VALUE:true>")
+
+    def test_aug(self):
+        self.assert_left_deep("nil" + " aug 1" * DEPTH, "aug", "<NIL:nil>")
+
+    def test_application(self):
+        self.assert_left_deep("f" + " x" * DEPTH, "gamma", "<IDENTIFIER:f>")
+
+    def test_wide_tuple(self):
+        source = "(" + ", ".join(str(i) for i in range(DEPTH)) + ")"
+        tree = parse_program(tokenize(source))
+        self.assertEqual(pre_order(tree), ["tau"] + [f"<INTEGER:{i}>" for i in range(DEPTH)])
+
+def standardized_let_chain(depth):
+    """
+    Returns:
+        list: Pairs of the level and data of every node of a let chain of
+        the given depth once standardized, in pre-order: gamma(lambda(x<i>,
+        ...), <i>) for each level, around Print x0
+    """
+    nodes = []
+    for i in range(depth):
+        nodes += [(2 * i, "gamma"), (2 * i + 1, "lambda"), (2 * i + 2, f"<IDENTIFIER:x{i}>")]
+    nodes += [(2 * depth, "gamma"), (2 * depth + 1, "<IDENTIFIER:Print>"),
+              (2 * depth + 1, "<IDENTIFIER:x0>")]
+    for i in reversed(range(depth)):
+        nodes.append((2 * i + 1, f"<INTEGER:{i}>"))
+    return nodes
+
+class DeepStandardizeTest(unittest.TestCase):
+    """Deep chains standardize and print as shallow ones do"""
+    def test_let_chain(self):
+        tree = let_chain(DEPTH)
+        tree.standardize()
+        self.assertEqual(pre_order(tree), [data for _, data in standardized_let_chain(DEPTH)])
+
+    def test_where_chain(self):
+        tree = where_chain(DEPTH)
+        tree.standardize()
+        self.assertEqual(pre_order(tree), [data for _, data in standardized_let_chain(DEPTH)])
+
+    def test_aug_chain(self):
+        tree = parse_program(tokenize("nil" + " aug 1" * DEPTH))
+        tree.standardize()
+        self.assertEqual(left_spine(tree), ["aug"] * DEPTH + ["<NIL:nil>"])
+
+    def test_print_tree(self):
+        # Printing writes about 2 * depth * depth dots, so the depth is smaller
+        depth = DEPTH // 10
+        tree = let_chain(depth)
+        tree.standardize()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tree.print_tree()
+        expected = "".join("." * level + data + "\n" for level, data in standardized_let_chain(depth))
+        self.assertEqual(output.getvalue(), expected)
+
+class TailCallTest(unittest.TestCase):
+    """Tail-recursive loops run in constant space"""
+    def test_engines(self):
+        expected = str(ITERATIONS * (ITERATIONS + 1) // 2)
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(run_program(SUM_PROGRAM, engine), expected)
+
+    def test_cse_frames(self):
+        std_tree = parse_program(tokenize(SUM_PROGRAM))
+        std_tree.standardize()
+        machine = ENGINES['cse'](std_tree)
+        tracker = DepthTracker(machine)
+        self.assertEqual(machine.get_answer(), str(ITERATIONS * (ITERATIONS + 1) // 2))
+        self.assertLessEqual(tracker.control_depth, MAX_DEPTH)
+        self.assertLessEqual(tracker.stack_depth, MAX_DEPTH)
+
+class DeepRecursionTest(unittest.TestCase):
+    """Recursion nested far deeper than Python's recursion limit"""
+    def test_engines(self):
+        expected = str(ITERATIONS * (ITERATIONS + 1) // 2)
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(run_program(DEEP_SUM_PROGRAM, engine), expected)
+
+if __name__ == "__main__":
+    unittest.main()
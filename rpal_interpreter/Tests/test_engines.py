@@ -0,0 +1,112 @@
+"""
+Differential tests of the execution engines: every engine must print what
+the CSE Machine prints, for the sample programs and for programs that fail.
+
+Run from the rpal_interpreter directory:
+    python -m unittest discover Tests
+"""
+
+import glob
+import os
+import unittest
+
+from Lexer.token_analyzer import tokenize
+from myrpal import ENGINES, parse_program
+
+INPUTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Inputs")
+
+# Programs applying operators and built-in functions to values of the wrong
+# type, and printing values every engine represents differently
+ILL_TYPED_PROGRAMS = [
+    "Print ('ab' + 'cd')",
+    "Print ((1, 2) + (3, 4))",
+    "Print (true + 1)",
+    "Print ('a' ls 'b')",
+    "Print (1 - 'a')",
+    "Print ('ab' * 2)",
+    "Print (1 le 'x')",
+    "Print (dummy gr 1)",
+    "Print (1 ge (1, 2))",
+    "Print (nil + 1)",
+    "Print ((fn x. x) + 1)",
+    "Print (Print + 1)",
+    "Print (Conc 'a' + 1)",
+    "Print (-'a')",
+    "Print (- (1, 2))",
+    "Print ('a' / 2)",
+    "Print (1 / 0)",
+    "Print (not 1)",
+    "Print (1 & 2)",
+    "Print (true or 'a')",
+    "Print (1 aug 2)",
+    "Print (Order 'abc')",
+    "Print (Null 'abc')",
+    "Print (Stem '')",
+    "Print (Stem (1, 2))",
+    "Print (Stem nil)",
+    "Print (Stern (1, 2, 3))",
+    "Print (Stern nil)",
+    "Print (Stern '')",
+    "Print (Conc 1 'a')",
+    "Print (Conc 'a' 2)",
+    "Print (Conc 1)",
+    "Print (Conc 'a')",
+    "Print (Itos 'a', Itos true, Itos (1, 2), Itos nil)",
+    "Print Stem",
+    "let f x = x in Print f",
+    "let rec f x = x in Print f",
+    "let rec f x = x in Print (f + 1)",
+    "let rec f n = n eq 0 -> 0 | f (n - 1) in Print (f 5, f)",
+    "let rec f x y = x in Print (f 1)",
+    "Print ((1, 2) eq 'tup', Print eq 'Print', (fn x. x) eq 'lambda')",
+    "let rec f x = x in Print (f eq 'eta', Conc 'a' eq 'Conc')",
+    "Print ((fn x. x + 1) 'a')",
+    "Print (('a' ls 'b') -> 1 | 2)",
+    "let x = 'ab' in Print (x + x)",
+    "let f x y = x + y in Print (f 1 2, f 'a' 'b')",
+    "let f = 1 in let g x = x + f in Print (g 2, g 'a')",
+    "let rec f n = n eq 0 -> 'a' | f (n - 1) + 1 in Print (f 3)",
+    "let rec f n acc = n eq 0 -> acc | f (n - 1) (acc + n) in Print (f 10 0)",
+    "let rec f n acc = n eq 0 -> acc | f (n - 1) (acc + n) in Print (f 10 'a')",
+    "Print (Order (1, 2, 3), Null nil, 1 ls 2, 3 ge 3, 2 - 10, -5 / 2)",
+    "Print (Isfunction Print, Isfunction (fn x. x), Isinteger 3, Isinteger true)",
+    "let rec f x = x in Print (Isfunction f, Isfunction (Conc 'a'), Isfunction Conc)",
+    "let t = (1, 2) in Print (Order (t aug t), t aug t, t)",
+    "let t = (1, 2) in let u = t aug 3 in Print (u aug u, u aug t, t aug u, Order (u aug u))",
+    "let t = (1, 2) in Print ((t aug t) 5)",
+]
+
+def run_program(source, engine):
+    """
+    Run an RPAL program as the command line does
+
+    Returns:
+        str: The value it prints, or the error message it fails with
+    """
+    try:
+        std_tree = parse_program(tokenize(source))
+        std_tree.standardize()
+        return ENGINES[engine](std_tree).get_answer()
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+class EngineAgreementTest(unittest.TestCase):
+    """Every engine prints what the cse engine prints"""
+    def assert_engines_agree(self, source):
+        expected = run_program(source, 'cse')
+        for engine in ENGINES:
+            if engine != 'cse':
+                with self.subTest(engine=engine, source=source):
+                    self.assertEqual(run_program(source, engine), expected)
+
+    def test_inputs(self):
+        for path in sorted(glob.glob(os.path.join(INPUTS, "*.txt"))):
+            with open(path) as file:
+                self.assert_engines_agree(file.read())
+
+    def test_ill_typed_programs(self):
+        for source in ILL_TYPED_PROGRAMS:
+            self.assert_engines_agree(source)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+On-disk cache of compiled transpiled programs.
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import tempfile
+
+import Lexer
+import Parser
+import Standardizer
+import Transpiler
+
+def get_cache_directory():
+    """
+    Get the directory compiled programs are cached in: $RPAL_CACHE_DIR, or
+    rpal_interpreter under the user's cache directory
+    """
+    directory = os.environ.get("RPAL_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "rpal_interpreter")
+
+def get_transpiler_digest():
+    """
+    Hash the sources of the lexer, parser, standardizer and transpiler, so
+    that cached code generated by an older version of any of them is not
+    reused
+    """
+    digest = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+    for package in (Lexer, Parser, Standardizer, Transpiler):
+        directory = os.path.dirname(package.__file__)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                with open(os.path.join(directory, name), "rb") as file:
+                    digest.update(name.encode() + b"\0" + file.read())
+    return digest.digest()
+
+class CodeCache:
+    """
+    Marshalled code objects of transpiled programs, keyed by a hash of the
+    RPAL source, the sources of the interpreter that compiled them and the
+    Python bytecode version
+    """
+    def __init__(self, directory=None):
+        """
+        Initialize a new CodeCache instance
+
+        Args:
+            directory (str): The cache directory; see get_cache_directory
+        """
+        self.directory = directory or get_cache_directory()
+        self.transpiler_digest = get_transpiler_digest()
+
+    def get_key(self, source):
+        """
+        Args:
+            source (str): RPAL source
+
+        Returns:
+            str: The cache key of the source
+        """
+        digest = hashlib.sha256(self.transpiler_digest)
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + ".bin")
+
+    def load(self, source):
+        """
+        Args:
+            source (str): RPAL source
+
+        Returns:
+            code: The cached code object of the source, or None if there is
+            none or it cannot be read
+        """
+        try:
+            with open(self.get_path(self.get_key(source)), "rb") as file:
+                return marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def store(self, source, code):
+        """
+        Cache the code object of a source. The file is written under a
+        temporary name and renamed, so concurrent runs never read a partial
+        file. Failing to write the cache is not an error.
+
+        Args:
+            source (str): RPAL source
+            code: The code object compiled from it
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    marshal.dump(code, file)
+                os.replace(temporary, self.get_path(self.get_key(source)))
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            pass
@@ -0,0 +1,584 @@
+"""
+Transpiles standardized trees to Python source and compiles it.
+"""
+
+from Parser.node_type import NodeType
+from .runtime import BUILTINS
+
+# Expressions nested deeper than this are assigned to temporaries, as
+# Python limits how deeply parentheses may nest
+MAX_EXPRESSION_DEPTH = 24
+
+# Operators on integers: the Python operator written when both operands are
+# known to be integers, and the runtime function checking them otherwise
+INTEGER_OPERATORS = {
+    "+": ("+", "rpal_add"), "-": ("-", "rpal_sub"), "*": ("*", "rpal_mul"),
+    "**": ("**", "rpal_pow"), "ls": ("<", "rpal_ls"), "le": ("<=", "rpal_le"),
+    "gr": (">", "rpal_gr"), "ge": (">=", "rpal_ge"),
+}
+
+# Operators checking their operands' types in the runtime
+FUNCTION_OPERATORS = {
+    "/": "rpal_div", "aug": "rpal_aug", "&": "rpal_and", "or": "rpal_or",
+}
+
+# Kinds of nodes whose value is always an integer, as they fail on anything else
+INTEGER_KINDS = frozenset([
+    NodeType.integer, NodeType.op_neg, NodeType.op_plus, NodeType.op_minus,
+    NodeType.op_mul, NodeType.op_div, NodeType.op_pow,
+])
+
+class Binding:
+    """
+    The Python variable holding the value of an RPAL identifier
+
+    Attributes:
+        var (str): The variable's name
+        is_integer (bool): Whether the value is known to be an integer
+    """
+    def __init__(self, var, is_integer=False):
+        self.var = var
+        self.is_integer = is_integer
+
+class SelfCall:
+    """
+    The innermost function of a rec definition whose body runs as a loop
+
+    Attributes:
+        binding (Binding): The rec-bound identifier
+        levels (list): For each curried parameter list of the definition, the
+            variables its values are assigned to when the body calls itself
+            in tail position
+    """
+    def __init__(self, binding, levels):
+        self.binding = binding
+        self.levels = levels
+
+class PythonTranspiler:
+    """
+    Translates a standardized tree to the source of a Python module
+
+    The module defines main(), which returns the program's value. Every RPAL
+    lambda becomes a def and every identifier bound by a lambda a variable of
+    its own. Lambdas applied where they are written, as let and where
+    produce, become assignments. A rec definition of a function becomes a
+    def that refers to itself, and when the body only calls itself in tail
+    position and creates no functions, the calls become a loop.
+
+    Built-in functions are called directly. Every other application is
+    yielded to rpal_run as a (rator, rand) tuple, making the def a generator,
+    or returned to it as a TailCall in tail position, so running the program
+    nests no Python calls.
+    """
+    def __init__(self):
+        """Initialize a new PythonTranspiler instance"""
+        self.counter = 0
+        self.scopes = []  # Bindings of each enclosing lambda's parameters, innermost last
+        self.lines = []  # Lines of the block being written, relative to its indentation
+        self.unbound = {}  # Variable holding each unbound identifier's value
+        self.self_call = None  # The SelfCall whose loop is being written, if any
+        self.depth = 0  # Nesting depth of the expression being written
+
+    def transpile(self, ast):
+        """
+        Args:
+            ast: The standardized abstract syntax tree
+
+        Returns:
+            str: Source of the Python module
+        """
+        body = self.block(lambda: self.returning(ast.get_root()))
+        lines = [f"{var} = Unbound({name!r})" for name, var in self.unbound.items()]
+        lines.append("def main():")
+        lines += ["    " + line for line in body]
+        return "\n".join(lines) + "\n"
+
+    def compile(self, ast, filename="<rpal>"):
+        """
+        Transpile a standardized tree and compile the module
+
+        Args:
+            ast: The standardized abstract syntax tree
+            filename (str): The file name compiled code reports
+
+        Returns:
+            code: The module's code object
+        """
+        return compile(self.transpile(ast), filename, "exec")
+
+    def new_name(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def block(self, write_body):
+        """
+        Collect the lines written by write_body into a separate block
+
+        Returns:
+            list: The block's lines, relative to its indentation
+        """
+        lines = self.lines
+        self.lines = []
+        try:
+            write_body()
+            return self.lines
+        finally:
+            self.lines = lines
+
+    def write_block(self, header, lines):
+        self.write(header)
+        for line in lines or ["pass"]:
+            self.write("    " + line)
+
+    def temporary(self, expression):
+        """Assign an expression to a new temporary and return its name"""
+        name = self.new_name("t")
+        self.write(f"{name} = {expression}")
+        return name
+
+    def bind(self, node):
+        """
+        Create the Binding of an identifier node a lambda binds
+
+        Returns:
+            tuple: The identifier's name and its Binding
+        """
+        name = node.get_value()
+        var = self.new_name(name + "_" if name.isidentifier() else "v")
+        return name, Binding(var)
+
+    def parameters(self, lambda_node):
+        """
+        Returns:
+            list: The identifier nodes a lambda binds, and whether they are
+            bound from the elements of a tuple
+        """
+        parameters = lambda_node.get_children()[0]
+        if parameters.get_kind() == NodeType.comma:
+            return parameters.get_children(), True
+        return [parameters], False
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            binding = scope.get(name)
+            if binding is not None:
+                return binding
+        return None
+
+    # Expressions
+
+    def expression(self, node):
+        """
+        Write the statements needed to evaluate a node
+
+        Returns:
+            str: A Python expression of the node's value
+        """
+        self.depth += 1
+        try:
+            expression = self.translate(node)
+        finally:
+            self.depth -= 1
+        if self.depth and self.depth % MAX_EXPRESSION_DEPTH == 0 and expression.startswith("("):
+            expression = self.temporary(expression)
+        return expression
+
+    def translate(self, node):
+        kind = node.get_kind()
+        value = node.get_value()
+        children = node.get_children()
+
+        if kind == NodeType.identifier:
+            return self.identifier(value)
+        elif kind == NodeType.integer:
+            return str(int(value))
+        elif kind == NodeType.string:
+            return repr(value[1:-1])
+        elif kind == NodeType.true_value:
+            return "True"
+        elif kind == NodeType.false_value:
+            return "False"
+        elif kind == NodeType.nil:
+            return "()"
+        elif kind == NodeType.dummy:
+            return "DUMMY"
+        elif kind == NodeType.ystar:
+            return "rpal_ystar"
+        elif kind == NodeType.lambda_expr:
+            return self.function(node)
+        elif kind == NodeType.conditional:
+            return self.conditional(node)
+        elif kind == NodeType.gamma:
+            return self.application(node)
+        elif kind == NodeType.tau:
+            return "(" + "".join(self.expression(child) + ", " for child in children) + ")"
+        elif kind == NodeType.op_neg:
+            value = self.checked_operand(children[0])
+            if self.is_integer(children[0]):
+                return f"(-{value})"
+            return f"(-{value} if type({value}) is int else rpal_neg({value}))"
+        elif kind == NodeType.op_not:
+            return f"rpal_not({self.expression(children[0])})"
+        elif len(children) == 2:
+            return self.operation(value, children[0], children[1])
+        raise ValueError(f"Cannot transpile node: {node.get_data()}")
+
+    def identifier(self, name):
+        binding = self.lookup(name)
+        if binding is not None:
+            return binding.var
+        if name in BUILTINS:
+            return "builtin_" + name.lower()
+        if name not in self.unbound:
+            self.unbound[name] = self.new_name("u")
+        return self.unbound[name]
+
+    def operation(self, op, left, right):
+        if op in INTEGER_OPERATORS:
+            return self.integer_operation(op, left, right)
+        elif op in FUNCTION_OPERATORS:
+            return f"{FUNCTION_OPERATORS[op]}({self.expression(left)}, {self.expression(right)})"
+        elif op in ("eq", "ne"):
+            negation = "not " if op == "ne" else ""
+            value1 = self.expression(left)
+            value2 = self.expression(right)
+            # Integers compared with a literal need no type check in rpal_eq
+            if right.get_kind() == NodeType.integer and value1.isidentifier():
+                return f"({negation}({value1} == {value2} if type({value1}) is int else rpal_eq({value1}, {value2})))"
+            return f"({negation}rpal_eq({value1}, {value2}))"
+        raise ValueError(f"Cannot transpile operator: {op}")
+
+    def integer_operation(self, op, left, right):
+        """
+        Write an operator on integers as the Python operator, checking first
+        the types of the operands not known to be integers
+        """
+        infix, function = INTEGER_OPERATORS[op]
+        value1 = self.checked_operand(left)
+        value2 = self.checked_operand(right)
+        checks = [f"type({value}) is int" for node, value in ((left, value1), (right, value2))
+                  if not self.is_integer(node)]
+        if not checks:
+            return f"({value1} {infix} {value2})"
+        return f"({value1} {infix} {value2} if {' and '.join(checks)} else {function}({value1}, {value2}))"
+
+    def checked_operand(self, node):
+        """
+        Returns:
+            str: A Python expression of an operand's value, a variable if the
+            type of the value is to be checked, so it is evaluated only once
+        """
+        value = self.expression(node)
+        if self.is_integer(node) or value.isidentifier():
+            return value
+        return self.temporary(value)
+
+    def is_integer(self, node):
+        """Whether a node's value is known to be an integer"""
+        kind = node.get_kind()
+        if kind == NodeType.identifier:
+            binding = self.lookup(node.get_value())
+            return binding is not None and binding.is_integer
+        return kind in INTEGER_KINDS
+
+    def conditional(self, node):
+        condition, then_branch, else_branch = node.get_children()
+        condition = self.expression(condition)
+        then_value = None
+        else_value = None
+
+        def write_then():
+            nonlocal then_value
+            then_value = self.expression(then_branch)
+
+        def write_else():
+            nonlocal else_value
+            else_value = self.expression(else_branch)
+
+        then_lines = self.block(write_then)
+        else_lines = self.block(write_else)
+        if not then_lines and not else_lines:
+            return f"({then_value} if {condition} is True else {else_value})"
+
+        result = self.new_name("t")
+        self.write_block(f"if {condition} is True:", then_lines + [f"{result} = {then_value}"])
+        self.write_block("else:", else_lines + [f"{result} = {else_value}"])
+        return result
+
+    def application(self, node):
+        rator, rand = node.get_children()
+
+        if rator.get_kind() == NodeType.lambda_expr:
+            # A lambda applied where it is written binds its parameters by
+            # assignment
+            self.scopes.append(self.assign_parameters(rator, rand))
+            try:
+                return self.expression(rator.get_children()[1])
+            finally:
+                self.scopes.pop()
+
+        if self.is_recursive_definition(node):
+            return self.recursive_function(rand)
+
+        function = self.expression(rator)
+        argument = self.expression(rand)
+        if self.is_builtin(rator):
+            return f"{function}({argument})"
+        return f"(yield ({function}, {argument}))"
+
+    def assign_parameters(self, lambda_node, rand):
+        """
+        Write the assignments binding a lambda's parameters to the value of rand
+
+        Returns:
+            dict: Bindings of the lambda's parameters
+        """
+        identifiers, is_tuple = self.parameters(lambda_node)
+        value = self.expression(rand)
+        scope = {}
+        if not is_tuple:
+            name, binding = self.bind(identifiers[0])
+            binding.is_integer = self.is_integer(rand)
+            self.write(f"{binding.var} = {value}")
+            scope[name] = binding
+            return scope
+        if not value.isidentifier():
+            value = self.temporary(value)
+        for index, identifier in enumerate(identifiers):
+            name, binding = self.bind(identifier)
+            self.write(f"{binding.var} = {value}[{index}]")
+            scope[name] = binding
+        return scope
+
+    def is_builtin(self, node):
+        """Whether a node's value is known to be a built-in function"""
+        return (node.get_kind() == NodeType.identifier
+                and node.get_value() in BUILTINS
+                and self.lookup(node.get_value()) is None)
+
+    def is_recursive_definition(self, node):
+        """Whether a node is Y* applied to lambda f. lambda ..., a rec definition of a function"""
+        if node.get_kind() != NodeType.gamma:
+            return False
+        rator, rand = node.get_children()
+        return (rator.get_kind() == NodeType.ystar
+                and rand.get_kind() == NodeType.lambda_expr
+                and rand.get_children()[0].get_kind() == NodeType.identifier
+                and rand.get_children()[1].get_kind() == NodeType.lambda_expr)
+
+    # Functions
+
+    def function(self, node):
+        """
+        Write the def of a lambda
+
+        Returns:
+            str: The function's name
+        """
+        name = self.new_name("f")
+        self.write_function(name, [node], None)
+        return name
+
+    def recursive_function(self, node):
+        """
+        Write a rec definition, lambda f. lambda ..., as a def referring to
+        itself by name
+
+        Returns:
+            str: The function's name
+        """
+        name, binding = self.bind(node.get_children()[0])
+
+        # The curried lambdas of the definition and the body they end in
+        levels = []
+        body = node.get_children()[1]
+        while body.get_kind() == NodeType.lambda_expr:
+            levels.append(body)
+            body = body.get_children()[1]
+
+        self.scopes.append({name: binding})
+        try:
+            self_call = None
+            if self.has_self_tail_call(body, name, len(levels)) and not self.creates_functions(body):
+                self_call = SelfCall(binding, [])
+            self.write_function(binding.var, levels, self_call)
+        finally:
+            self.scopes.pop()
+        # Printed as eta, like the Eta of the other engines
+        self.write(f"{binding.var}.rpal_name = 'eta'")
+        return binding.var
+
+    def write_function(self, name, levels, self_call):
+        """
+        Write nested defs for curried lambdas, the first named name
+
+        Args:
+            name (str): Name of the outermost def
+            levels (list): The lambda nodes, each the body of the previous one
+            self_call (SelfCall): If given, the innermost body is written as a
+                loop whose tail calls of the rec-bound function continue it
+        """
+        outer_self_call = self.self_call
+        self.self_call = None
+        depth = len(self.scopes)
+        try:
+            self.write_level(name, levels, 0, self_call)
+        finally:
+            del self.scopes[depth:]
+            self.self_call = outer_self_call
+
+    def write_level(self, name, levels, index, self_call):
+        """Write the def of levels[index], with the defs of the lambdas after it nested inside"""
+        lambda_node = levels[index]
+        identifiers, is_tuple = self.parameters(lambda_node)
+        bindings = [self.bind(identifier) for identifier in identifiers]
+        parameter = self.new_name("a") if is_tuple else bindings[0][1].var
+        self.scopes.append(dict(bindings))
+
+        def write_body():
+            if is_tuple:
+                for position, (_, binding) in enumerate(bindings):
+                    self.write(f"{binding.var} = {parameter}[{position}]")
+            if index + 1 < len(levels):
+                inner = self.new_name("f")
+                self.write_level(inner, levels, index + 1, self_call)
+                self.write(f"return {inner}")
+            elif self_call is not None:
+                self.write_loop(self_call, levels)
+            else:
+                self.returning(lambda_node.get_children()[1])
+
+        self.write_block(f"def {name}({parameter}):", self.block(write_body))
+
+    def write_loop(self, self_call, levels):
+        """
+        Write the innermost body of a rec definition as a loop
+
+        The parameters of the enclosing curried lambdas are copied to local
+        variables first, so that tail calls can assign all of them.
+        """
+        scopes = self.scopes[-len(levels):]
+        for scope in scopes[:-1]:
+            for name, binding in list(scope.items()):
+                local = Binding(self.new_name(name + "_"))
+                self.write(f"{local.var} = {binding.var}")
+                scope[name] = local
+        self_call.levels = [[binding.var for binding in scope.values()] for scope in scopes]
+
+        self.self_call = self_call
+        body = levels[-1].get_children()[1]
+        self.write_block("while True:", self.block(lambda: self.returning(body)))
+
+    # Tail positions
+
+    def returning(self, node):
+        """Write the statements returning the value of a node in tail position"""
+        kind = node.get_kind()
+
+        if kind == NodeType.conditional:
+            condition, then_branch, else_branch = node.get_children()
+            condition = self.expression(condition)
+            self.write_block(f"if {condition} is True:", self.block(lambda: self.returning(then_branch)))
+            self.write_block("else:", self.block(lambda: self.returning(else_branch)))
+            return
+
+        if kind == NodeType.gamma:
+            rator, rand = node.get_children()
+            if rator.get_kind() == NodeType.lambda_expr:
+                self.scopes.append(self.assign_parameters(rator, rand))
+                try:
+                    self.returning(rator.get_children()[1])
+                finally:
+                    self.scopes.pop()
+                return
+            if self.self_call is not None and self.write_self_call(node):
+                return
+            if not self.is_builtin(rator) and not self.is_recursive_definition(node):
+                function = self.expression(rator)
+                argument = self.expression(rand)
+                self.write(f"return TailCall({function}, {argument})")
+                return
+
+        self.write(f"return {self.expression(node)}")
+
+    def self_call_arguments(self, node, n_levels):
+        """
+        Returns:
+            list: The argument nodes of a fully applied call, outermost
+            parameter first, and the node applied to them
+        """
+        arguments = []
+        while node.get_kind() == NodeType.gamma and len(arguments) < n_levels:
+            rator, rand = node.get_children()
+            arguments.append(rand)
+            node = rator
+        arguments.reverse()
+        return arguments, node
+
+    def write_self_call(self, node):
+        """
+        Write a tail call of the function whose loop is being written as the
+        assignment of its arguments, if node is one
+
+        Returns:
+            bool: Whether node is such a call
+        """
+        self_call = self.self_call
+        arguments, function = self.self_call_arguments(node, len(self_call.levels))
+        if (len(arguments) != len(self_call.levels)
+                or function.get_kind() != NodeType.identifier
+                or self.lookup(function.get_value()) is not self_call.binding):
+            return False
+
+        targets = []
+        values = []
+        for variables, argument in zip(self_call.levels, arguments):
+            if len(variables) == 1:
+                targets.append(variables[0])
+                values.append(self.expression(argument))
+            elif argument.get_kind() == NodeType.tau and len(argument.get_children()) == len(variables):
+                targets += variables
+                values += [self.expression(element) for element in argument.get_children()]
+            else:
+                value = self.temporary(self.expression(argument))
+                targets += variables
+                values += [f"{value}[{index}]" for index in range(len(variables))]
+        self.write(f"{', '.join(targets)} = {', '.join(values)}")
+        self.write("continue")
+        return True
+
+    def has_self_tail_call(self, node, name, n_levels):
+        """Whether a body calls the rec-bound name with all its arguments in tail position"""
+        kind = node.get_kind()
+        if kind == NodeType.conditional:
+            return (self.has_self_tail_call(node.get_children()[1], name, n_levels)
+                    or self.has_self_tail_call(node.get_children()[2], name, n_levels))
+        if kind == NodeType.gamma:
+            rator = node.get_children()[0]
+            if rator.get_kind() == NodeType.lambda_expr:
+                return self.has_self_tail_call(rator.get_children()[1], name, n_levels)
+            arguments, function = self.self_call_arguments(node, n_levels)
+            return (len(arguments) == n_levels
+                    and function.get_kind() == NodeType.identifier
+                    and function.get_value() == name)
+        return False
+
+    def creates_functions(self, node):
+        """Whether evaluating a node can create a function value other than by applying one"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            kind = node.get_kind()
+            children = node.get_children()
+            if kind == NodeType.lambda_expr or kind == NodeType.ystar:
+                return True
+            if kind == NodeType.gamma and children[0].get_kind() == NodeType.lambda_expr:
+                # A lambda applied where it is written only binds names
+                stack.append(children[0].get_children()[1])
+                stack.append(children[1])
+                continue
+            stack.extend(children)
+        return False
@@ -0,0 +1,39 @@
+"""
+Runs programs transpiled to Python.
+"""
+
+from .runtime import get_globals, rpal_format, rpal_run
+
+class PythonMachine:
+    """
+    Runs the code object of a transpiled program
+    """
+    def __init__(self, code):
+        """
+        Initialize a new PythonMachine instance
+
+        Args:
+            code: The code object of the program's Python module
+        """
+        self.code = code
+        self.result = None
+
+    def execute(self):
+        """
+        Run the module's main function. rpal_run makes every call the
+        program yields or returns, so it runs on the caller's stack under
+        the caller's recursion limit.
+        """
+        namespace = get_globals()
+        exec(self.code, namespace)
+        self.result = rpal_run(namespace["main"])
+
+    def get_answer(self):
+        """
+        Execute the program and get the final result
+
+        Returns:
+            str: String representation of the final result
+        """
+        self.execute()
+        return rpal_format(self.result)
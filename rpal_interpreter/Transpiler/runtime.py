@@ -0,0 +1,294 @@
+"""
+Run-time support for Python code generated by the PythonTranspiler.
+
+Transpiled programs hold RPAL values as native Python values: integers as
+int, truth values as bool, strings as str, tuples as tuple and functions as
+Python functions. The names defined here are the globals the generated code
+runs with.
+
+Transpiled functions apply no RPAL function themselves: a function making a
+call that is not in tail position is a generator yielding the call as a
+(rator, rand) tuple, and one making a call in tail position returns it as a
+TailCall. rpal_run makes the calls, so neither deep recursion nor long
+tail-recursive loops use the Python stack.
+"""
+
+from types import FunctionType, GeneratorType
+
+class Unbound:
+    """The value of an identifier no lambda binds and no built-in names"""
+    def __init__(self, name):
+        self.name = name
+
+class Dummy:
+    """Type of the RPAL dummy value"""
+
+DUMMY = Dummy()
+
+def rpal_format(value):
+    """
+    Get the string representation of a value as the interpreter prints it
+
+    Args:
+        value: An RPAL value
+
+    Returns:
+        str: String representation of the value
+    """
+    kind = type(value)
+    if kind is bool:
+        return "true" if value else "false"
+    elif kind is int or kind is str:
+        return str(value)
+    elif kind is tuple:
+        return "(" + ", ".join(rpal_format(element) for element in value) + ")"
+    elif kind is Dummy:
+        return "dummy"
+    elif kind is Unbound:
+        return value.name
+    elif value in BUILTIN_NAMES:
+        return BUILTIN_NAMES[value]
+    # Functions defined with rec print as eta, and Conc applied to one
+    # string as Conc, as in the CSE Machine
+    return getattr(value, "rpal_name", "lambda")
+
+def rpal_to_string(value):
+    """
+    Get the text a value is shown as in error messages, by Itos and when
+    compared with a value of another type: as rpal_format, but tuples are
+    shown as tup, as in the CSE Machine
+    """
+    if type(value) is tuple:
+        return "tup"
+    return rpal_format(value)
+
+def rpal_eq(value1, value2):
+    """
+    Compare two values for eq and ne
+
+    Values of the same type compare as Python values; values of different
+    types compare the text they are printed as, as in the CSE Machine.
+    """
+    if type(value1) is type(value2):
+        return value1 == value2
+    return rpal_to_string(value1) == rpal_to_string(value2)
+
+def rpal_integer(op, value):
+    """Check that an operand of an arithmetic or comparison operator is an integer"""
+    if type(value) is not int:
+        raise TypeError(f"Operator '{op}' expects an integer, got '{rpal_to_string(value)}'")
+    return value
+
+def rpal_truth_value(op, value):
+    """Check that an operand of a logical operator is a truth value"""
+    if type(value) is not bool:
+        raise TypeError(f"Operator '{op}' expects a truth value, got '{rpal_to_string(value)}'")
+    return value
+
+def rpal_string(name, value):
+    """Check that the argument of a built-in function is a string"""
+    if type(value) is not str:
+        raise TypeError(f"Function '{name}' expects a string, got '{rpal_format(value)}'")
+    return value
+
+def rpal_tuple(name, value):
+    """Check that the argument of a built-in function is a tuple"""
+    if type(value) is not tuple:
+        raise TypeError(f"Function '{name}' expects a tuple, got '{rpal_format(value)}'")
+    return value
+
+def rpal_add(value1, value2):
+    return rpal_integer("+", value1) + rpal_integer("+", value2)
+
+def rpal_sub(value1, value2):
+    return rpal_integer("-", value1) - rpal_integer("-", value2)
+
+def rpal_mul(value1, value2):
+    return rpal_integer("*", value1) * rpal_integer("*", value2)
+
+def rpal_pow(value1, value2):
+    return rpal_integer("**", value1) ** rpal_integer("**", value2)
+
+def rpal_ls(value1, value2):
+    return rpal_integer("ls", value1) < rpal_integer("ls", value2)
+
+def rpal_le(value1, value2):
+    return rpal_integer("le", value1) <= rpal_integer("le", value2)
+
+def rpal_gr(value1, value2):
+    return rpal_integer("gr", value1) > rpal_integer("gr", value2)
+
+def rpal_ge(value1, value2):
+    return rpal_integer("ge", value1) >= rpal_integer("ge", value2)
+
+def rpal_neg(value):
+    return -rpal_integer("neg", value)
+
+def rpal_and(value1, value2):
+    return rpal_truth_value("&", value1) & rpal_truth_value("&", value2)
+
+def rpal_or(value1, value2):
+    return rpal_truth_value("or", value1) | rpal_truth_value("or", value2)
+
+def rpal_not(value):
+    return not rpal_truth_value("not", value)
+
+def rpal_div(value1, value2):
+    """Integer division truncating towards zero"""
+    value1 = rpal_integer("/", value1)
+    value2 = rpal_integer("/", value2)
+    quotient = abs(value1) // abs(value2)
+    return -quotient if (value1 < 0) != (value2 < 0) else quotient
+
+def rpal_aug(tup, value):
+    """Extend a tuple with a value, or with the elements of a tuple"""
+    if type(tup) is not tuple:
+        raise TypeError(f"Operator 'aug' expects a tuple, got '{rpal_format(tup)}'")
+    if type(value) is tuple:
+        return tup + value
+    return tup + (value,)
+
+class TailCall:
+    """A call a function returns, to be made in place of the function's own"""
+    __slots__ = ("rator", "rand")
+
+    def __init__(self, rator, rand):
+        self.rator = rator
+        self.rand = rand
+
+def rpal_apply(rator, rand):
+    """
+    Apply a value to an argument
+
+    Tuples are indexed from 1. Applying a value that is neither a tuple nor a
+    function leaves the argument as the result, as in the CSE Machine.
+
+    Returns:
+        The value of the application, or the generator or TailCall of the
+        function applied, which rpal_run carries on with
+    """
+    kind = type(rator)
+    if kind is FunctionType:
+        return rator(rand)
+    elif kind is tuple:
+        return rator[rand - 1]
+    return rand
+
+def rpal_run(function):
+    """
+    Run a transpiled function taking no argument, making the calls it and
+    the functions it applies yield or return
+
+    The generators of the functions waiting for the value of a call are kept
+    on a list, and a tail call replaces the function returning it.
+
+    Returns:
+        The function's value
+    """
+    frames = []
+    result = function()
+    while True:
+        kind = type(result)
+        if kind is GeneratorType:
+            frames.append(result)
+            value = None
+        elif kind is TailCall:
+            result = rpal_apply(result.rator, result.rand)
+            continue
+        elif frames:
+            value = result
+        else:
+            return result
+        try:
+            rator, rand = frames[-1].send(value)
+        except StopIteration as stop:
+            frames.pop()
+            result = stop.value
+            continue
+        result = rpal_apply(rator, rand)
+
+def rpal_ystar(function):
+    """
+    Y*: the fixed point of a function taking the function being defined
+
+    Transpiled rec definitions of lambdas become self-referencing Python
+    functions; this covers the remaining uses of Y*.
+    """
+    def eta(rand):
+        rator = yield (function, eta)
+        return TailCall(rator, rand)
+    eta.rpal_name = "eta"
+    return eta
+
+# Built-in functions
+
+def builtin_print(value):
+    # Print is the identity; the program's value is printed when it ends
+    return value
+
+def builtin_stem(s):
+    if rpal_string("Stem", s) == "":
+        raise IndexError("string index out of range")
+    return s[0]
+
+def builtin_stern(s):
+    return rpal_string("Stern", s)[1:]
+
+def builtin_conc(s1):
+    rpal_string("Conc", s1)
+    def conc(s2):
+        return s1 + rpal_string("Conc", s2)
+    conc.rpal_name = "Conc"
+    return conc
+
+def builtin_order(tup):
+    return len(rpal_tuple("Order", tup))
+
+def builtin_null(tup):
+    return len(rpal_tuple("Null", tup)) == 0
+
+def builtin_itos(i):
+    return rpal_to_string(i)
+
+def builtin_isinteger(value):
+    return type(value) is int
+
+def builtin_isstring(value):
+    return type(value) is str
+
+def builtin_istuple(value):
+    return type(value) is tuple
+
+def builtin_isdummy(value):
+    return type(value) is Dummy
+
+def builtin_istruthvalue(value):
+    return type(value) is bool
+
+def builtin_isfunction(value):
+    # Built-in functions, and Conc applied to one string, are not functions
+    # defined by the program
+    return (type(value) is FunctionType and value not in BUILTIN_NAMES
+            and getattr(value, "rpal_name", "eta") == "eta")
+
+BUILTINS = {
+    "Print": builtin_print,
+    "Stem": builtin_stem,
+    "Stern": builtin_stern,
+    "Conc": builtin_conc,
+    "Order": builtin_order,
+    "Isinteger": builtin_isinteger,
+    "Null": builtin_null,
+    "Itos": builtin_itos,
+    "Isstring": builtin_isstring,
+    "Istuple": builtin_istuple,
+    "Isdummy": builtin_isdummy,
+    "Istruthvalue": builtin_istruthvalue,
+    "Isfunction": builtin_isfunction,
+}
+
+BUILTIN_NAMES = {function: name for name, function in BUILTINS.items()}
+
+def get_globals():
+    """Get a fresh namespace for running a transpiled program"""
+    return {name: value for name, value in globals().items() if not name.startswith("_")}
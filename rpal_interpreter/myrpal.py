@@ -1,16 +1,77 @@
 import argparse
 import sys
-from Lexer.token_analyzer import tokenize
+from Lexer.token_analyzer import iter_tokens, tokenize
 from Parser.syntax_parser import SyntaxParser
-from Standardizer.tree_builder import TreeBuilder
+from Standardizer.tree import StandardTree
 from CSEMachine.factory import CSEMachineFactory
-from Parser.StringAst import StringAst
+from CSEMachine.csemachine import CSEMachine
+from CSEMachine.memo import MemoCache, DEFAULT_MEMO_SIZE
+from Bytecode.compiler import BytecodeCompiler
+from Bytecode.machine import BytecodeMachine
+from Closures.compiler import ClosureCompiler
+from Closures.machine import ClosureMachine
+from Transpiler.compiler import PythonTranspiler
+from Transpiler.machine import PythonMachine
+from Transpiler.cache import CodeCache
+from Profiling.phases import PhaseProfiler, count_control_symbols
+from Profiling.functions import FunctionProfiler, SamplingProfiler
 
-def main():
-    """Main entry point for the RPAL interpreter."""
+# Builds a machine with a get_answer method from a standardized tree
+ENGINES = {
+    'cse': lambda std_tree: CSEMachineFactory().get_cse_machine(std_tree),
+    'bytecode': lambda std_tree: BytecodeMachine(BytecodeCompiler().compile(std_tree)),
+    'closure': lambda std_tree: ClosureMachine(ClosureCompiler().compile(std_tree)),
+    'python': lambda std_tree: PythonMachine(PythonTranspiler().compile(std_tree)),
+}
+
+def parse_program(tokens):
+    """Parse a sequence of tokens into a StandardTree."""
+    ast_root = SyntaxParser(tokens).parse()
+    if ast_root is None:
+        raise Exception("Parsing failed")
+    return StandardTree(ast_root)
+
+def compile_cached(source):
+    """
+    Compile a program for the python engine, reusing the code cached for the
+    same source by an earlier run.
+    """
+    cache = CodeCache()
+    code = cache.load(source)
+    if code is None:
+        std_tree = parse_program(tokenize(source))
+        std_tree.standardize()
+        code = PythonTranspiler().compile(std_tree)
+        cache.store(source, code)
+    return code
+
+def count_program_items(machine, phase):
+    """Record the size of the program a machine runs, for --profile-phases."""
+    if isinstance(machine, CSEMachine):
+        phase.set_count("control_symbols", count_control_symbols(machine.control))
+    elif isinstance(machine, BytecodeMachine):
+        codes = [machine.program.main] + list(machine.program.codes)
+        phase.set_count("instructions", sum(len(code.instructions) // 2 for code in codes))
 
-    # Set up command-line argument parsing
+def ast_label(data):
+    """Shorten the identifier and integer labels in the -ast printout."""
+    if "IDENTIFIER" in data:
+        return data.replace("IDENTIFIER", "ID")
+    elif "INTEGER" in data:
+        return data.replace("INTEGER", "INT")
+    return data
+
+def build_arg_parser(prog=None):
+    """
+    Args:
+        prog (str): Program name shown in usage messages (default: the
+            script's name)
+        
+    Returns:
+        argparse.ArgumentParser: The parser of the interpreter's command line
+    """
     arg_parser = argparse.ArgumentParser(
+        prog=prog,
         description='RPAL Interpreter - Processes RPAL language programs',
     )
     
@@ -31,74 +92,207 @@ def main():
         help='Display the Standardized Tree and exit'
     )
     
-    # Parse command-line arguments
-    args = arg_parser.parse_args()
+    arg_parser.add_argument(
+        '--engine',
+        choices=sorted(ENGINES),
+        default='cse',
+        help='Execution engine to run the program with (default: cse)'
+    )
     
-    try:
-        # Read the source file
-        with open(args.source_file, 'r') as file:
-            source_code = file.read()
-        
-        # Step 1: Tokenize the source code
-        tokens = tokenize(source_code)
+    arg_parser.add_argument(
+        '--memoize',
+        nargs='?',
+        type=int,
+        const=DEFAULT_MEMO_SIZE,
+        metavar='SIZE',
+        help='Cache the results of functions defined with rec, keeping the '
+             f'SIZE most recently used (default: {DEFAULT_MEMO_SIZE}); cse engine only'
+    )
+    
+    arg_parser.add_argument(
+        '--max-steps',
+        type=int,
+        metavar='N',
+        help='Stop the program with an error after N machine steps; cse engine only'
+    )
+    
+    arg_parser.add_argument(
+        '--profile-phases',
+        nargs='?',
+        choices=['table', 'json'],
+        const='table',
+        metavar='FORMAT',
+        help='Report the wall time, CPU time, allocated memory blocks and item '
+             'counts of each phase on stderr, as a table (default) or json'
+    )
+    
+    arg_parser.add_argument(
+        '--profile',
+        nargs='?',
+        choices=['trace', 'sample'],
+        const='trace',
+        metavar='MODE',
+        help='Report the steps, calls, time and allocations of each RPAL function '
+             'on stderr, tracing every call (trace, the default) or sampling '
+             'the running functions on a timer (sample); cse engine only'
+    )
+    
+    arg_parser.add_argument(
+        '--profile-interval',
+        type=float,
+        default=1.0,
+        metavar='MS',
+        help='Milliseconds of CPU time between samples of --profile=sample (default: 1)'
+    )
+    
+    arg_parser.add_argument(
+        '--profile-collapsed',
+        metavar='FILE',
+        help='Write the profile as collapsed stacks, for flame graph tools, to FILE'
+    )
+    return arg_parser
 
-        if not tokens:
-            raise ValueError("No tokens found in the source code. Error in tokenization.")
-            
+def parse_args(argv=None, prog=None):
+    """
+    Parse and check an interpreter command line
+    
+    Args:
+        argv (list): The arguments, without the program name (default:
+            sys.argv[1:])
+        prog (str): Program name shown in usage messages (default: the
+            script's name)
         
-        # Step 2: Parse tokens into an Abstract Syntax Tree
-        parser = SyntaxParser(tokens)
-
-
-        ast_root = parser.parse()
-
-
-        if ast_root is None:
-            raise Exception("Parsing failed")
+    Returns:
+        argparse.Namespace: The options of the run
+        
+    Raises:
+        SystemExit: If the arguments are invalid, after printing the usage
+    """
+    arg_parser = build_arg_parser(prog)
+    args = arg_parser.parse_args(argv)
+    if args.memoize is not None and args.engine != 'cse':
+        arg_parser.error("--memoize is only supported by the cse engine")
+    if args.max_steps is not None and args.max_steps < 1:
+        arg_parser.error("--max-steps must be at least 1")
+    if args.max_steps is not None and args.engine != 'cse':
+        arg_parser.error("--max-steps is only supported by the cse engine")
+    if args.profile is not None and args.engine != 'cse':
+        arg_parser.error("--profile is only supported by the cse engine")
+    if args.profile_collapsed is not None and args.profile is None:
+        arg_parser.error("--profile-collapsed needs --profile")
+    return args
 
-        # Convert AST to string representation for display or further processing
-        #ast_strings = parser.convert_ast_to_string_ast()
-        ast_strings_converter = StringAst(parser)
-        ast_strings = ast_strings_converter.convert_ast_to_string_ast()
+def run(args):
+    """
+    Interpret an RPAL program, printing what the command line prints
+    
+    Args:
+        args (argparse.Namespace): The options of the run, from parse_args
         
+    Returns:
+        int: The exit status, 0 on success or 1 if the program failed
+    """
+    # Phases are always timed, but only counted and reported if asked for
+    profiler = PhaseProfiler()
+    profiling = args.profile_phases is not None
+    function_profiler = None
+    
+    try:
+        if args.engine == 'python' and not (args.ast or args.st):
+            # Programs compiled on an earlier run skip parsing altogether
+            with profiler.phase("compile"):
+                with open(args.source_file, 'r') as file:
+                    machine = PythonMachine(compile_cached(file.read()))
+            print("Output of the above program is:")
+            with profiler.phase("execute"):
+                answer = machine.get_answer()
+            print(answer)
+            return 0
+
+        # Step 1 and 2: Tokenize the source file lazily and parse the token
+        # stream into an Abstract Syntax Tree. Tokens are read through the
+        # parser's lookahead buffer, so the full token list is never built,
+        # unless the phases are profiled and lexing is measured on its own.
+        with open(args.source_file, 'r') as file:
+            if profiling:
+                with profiler.phase("lex") as phase:
+                    tokens = tokenize(file.read())
+                phase.set_count("tokens", len(tokens))
+            else:
+                tokens = iter_tokens(file)
+            with profiler.phase("parse") as phase:
+                std_tree = parse_program(tokens)
+        if profiling:
+            phase.set_count("ast_nodes", std_tree.count_nodes())
 
         # Display AST if requested
         if args.ast:
             print("Abstract Syntax Tree:")
-            for line in ast_strings:
-                if "IDENTIFIER" in line:
-                    print(line.replace("IDENTIFIER", "ID"))
-                elif "INTEGER" in line:
-                    print(line.replace("INTEGER", "INT"))
-                else:
-                    print(line)
-            return
+            std_tree.print_tree(ast_label)
+            return 0
         
-        #Step 3: Build and standardize the tree
-        tree_builder = TreeBuilder()
-        std_tree = tree_builder.build_tree(ast_strings)
-        std_tree.standardize()
+        #Step 3: Standardize the tree
+        with profiler.phase("standardize") as phase:
+            std_tree.standardize()
+        if profiling:
+            phase.set_count("st_nodes", std_tree.count_nodes())
         
         #Display standardized tree if requested
         if args.st:
             print("Standardized Tree:")
             std_tree.print_tree()
-            return
+            return 0
         
-        #Step 4: Build and execute the CSE machine
-        cse_builder = CSEMachineFactory()
-        cse_machine = cse_builder.get_cse_machine(std_tree)
+        #Step 4: Build and execute the machine of the selected engine
+        with profiler.phase("build") as phase:
+            machine = ENGINES[args.engine](std_tree)
+        if profiling:
+            count_program_items(machine, phase)
+        if args.memoize is not None:
+            machine.set_memo(MemoCache(args.memoize))
+        if args.max_steps is not None:
+            machine.set_max_steps(args.max_steps)
+        if args.profile == 'trace':
+            function_profiler = FunctionProfiler()
+            machine.set_profiler(function_profiler)
+        elif args.profile == 'sample':
+            function_profiler = SamplingProfiler(args.profile_interval / 1000)
         
         # Execute the program and print the result
         print("Output of the above program is:")
-        print(cse_machine.get_answer())
+        with profiler.phase("execute") as phase:
+            if args.profile == 'sample':
+                function_profiler.start()
+            try:
+                answer = machine.get_answer()
+            finally:
+                if args.profile == 'sample':
+                    function_profiler.stop()
+        if isinstance(machine, CSEMachine):
+            phase.set_count("steps", machine.get_steps())
+        print(answer)
+        if args.memoize is not None:
+            machine.get_memo().report()
+        return 0
         
     except FileNotFoundError:
         print(f"Error: Could not find file '{args.source_file}'")
-        sys.exit(1)
+        return 1
     except Exception as e:
         print(f"Error: {str(e)}")
-        sys.exit(1)
+        return 1
+    finally:
+        if function_profiler is not None:
+            function_profiler.report()
+            if args.profile_collapsed is not None:
+                with open(args.profile_collapsed, 'w') as file:
+                    function_profiler.write_collapsed(file)
+        if profiling:
+            profiler.report(args.profile_phases)
+
+def main():
+    """Main entry point for the RPAL interpreter."""
+    sys.exit(run(parse_args()))
 
 if __name__ == "__main__":
     main()
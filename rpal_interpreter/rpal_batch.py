@@ -0,0 +1,64 @@
+import argparse
+import sys
+import time
+from Batch.runner import collect_sources, run_batch, write_outputs, report
+from myrpal import parse_args
+
+def main():
+    """Entry point for running many RPAL programs in one job."""
+
+    arg_parser = argparse.ArgumentParser(
+        description='Run many RPAL programs across a pool of worker processes. '
+                    'Options not listed here are passed to the interpreter, '
+                    'e.g. --engine=bytecode; give their values after =.',
+    )
+
+    arg_parser.add_argument(
+        'sources',
+        nargs='+',
+        help='Source files, directories (their files), glob patterns (quoted) '
+             'or @MANIFEST for a file listing one source per line'
+    )
+
+    arg_parser.add_argument(
+        '-o', '--output-dir',
+        required=True,
+        metavar='DIR',
+        help='Directory to write each program\'s output and summary.json to'
+    )
+
+    arg_parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        metavar='N',
+        help='Number of worker processes (default: the number of CPUs)'
+    )
+
+    args, options = arg_parser.parse_known_args()
+    if args.jobs is not None and args.jobs < 1:
+        arg_parser.error("--jobs must be at least 1")
+    for option in options:
+        if not option.startswith("-"):
+            arg_parser.error(f"unexpected argument '{option}'; give interpreter option values after =")
+    # Check the interpreter options once, rather than failing every program
+    if parse_args(["-"] + options).profile_collapsed is not None:
+        arg_parser.error("--profile-collapsed would be written by every program at once")
+
+    try:
+        sources = collect_sources(args.sources)
+    except OSError as e:
+        print(f"Error: Could not read manifest: {e}")
+        sys.exit(1)
+    if not sources:
+        print("Error: No source files found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = run_batch(sources, options, args.jobs)
+    wall = time.perf_counter() - start
+    write_outputs(results, args.output_dir)
+    report(results, wall)
+    sys.exit(0 if all(result.succeeded() for result in results) else 1)
+
+if __name__ == "__main__":
+    main()
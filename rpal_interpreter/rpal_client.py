@@ -0,0 +1,62 @@
+import argparse
+import socket
+import sys
+from Daemon.protocol import get_default_socket_path, receive_message, send_message
+
+def main():
+    """Entry point for running an RPAL program on the interpreter daemon."""
+
+    arg_parser = argparse.ArgumentParser(
+        description='Run an RPAL program on the daemon started by rpal_daemon.py. '
+                    'Takes the options of the interpreter, e.g. -ast or --engine=bytecode; '
+                    'give their values after =.',
+    )
+
+    arg_parser.add_argument(
+        'source_file',
+        help='Path to the RPAL source file to interpret'
+    )
+
+    arg_parser.add_argument(
+        '--socket',
+        default=get_default_socket_path(),
+        metavar='PATH',
+        help='Path of the daemon\'s socket (default: $RPAL_SOCKET, or one in '
+             '$TMPDIR or /tmp)'
+    )
+
+    arg_parser.add_argument(
+        '--time-limit',
+        type=float,
+        metavar='SECONDS',
+        help='Most seconds the run may take (default: the daemon\'s limit)'
+    )
+
+    args, options = arg_parser.parse_known_args()
+
+    try:
+        with open(args.source_file, 'r') as file:
+            source = file.read()
+    except FileNotFoundError:
+        print(f"Error: Could not find file '{args.source_file}'")
+        sys.exit(1)
+
+    request = {"name": args.source_file, "source": source, "argv": options}
+    if args.time_limit is not None:
+        request["time_limit"] = args.time_limit
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(args.socket)
+            send_message(sock, request)
+            response = receive_message(sock)
+    except (ConnectionError, FileNotFoundError) as e:
+        print(f"Error: Could not reach the daemon on {args.socket}: {str(e)}")
+        sys.exit(1)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["status"])
+
+if __name__ == "__main__":
+    main()
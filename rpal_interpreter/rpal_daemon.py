@@ -0,0 +1,83 @@
+import argparse
+import os
+import signal
+import sys
+from Daemon.protocol import get_default_socket_path
+from Daemon.server import DaemonServer, WorkerPool, DEFAULT_TIME_LIMIT
+from Daemon.worker import DEFAULT_CACHE_SIZE
+
+def main():
+    """Entry point for the interpreter daemon."""
+
+    arg_parser = argparse.ArgumentParser(
+        description='Serve RPAL interpreter requests from rpal_client.py on a Unix domain socket',
+    )
+
+    arg_parser.add_argument(
+        '--socket',
+        default=get_default_socket_path(),
+        metavar='PATH',
+        help='Path of the socket to listen on (default: $RPAL_SOCKET, or one in '
+             '$TMPDIR or /tmp)'
+    )
+
+    arg_parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar='N',
+        help='Number of worker processes (default: the number of CPUs)'
+    )
+
+    arg_parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        metavar='N',
+        help=f'Compiled programs each worker keeps (default: {DEFAULT_CACHE_SIZE})'
+    )
+
+    arg_parser.add_argument(
+        '--time-limit',
+        type=float,
+        default=DEFAULT_TIME_LIMIT,
+        metavar='SECONDS',
+        help=f'Most seconds a run may take, 0 for no limit (default: {DEFAULT_TIME_LIMIT:g})'
+    )
+
+    arg_parser.add_argument(
+        '--max-steps',
+        type=int,
+        metavar='N',
+        help='Most machine steps a cse run may take (default: no limit)'
+    )
+
+    args = arg_parser.parse_args()
+    if args.workers < 1:
+        arg_parser.error("--workers must be at least 1")
+    if args.cache_size < 1:
+        arg_parser.error("--cache-size must be at least 1")
+    if args.max_steps is not None and args.max_steps < 1:
+        arg_parser.error("--max-steps must be at least 1")
+
+    pool = WorkerPool(args.workers, args.cache_size, args.max_steps)
+    try:
+        server = DaemonServer(args.socket, pool, args.time_limit or None)
+    except OSError as e:
+        pool.close()
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    # Stop cleanly when terminated as well as when interrupted
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Listening on {args.socket} with {args.workers} workers", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+if __name__ == "__main__":
+    main()